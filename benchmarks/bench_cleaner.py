@@ -0,0 +1,78 @@
+"""
+Compare the lxml cleaner with the html5lib + BeautifulSoup one.
+
+    python benchmarks/bench_cleaner.py [page.html ...] [--sizes 0.5 2 5] [--repeat 3]
+
+Without files, synthetic news-like pages of the given sizes (MB) are used.
+"""
+import argparse
+import random
+import time
+
+from langscrape.html.utils import clean_html_for_extraction3, clean_html_for_extraction3_soup
+
+WORDS = "the of and to in a is that for it as was with be by on not he this are or his from at which but".split()
+
+
+def make_page(size_mb: float, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    def sentence(n):
+        return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+    head = (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Benchmark article</title>"
+        "<script>window.dataLayer = [];</script><style>.x{color:red}</style></head><body>"
+        "<nav class='menu'><ul>" + "".join(f"<li><a href='/s/{i}'>Section {i}</a></li>" for i in range(30)) + "</ul></nav>"
+        "<article><h1 class='headline'>Benchmark article</h1><time datetime='2024-01-01'>1 Jan 2024</time>"
+    )
+    tail = "</article><footer><p>Footer</p></footer></body></html>"
+    blocks = []
+    size = len(head) + len(tail)
+    target = int(size_mb * 1024 * 1024)
+    i = 0
+    while size < target:
+        block = (
+            f"<div class='block b{i % 7}' id='blk{i}'><div><div><span></span>"
+            f"<p data-track='{i}' style='margin:0'>{sentence(25)} <a href='/a/{i}'>{sentence(4)}</a></p>"
+            f"<figure><img src='/i/{i}.jpg' alt='image {i}'><figcaption>{sentence(6)}</figcaption></figure>"
+            f"<button onclick='share({i})'>Share</button><svg><path d='M0 0'/></svg>"
+            f"<ul><li>{sentence(5)}</li><li>{sentence(5)}</li></ul></div></div></div>"
+        )
+        blocks.append(block)
+        size += len(block)
+        i += 1
+    return head + "".join(blocks) + tail
+
+
+def timed(func, html: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--sizes", nargs="*", type=float, default=[0.5, 2, 5])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.files:
+        pages = [(path, open(path, encoding="utf-8", errors="replace").read()) for path in args.files]
+    else:
+        pages = [(f"synthetic {size:g} MB", make_page(size)) for size in args.sizes]
+
+    print(f"{'page':<24}{'size':>10}{'soup (s)':>12}{'lxml (s)':>12}{'speedup':>10}  parity")
+    for name, html in pages:
+        soup_time = timed(clean_html_for_extraction3_soup, html, args.repeat)
+        lxml_time = timed(clean_html_for_extraction3, html, args.repeat)
+        same = clean_html_for_extraction3(html) == clean_html_for_extraction3_soup(html)
+        print(f"{name[-24:]:<24}{len(html):>10}{soup_time:>12.3f}{lxml_time:>12.3f}{soup_time / lxml_time:>9.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Micro-benchmarks for the feilian HTML helpers that run on every page.
+
+    python benchmarks/bench_feilian.py [page.html ...] [--sizes 0.01 0.1 1 5]
+        [--functions etree.clean_html soup.get_structure ...] [--repeat 3]
+        [--history benchmarks/feilian_history.json] [--threshold 0.2]
+
+Each function runs on synthetic article and listing DOMs of every size plus
+the recorded fixtures (and any pages given on the command line). Setup such
+as parsing happens outside the timed region. Allocations are measured in a
+separate run with tracemalloc. This only sees Python-level allocations, not
+libxml2's. Results are appended to the JSON history, and any function more
+than ``--threshold`` slower than the previous run is flagged.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from feilian import etree_tools, soup_tools, text_tools
+from feilian.etree_token_stats import build_token_tree
+from langscrape.html.compaction import get_token_counter
+
+try:
+    from bench_cleaner import make_page
+except ImportError:  # imported as benchmarks.bench_feilian
+    from .bench_cleaner import make_page
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+DEFAULT_HISTORY = os.path.join(BENCH_DIR, "feilian_history.json")
+PRUNE_TOKENS = 2000
+XPATH_SAMPLE = 1000
+BATCH_VALUES = 50
+
+
+def make_listing(size_mb: float, seed: int = 0) -> str:
+    """A wide DOM: one <ul> with thousands of near-identical <li> (search results, archives)."""
+    rng = random.Random(seed)
+    head = "<!DOCTYPE html><html><head><title>Listing</title></head><body><main><h1>Results</h1><ul class='results'>"
+    tail = "</ul></main></body></html>"
+    items = []
+    size = len(head) + len(tail)
+    target = int(size_mb * 1024 * 1024)
+    i = 0
+    while size < target:
+        item = (
+            f"<li class='result'><a href='/item/{i}'>Item {i} {rng.randint(0, 10 ** 6)}</a>"
+            f"<span class='meta'>{rng.randint(1, 28)} Jan 2024</span></li>"
+        )
+        items.append(item)
+        size += len(item)
+        i += 1
+    return head + "".join(items) + tail
+
+
+def _target_text(tree) -> str:
+    """Text of an element in the second half of the page, the worst case for a left-to-right scan."""
+    texts = [t.strip() for t in tree.getroot().itertext() if len(t.strip()) > 10]
+    return texts[len(texts) * 3 // 4] if texts else ""
+
+
+# name -> (setup(html) -> args, func(*args))
+def _etree_setup(html: str):
+    return (etree_tools.parse_html(html),)
+
+
+def _xpath_setup(html: str):
+    tree = etree_tools.parse_html(html)
+    elements = list(tree.getroot().iter("li", "p", "span", "a"))
+    step = max(1, len(elements) // XPATH_SAMPLE)
+    return (elements[::step][:XPATH_SAMPLE],)
+
+
+def _get_xpaths(elements):
+    for ele in elements:
+        etree_tools.get_xpath(ele)
+
+
+def _index_xpaths(elements):
+    index = etree_tools.XPathIndex(elements[0].getroottree()) if elements else None
+    for ele in elements:
+        index.get_xpath(ele)
+
+
+def _prune_etree_setup(html: str):
+    tree = etree_tools.parse_html(html)
+    return (get_token_counter(), tree.getroot().find("body"), PRUNE_TOKENS)
+
+
+def _soup_setup(html: str):
+    return (BeautifulSoup(html, "html5lib"),)
+
+
+def _prune_soup_setup(html: str):
+    soup = BeautifulSoup(html, "html5lib")
+    return (get_token_counter(), soup.body, PRUNE_TOKENS)
+
+
+def _gen_xpath_setup(html: str):
+    tree = etree_tools.parse_html(html)
+    return (tree, _target_text(tree))
+
+
+def _gen_xpaths_setup(html: str):
+    """Fifty values spread over the page, as when resolving every field of a snippet."""
+    tree = etree_tools.parse_html(html)
+    texts = [t.strip() for t in tree.getroot().itertext() if len(t.strip()) > 10]
+    return (tree, texts[:: max(1, len(texts) // BATCH_VALUES)][:BATCH_VALUES])
+
+
+def _texts_setup(html: str):
+    text_tools._normalize_short_text.cache_clear()
+    tree = etree_tools.parse_html(html)
+    return ([text for _, text, _ in etree_tools.itertext(tree.getroot())],)
+
+
+def _normalize_texts(texts):
+    for text in texts:
+        text_tools.normalize_text(text)
+
+
+def _normalize_texts_sequential(texts):
+    for text in texts:
+        text_tools._normalize_text_sequential(text)
+
+
+def _token_tree_setup(html: str):
+    return (etree_tools.parse_html(html), get_token_counter().count)
+
+
+FUNCTIONS: Dict[str, Tuple[Callable, Callable]] = {
+    "etree.clean_html": (_etree_setup, etree_tools.clean_html),
+    "etree.gen_xpath_by_text": (_gen_xpath_setup, etree_tools.gen_xpath_by_text),
+    "etree.gen_xpaths_by_texts": (_gen_xpaths_setup, etree_tools.gen_xpaths_by_texts),
+    "etree.get_xpath": (_xpath_setup, _get_xpaths),
+    "etree.XPathIndex.get_xpath": (_xpath_setup, _index_xpaths),
+    "etree.prune_by_tokens": (_prune_etree_setup, etree_tools.prune_by_tokens),
+    "soup.clean_html": (_soup_setup, soup_tools.clean_html),
+    "soup.get_structure": (lambda html: (html,), soup_tools.get_structure),
+    "soup.prune_by_tokens": (_prune_soup_setup, soup_tools.prune_by_tokens),
+    "text_tools.normalize_text": (_texts_setup, _normalize_texts),
+    "text_tools.normalize_text_sequential": (_texts_setup, _normalize_texts_sequential),
+    "etree_token_stats.build_token_tree": (_token_tree_setup, build_token_tree),
+}
+
+
+def doms(sizes: List[float], files: List[str]) -> List[Tuple[str, str]]:
+    pages = []
+    for size in sizes:
+        pages.append((f"article {size:g}MB", make_page(size)))
+        pages.append((f"listing {size:g}MB", make_listing(size)))
+    for path in files or sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html"))):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def measure(setup: Callable, func: Callable, html: str, repeat: int) -> Dict[str, Any]:
+    times = []
+    for _ in range(repeat):
+        args = setup(html)  # functions mutate their input, so set up every run
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+
+    args = setup(html)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    func(*args)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    return {
+        "best_s": round(min(times), 5),
+        "median_s": round(statistics.median(times), 5),
+        "peak_alloc_kb": round(peak / 1024, 1),
+        "alloc_blocks": blocks,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=BENCH_DIR, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def load_history(path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def regressions(previous: Dict[str, Any], results: List[Dict[str, Any]], threshold: float) -> List[str]:
+    """Describe every (function, dom) that got more than ``threshold`` slower than ``previous``."""
+    before = {(r["function"], r["dom"]): r for r in previous.get("results", [])}
+    slower = []
+    for result in results:
+        old = before.get((result["function"], result["dom"]))
+        if old and old["best_s"] > 0 and result["best_s"] > old["best_s"] * (1 + threshold):
+            slower.append(
+                f"{result['function']} on {result['dom']}: {old['best_s']:.4f}s -> {result['best_s']:.4f}s "
+                f"({result['best_s'] / old['best_s']:.2f}x, was {previous.get('commit') or 'previous run'})"
+            )
+    return slower
+
+
+def run(sizes: List[float], files: List[str], functions: List[str], repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    pages = doms(sizes, files)
+    for name in functions:
+        setup, func = FUNCTIONS[name]
+        for dom, html in pages:
+            result = {"function": name, "dom": dom, "size_bytes": len(html), **measure(setup, func, html, repeat)}
+            print(f"{name:<40}{dom[-20:]:<22}{len(html):>10}{result['best_s']:>11.4f}{result['median_s']:>11.4f}"
+                  f"{result['peak_alloc_kb']:>12.0f}{result['alloc_blocks']:>10}")
+            results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="Real pages to add (default: benchmarks/fixtures/*.html)")
+    parser.add_argument("--sizes", nargs="*", type=float, default=[0.01, 0.1, 1, 5], help="Synthetic page sizes in MB")
+    parser.add_argument("--functions", nargs="*", default=list(FUNCTIONS), choices=list(FUNCTIONS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON history to append to ('' to skip)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Flag functions this much slower than the last run")
+    args = parser.parse_args()
+
+    print(f"{'function':<40}{'dom':<22}{'bytes':>10}{'best (s)':>11}{'median (s)':>11}{'peak KB':>12}{'blocks':>10}")
+    results = run(args.sizes, args.files, args.functions, args.repeat)
+    if not args.history:
+        return
+
+    history = load_history(args.history)
+    if history:
+        for line in regressions(history[-1], results, args.threshold):
+            print(f"SLOWER {line}")
+    history.append({
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "results": results,
+    })
+    with open(args.history, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
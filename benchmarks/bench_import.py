@@ -0,0 +1,131 @@
+"""
+Cold-start cost of importing langscrape, measured in fresh interpreters.
+
+    python benchmarks/bench_import.py [langscrape.batch ...] [--runs 5] [--top 15]
+        [--history benchmarks/import_history.json] [--threshold 0.2]
+
+Each module is imported ``--runs`` times with ``python -X importtime``; the
+report gives the median total and the heaviest modules it pulled in (by
+cumulative import time), and flags the heavy optional dependencies that
+should only load on first use. Results are appended to the JSON history and
+modules more than ``--threshold`` slower than the previous run are flagged.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+DEFAULT_HISTORY = os.path.join(BENCH_DIR, "import_history.json")
+DEFAULT_MODULES = ["langscrape", "langscrape.batch", "langscrape.agent.graph"]
+# loaded on first use only; importing the package must not pull these in
+LAZY_DEPENDENCIES = [
+    "patchright", "langchain_openai", "langchain_deepseek", "newspaper", "nltk",
+    "pymupdf", "bs4", "html5lib", "tokenizers", "numpy",
+]
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """``(module, self_us, cumulative_us)`` for every line of ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def loaded_modules(module: str) -> List[str]:
+    """Top-level packages in ``sys.modules`` after importing ``module`` in a fresh interpreter."""
+    code = f"import sys, {module}; print('\\n'.join(sorted({{m.split('.')[0] for m in sys.modules}})))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=REPO_DIR, check=True)
+    return out.stdout.split()
+
+
+def measure(module: str, runs: int, top: int) -> Dict[str, Any]:
+    totals = []
+    heaviest: Dict[str, int] = {}
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, cwd=REPO_DIR, check=True,
+        )
+        rows = parse_importtime(out.stderr)
+        totals.append(next(c for name, _, c in reversed(rows) if name == module))
+        for name, _, cumulative in rows:
+            heaviest[name] = min(heaviest.get(name, cumulative), cumulative)
+    eager = sorted(set(LAZY_DEPENDENCIES) & set(loaded_modules(module)))
+    return {
+        "module": module,
+        "median_s": round(statistics.median(totals) / 1e6, 4),
+        "best_s": round(min(totals) / 1e6, 4),
+        "heaviest": [
+            {"module": name, "cumulative_s": round(us / 1e6, 4)}
+            for name, us in sorted(heaviest.items(), key=lambda x: -x[1])
+            if name != module
+        ][:top],
+        "eager_dependencies": eager,
+    }
+
+
+def load_history(path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def regressions(previous: Dict[str, Any], results: List[Dict[str, Any]], threshold: float) -> List[str]:
+    before = {r["module"]: r for r in previous.get("results", [])}
+    slower = []
+    for result in results:
+        old = before.get(result["module"])
+        if old and old["median_s"] > 0 and result["median_s"] > old["median_s"] * (1 + threshold):
+            slower.append(f"{result['module']}: {old['median_s']:.3f}s -> {result['median_s']:.3f}s")
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Heaviest imported modules to list")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON history to append to ('' to skip)")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = []
+    for module in args.modules:
+        result = measure(module, args.runs, args.top)
+        results.append(result)
+        print(f"import {module}: median {result['median_s']:.3f}s, best {result['best_s']:.3f}s")
+        for heavy in result["heaviest"]:
+            print(f"    {heavy['cumulative_s']:>8.3f}s  {heavy['module']}")
+        if result["eager_dependencies"]:
+            print(f"    loaded eagerly: {', '.join(result['eager_dependencies'])}")
+    if not args.history:
+        return
+
+    history = load_history(args.history)
+    if history:
+        for line in regressions(history[-1], results, args.threshold):
+            print(f"SLOWER {line}")
+    history.append({
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "runs": args.runs,
+        "results": results,
+    })
+    with open(args.history, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
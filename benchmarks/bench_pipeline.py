@@ -0,0 +1,223 @@
+"""
+Run the full extraction graph offline over a corpus of recorded pages.
+
+    python benchmarks/bench_pipeline.py [--fixtures benchmarks/fixtures] [--rounds 3]
+        [--workers 4] [--llm-latency 0.2] [--async] [--output report.json]
+
+Pages listed in ``<fixtures>/manifest.json`` are replayed from an offline
+fetch cache, and both LLMs are replaced by `ScriptedChatModel`, which answers
+the first extractor turn with the manifest's ``store_xpath`` calls and the
+summarizer with an empty summary. Reports throughput, per-node latency
+percentiles (from the profiling trace) and the process' peak RSS.
+"""
+import argparse
+import asyncio
+import contextlib
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import yaml
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Deterministic stand-in for the extractor/summarizer chat models."""
+
+    pages: List[Dict[str, Any]] = []
+    role: str = "extractor"
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        from langscrape.json import JSON_SCHEME
+
+        text = "\n".join(str(m.content) for m in messages)
+        usage = {"input_tokens": len(text) // 4, "output_tokens": 20, "total_tokens": len(text) // 4 + 20}
+        if self.role == "summarizer":
+            summary = {key: "" for key in JSON_SCHEME}
+            return AIMessage(content=f"```json\n{json.dumps(summary)}\n```", usage_metadata=usage)
+
+        turn = sum(isinstance(m, AIMessage) for m in messages)
+        page = next((p for p in self.pages if p.get("marker") and p["marker"] in text), None)
+        if turn or page is None:
+            return AIMessage(content="All fields pass.", usage_metadata=usage)
+        tool_calls = [
+            {"name": "store_xpath", "args": {"key": key, "xpath": xpath}, "id": f"call_{i}"}
+            for i, (key, xpath) in enumerate(page["xpaths"].items())
+        ]
+        return AIMessage(content="", tool_calls=tool_calls, usage_metadata=usage)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+
+def load_manifest(fixtures_dir: str) -> List[Dict[str, Any]]:
+    with open(os.path.join(fixtures_dir, "manifest.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def bench_config(workdir: str) -> dict:
+    """The default config with every writable path moved into ``workdir``."""
+    from langscrape.utils import DEFAULT_CONFIG_PATH, load_config
+
+    config = copy.deepcopy(load_config(DEFAULT_CONFIG_PATH))
+    config["output_dir"] = os.path.join(workdir, "out")
+    config["fetch"].update({
+        "stages": ["requests"],
+        "history_path": os.path.join(workdir, "fetch_history.json"),
+        "content_types_path": os.path.join(workdir, "content_types.json"),
+    })
+    config["fetch_cache"].update({"enabled": True, "path": os.path.join(workdir, "fetch_cache"), "offline": True})
+    config["templates"]["enabled"] = False
+    config["discovery"]["enabled"] = False
+    config["profiling"].update({"enabled": True, "trace_path": os.path.join(workdir, "trace.jsonl")})
+    config["batch"]["status_path"] = os.path.join(workdir, "status.jsonl")
+    return config
+
+
+def install_corpus(pages: List[Dict[str, Any]], fixtures_dir: str, cache_root: str) -> None:
+    """Load the fixtures into an offline fetch cache and make it the process-wide one."""
+    from langscrape.cache import FetchCache, set_fetch_cache
+
+    cache = FetchCache(cache_root, offline=True)
+    for page in pages:
+        path = os.path.join(fixtures_dir, page["file"])
+        is_pdf = path.endswith(".pdf")
+        content_type = "application/pdf" if is_pdf else "text/html; charset=utf-8"
+        cache.put_file(page["url"], path, "http", status=200, content_type=content_type, final_url=page["url"])
+    set_fetch_cache(cache)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def node_stats(trace_path: str) -> Dict[str, Dict[str, float]]:
+    walls: Dict[str, List[float]] = {}
+    cpus: Dict[str, List[float]] = {}
+    with open(trace_path, "r", encoding="utf-8") as f:
+        for line in f:
+            span = json.loads(line)
+            walls.setdefault(span["name"], []).append(span["attributes"]["langscrape.wall_s"])
+            cpus.setdefault(span["name"], []).append(span["attributes"]["langscrape.cpu_s"])
+    return {
+        name: {
+            "count": len(values),
+            "mean_s": round(sum(values) / len(values), 4),
+            "p50_s": percentile(values, 50),
+            "p90_s": percentile(values, 90),
+            "p99_s": percentile(values, 99),
+            "cpu_mean_s": round(sum(cpus[name]) / len(cpus[name]), 4),
+        }
+        for name, values in walls.items()
+    }
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_benchmark(
+    fixtures_dir: str = FIXTURES_DIR,
+    rounds: int = 1,
+    workers: int = 1,
+    llm_latency: float = 0.0,
+    use_async: bool = False,
+    workdir: Optional[str] = None,
+    verbose: bool = False,
+) -> Dict[str, Any]:
+    """Run every fixture ``rounds`` times through `run_batch` and return the report."""
+    workdir = workdir or tempfile.mkdtemp(prefix="langscrape-bench-")
+    config = bench_config(workdir)
+    config_path = os.path.join(workdir, "config.yaml")
+    with open(config_path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f, allow_unicode=True)
+    # process-wide caches created without a config read $LANGSCRAPE_CONFIG
+    os.environ["LANGSCRAPE_CONFIG"] = config_path
+
+    from langscrape.batch import arun_batch, run_batch
+
+    pages = load_manifest(fixtures_dir)
+    install_corpus(pages, fixtures_dir, config["fetch_cache"]["path"])
+    rows = [(f"{r}-{i}", page["url"]) for r in range(rounds) for i, page in enumerate(pages)]
+    models = dict(
+        extractor=ScriptedChatModel(pages=pages, role="extractor", latency=llm_latency),
+        summarizer=ScriptedChatModel(pages=pages, role="summarizer", latency=llm_latency),
+    )
+    kwargs = dict(config=config, workers=workers, resume=False, **models)
+
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        if not verbose:
+            stack.enter_context(contextlib.redirect_stdout(open(os.devnull, "w")))
+        counts = asyncio.run(arun_batch(rows, **kwargs)) if use_async else run_batch(rows, **kwargs)
+    wall = time.perf_counter() - start
+
+    return {
+        "pages": len(rows),
+        "rounds": rounds,
+        "workers": workers,
+        "async": use_async,
+        "llm_latency_s": llm_latency,
+        "results": counts,
+        "wall_s": round(wall, 3),
+        "pages_per_s": round(len(rows) / wall, 2),
+        "peak_rss_mb": _peak_rss_mb(),
+        "nodes": node_stats(config["profiling"]["trace_path"]),
+        "workdir": workdir,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated seconds per LLM call")
+    parser.add_argument("--async", dest="use_async", action="store_true")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--verbose", action="store_true", help="Keep the pipeline's own output")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.fixtures, args.rounds, args.workers, args.llm_latency, args.use_async, verbose=args.verbose)
+    print(f"{report['pages']} pages in {report['wall_s']:.2f}s ({report['pages_per_s']} pages/s), "
+          f"results {report['results']}, peak RSS {report['peak_rss_mb']} MB")
+    print(f"{'node':<22}{'runs':>6}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'cpu':>10}")
+    for name, stats in report["nodes"].items():
+        print(f"{name:<22}{stats['count']:>6}{stats['mean_s']:>10.4f}{stats['p50_s']:>10.4f}"
+              f"{stats['p90_s']:>10.4f}{stats['p99_s']:>10.4f}{stats['cpu_mean_s']:>10.4f}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
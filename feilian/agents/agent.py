@@ -2,6 +2,7 @@ import hashlib
 import warnings
 import json
 import os
+from copy import deepcopy
 from typing import List, Annotated, Dict, Optional
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, START, END
@@ -14,8 +15,10 @@ from feilian.etree_tools import (
     to_string,
     parse_html,
     gen_xpath_by_text,
+    gen_xpaths_by_texts,
     extraction_based_pruning,
     extract_text_by_xpath,
+    XPathIndex,
 )
 from feilian.agents.reducers import replace_with_id
 from feilian.chains.information_extraction_chain import (
@@ -193,9 +196,6 @@ def program_xpath_node(state: State):
     # get html snippets
     html_snippets = []
     for snippet in state["snippets"]:
-        raw_html = minify(snippet["raw_html"], keep_closing_tags=True)
-        tree = parse_html(raw_html)
-
         field_object = snippet["data"].get(field_name, {})
         if not field_object:
             continue
@@ -204,16 +204,20 @@ def program_xpath_node(state: State):
         if not values:
             continue
 
-        # get xpath for values
+        # the copy is pruned below; the parsed trees are kept for feedbacks
+        tree = deepcopy(trees[snippet["id"]])
+
+        # get xpath for values, sharing one sibling and text index per snippet
+        index = XPathIndex(tree)
         target_xpath = [
             x_path
-            for v in values
-            for x_path in gen_xpath_by_text(tree, v, **infer_xpath_kwargs)
+            for x_paths in gen_xpaths_by_texts(tree, values, index=index, **infer_xpath_kwargs)
+            for x_path in x_paths
         ]
         extract_xpath = [
             x_path
-            for v in values
-            for x_path in gen_xpath_by_text(tree, v, **extract_xpath_kwargs)
+            for x_paths in gen_xpaths_by_texts(tree, values, index=index, **extract_xpath_kwargs)
+            for x_path in x_paths
         ]
         if not target_xpath:
             continue
@@ -222,10 +226,10 @@ def program_xpath_node(state: State):
         if os.environ.get("ABLATION_EXPERIMENT", None) == "WITHOUT_CUE":
             cue_text = None
         if cue_text:
-            cue_xpath = gen_xpath_by_text(tree, cue_text, **infer_xpath_kwargs)
+            cue_xpath = gen_xpath_by_text(tree, cue_text, index=index, **infer_xpath_kwargs)
             if cue_xpath:
                 extract_xpath.extend(
-                    gen_xpath_by_text(tree, cue_text, **extract_xpath_kwargs)
+                    gen_xpath_by_text(tree, cue_text, index=index, **extract_xpath_kwargs)
                 )
         else:
             cue_xpath = []
@@ -19,6 +19,7 @@ from feilian.etree_tools import (
     deduplicate_to_prune,
     extraction_based_pruning,
     gen_xpath_by_text,
+    XPathIndex,
 )
 from feilian.etree_token_stats import extract_fragments_by_weight
 from feilian.html_constants import TEXT_VISUAL_PRIORITY
@@ -256,7 +257,8 @@ def ranking_operators(ops: List[Operator], raw_html: str) -> List[Operator]:
         operators = target_ops + [op]
         run_operators(tree, operators)
         groups_of_operators.append(operators)
-        results = [gen_xpath_by_text(tree, x) for x in op["data"]["value"]]
+        index = XPathIndex(tree)
+        results = [gen_xpath_by_text(tree, x, index=index) for x in op["data"]["value"]]
         results = [x for x in results if x]
 
         # skip if no results
@@ -6,6 +6,7 @@ from tokenizers import Tokenizer
 from copy import deepcopy
 from urllib.parse import unquote
 from typing import List, Optional
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 from lxml.cssselect import CSSSelector
 from functools import partial
@@ -488,7 +489,10 @@ def get_predicates(ele: etree._Element, with_id=True, with_class=True):
     return part_str
 
 
-def get_xpath(ele, short=True, with_id=True, with_class=True):
+def get_xpath(ele, short=True, with_id=True, with_class=True, index=None):
+    if index is not None:
+        return index.get_xpath(ele, short=short, with_id=with_id, with_class=with_class)
+
     xpath = ""
     while ele is not None:
         parent = ele.getparent()
@@ -523,6 +527,70 @@ def get_xpath(ele, short=True, with_id=True, with_class=True):
     return xpath
 
 
+class XPathIndex:
+    """
+    Sibling positions of the elements of one tree, so `get_xpath` costs
+    O(depth) instead of scanning every sibling at every level.
+
+    Each parent's children are grouped by tag and by (tag, predicates) the
+    first time an xpath passes through it; the result is the same as
+    `get_xpath`. The index is only valid while the tree is not modified.
+    """
+
+    def __init__(self, tree: etree._Element | etree._ElementTree):
+        self.root = tree.getroot() if isinstance(tree, etree._ElementTree) else tree
+        self._parents = {}
+        self._texts = None
+
+    @property
+    def texts(self) -> "TextIndex":
+        """The `TextIndex` of the same tree, built on first use."""
+        if self._texts is None:
+            self._texts = TextIndex(self.root)
+        return self._texts
+
+    def _siblings(self, parent: etree._Element):
+        siblings = self._parents.get(parent)
+        if siblings is None:
+            positions = {}
+            by_tag = defaultdict(list)
+            by_predicates = defaultdict(list)
+            for i, e in enumerate(parent):
+                positions[e] = i
+                by_tag[e.tag].append(i)
+                if isinstance(e.tag, str):
+                    by_predicates[(e.tag, get_predicates(e))].append(i)
+            siblings = self._parents[parent] = (positions, by_tag, by_predicates)
+        return siblings
+
+    def step(self, ele: etree._Element, parent: etree._Element, with_id=True, with_class=True):
+        """The location step of ``ele`` under ``parent``, e.g. ``/li[@class="x"][3]``."""
+        positions, by_tag, by_predicates = self._siblings(parent)
+        part_str = get_predicates(ele, with_id=with_id, with_class=with_class)
+        group = by_predicates.get((ele.tag, part_str), []) if part_str else by_tag[ele.tag]
+        if len(group) == 1:
+            return f"/{ele.tag}{part_str}"
+        return f"/{ele.tag}{part_str}[{bisect_right(group, positions[ele])}]"
+
+    def get_xpath(self, ele: etree._Element, short=True, with_id=True, with_class=True):
+        steps = []
+        while ele is not None:
+            parent = ele.getparent()
+            if parent is None:
+                steps.append(f"/{ele.tag}")
+                break
+
+            steps.append(self.step(ele, parent, with_id=with_id, with_class=with_class))
+
+            if short and ele.attrib and "id" in ele.attrib:
+                steps.append("/")
+                break
+
+            ele = parent
+
+        return "".join(reversed(steps))
+
+
 def itertext(ele):
     idx = 1
     tag = ele.tag
@@ -541,6 +609,60 @@ def itertext(ele):
             idx += 1
 
 
+class TextIndex:
+    """
+    The text nodes of one tree (as yielded by `itertext`), each normalized once.
+
+    `find` returns the nodes whose normalized text contains the target or is
+    contained in it. An exact match is a dict lookup. Containing nodes come
+    from `str.find` over the joined texts. Only distinct texts shorter than
+    the target are checked for being contained in it.
+    """
+
+    SEP = "\x00"
+
+    def __init__(self, tree: etree._Element | etree._ElementTree):
+        root = tree.getroot() if isinstance(tree, etree._ElementTree) else tree
+        self.entries = []  # (element, text_idx, text, normalized text)
+        self._exact = defaultdict(list)
+        for ele, text, idx in itertext(root):
+            processed_text = normalize_text(text)
+            if processed_text:
+                self._exact[processed_text].append(len(self.entries))
+                self.entries.append((ele, idx, text, processed_text))
+
+        self._starts = []
+        offset = 0
+        for entry in self.entries:
+            self._starts.append(offset)
+            offset += len(entry[3]) + len(self.SEP)
+        self._blob = self.SEP.join(entry[3] for entry in self.entries)
+        self._by_length = sorted(self._exact, key=len)
+        self._lengths = [len(x) for x in self._by_length]
+
+    def find(self, target_text: str) -> List[int]:
+        """Indices into ``entries``, in document order, matching the normalized ``target_text``."""
+        if not target_text:
+            return list(range(len(self.entries)))
+        if self.SEP in target_text:
+            return [
+                i
+                for i, entry in enumerate(self.entries)
+                if target_text in entry[3] or entry[3] in target_text
+            ]
+
+        hits = set(self._exact.get(target_text, ()))
+        pos = self._blob.find(target_text)
+        while pos != -1:
+            i = bisect_right(self._starts, pos) - 1
+            hits.add(i)
+            pos = self._blob.find(target_text, self._starts[i] + len(self.entries[i][3]))
+        for processed_text in self._by_length[: bisect_left(self._lengths, len(target_text))]:
+            if processed_text in target_text:
+                hits.update(self._exact[processed_text])
+        return sorted(hits)
+
+
 def gen_xpath_by_text(
     tree: etree._Element | etree._ElementTree,
     target_text: str,
@@ -548,28 +670,24 @@ def gen_xpath_by_text(
     short: bool = True,
     with_id: bool = True,
     with_class: bool = True,
+    index: Optional[XPathIndex] = None,
 ):
     target_text = normalize_text(target_text)
 
-    root = tree
-    if isinstance(tree, etree._ElementTree):
-        root = tree.getroot()
+    if index is None:
+        index = XPathIndex(tree)
 
     results = []
-    for ele, text, idx in itertext(root):
-        processed_text = normalize_text(text)
-        if not processed_text:
-            continue
-
-        if target_text in processed_text or processed_text in target_text:
-            results.append(
-                {
-                    "element": ele,
-                    "text_idx": idx,
-                    "target_text": target_text,
-                    "in_text": str(text),
-                }
-            )
+    for i in index.texts.find(target_text):
+        ele, idx, text, _ = index.texts.entries[i]
+        results.append(
+            {
+                "element": ele,
+                "text_idx": idx,
+                "target_text": target_text,
+                "in_text": str(text),
+            }
+        )
 
     if not results:
         return []
@@ -581,7 +699,7 @@ def gen_xpath_by_text(
 
     xpaths = []
     for result in results:
-        xpath = get_xpath(
+        xpath = index.get_xpath(
             result["element"], short=short, with_id=with_id, with_class=with_class
         )
         if text_suffix:
@@ -592,3 +710,15 @@ def gen_xpath_by_text(
         xpaths.append(xpath)
 
     return xpaths
+
+
+def gen_xpaths_by_texts(
+    tree: etree._Element | etree._ElementTree,
+    target_texts: List[str],
+    index: Optional[XPathIndex] = None,
+    **kwargs,
+) -> List[List[str]]:
+    """`gen_xpath_by_text` for every value in ``target_texts``, sharing one index of ``tree``."""
+    if index is None:
+        index = XPathIndex(tree)
+    return [gen_xpath_by_text(tree, x, index=index, **kwargs) for x in target_texts]
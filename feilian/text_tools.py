@@ -1,5 +1,6 @@
 import html
 import re
+from functools import lru_cache
 from inscriptis import get_text, ParserConfig
 
 
@@ -17,8 +18,70 @@ def convert_html_to_text(html: str) -> str:
     return text
 
 
+# every entity normalize_text used to replace before html.unescape
+_ENTITIES = {
+    "&lt;": "<",
+    "&gt;": ">",
+    "&amp;": "&",
+    "&quot;": '"',
+    "&#39;": "'",
+    "&apos;": "'",
+    "&#150;": "–",
+    "&nbsp;": " ",
+    "&#160;": " ",
+    "&#039;": "'",
+    "&#34;": '"',
+    "&reg;": "®",
+    "&rsquo;": "’",
+    "&#8226;": "•",
+    "&ndash;": "–",
+    "&#x27;": "'",
+    "&#40;": "(",
+    "&#41;": ")",
+    "&#47;": "/",
+    "&#43;": "+",
+    "&#035;": "#",
+    "&#38;": "&",
+    "&eacute;": "é",
+    "&frac12;": "½",
+}
+_ENTITY_RE = re.compile("|".join(re.escape(x) for x in _ENTITIES))
+_SPACES_RE = re.compile("[ \xa0]{2,}|\xa0")
+_CACHE_MAX_LEN = 256
+
+
+def _normalize_text(text):
+    if "&" in text:
+        decoded = _ENTITY_RE.sub(lambda m: _ENTITIES[m.group(0)], text)
+        if "&" in decoded:
+            # a literal or decoded "&" may form new entities, which the
+            # sequential replaces and html.unescape resolve in their own order
+            return _normalize_text_sequential(text)
+        text = decoded
+    return _SPACES_RE.sub(" ", text).strip()
+
+
+@lru_cache(maxsize=65536)
+def _normalize_short_text(text):
+    return _normalize_text(text)
+
+
 def normalize_text(text):
-    # print(text_list)
+    """
+    Decode the common HTML entities, turn non-breaking spaces into spaces,
+    collapse runs of spaces and strip.
+
+    Text without entities is handled by one regex pass. Short strings
+    (labels, dates, authors) repeat across nodes and pages, so they are
+    memoized.
+    """
+    if len(text) <= _CACHE_MAX_LEN:
+        return _normalize_short_text(text)
+    return _normalize_text(text)
+
+
+def _normalize_text_sequential(text):
+    # the original chain; exact reference for text with entities that cascade
     text = text.replace("&lt;", "<")
     text = text.replace("&gt;", ">")
     text = text.replace("&amp;", "&")
@@ -1,5 +1,17 @@
-from .html.utils import clean_html_for_extraction3
-from .browser.chrome import fetch_html_patchright
+import importlib
+
+# loaded on first access, so importing a submodule stays cheap
+_LAZY = {
+    "clean_html_for_extraction3": ".html.utils",
+    "fetch_html_patchright": ".browser.chrome",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "clean_html_for_extraction3",
@@ -1,14 +1,18 @@
 from .state import AgentState
-from ..nodes.extraction_reasoner import extraction_reasoner
+from ..nodes.extraction_reasoner import extraction_reasoner, aextraction_reasoner
 from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode, tools_condition
-from ..nodes.url_handler import url_handler
+from ..nodes.url_handler import url_handler, aurl_handler
+from ..nodes.html_compactor import html_compactor
+from ..nodes.template_matcher import template_matcher
+from ..nodes.xpath_discovery import xpath_discovery
 from ..nodes.feature_binder import feature_binder
-from ..nodes.summarizer import summarizer
+from ..nodes.summarizer import summarizer, asummarizer
 from ..nodes.data_collator import data_collator
 from ..nodes.post_processor import post_processor
 from typing import Literal
-from ..utils import load_config
+from ..settings import as_settings, run_settings
+from ..profiling import get_trace_writer, instrument_node
 
 def is_pdf_condition(state: AgentState) -> str:
     """
@@ -16,24 +20,56 @@ def is_pdf_condition(state: AgentState) -> str:
     """
     return "pdf" if state.get("url_is_pdf", False) else "html"
 
+def template_condition(state: AgentState) -> str:
+    """
+    Skip the extraction loop when the cached template validated.
+    """
+    return "hit" if state.get("template_hit", False) else "miss"
+
+def discovery_condition(state: AgentState) -> str:
+    """
+    Skip the extraction loop when the discovered XPaths validated.
+    """
+    return "hit" if state.get("discovery_hit", False) else "miss"
+
 def tools_condition_with_iter_limit(
     state,
     messages_key: str = "messages",
 ) -> Literal["tools", "__end__"]:
-    config = load_config()
-    return tools_condition(state, messages_key) if state["iterations"] <=  config['extractor']['max_iters'] else "__end__"
+    max_iters = run_settings(state).max_iters
+    return tools_condition(state, messages_key) if state["iterations"] <= max_iters else "__end__"
 
 
-def get_graph(tools):
+def get_graph(tools, use_async: bool = False, settings=None):
+    """
+    Build the extraction graph.
+    With ``use_async`` the fetch and LLM nodes are coroutines, so the compiled
+    graph must be driven with ``ainvoke`` (many runs can share one event loop).
+    Unless ``profiling.enabled`` is false, every node is wrapped by
+    `instrument_node` and records its timings in ``node_timings``.
+    ``settings`` defaults to `get_settings()`; the nodes read theirs from
+    ``state["settings"]``.
+    """
     graph = StateGraph(AgentState)
+    config = as_settings(settings)
+    profiling = (config.get("profiling", {}) or {}).get("enabled", True)
+    writer = get_trace_writer(config)
+
+    def add_node(name, node):
+        if profiling:
+            node = instrument_node(name, node, use_async=use_async, writer=writer)
+        graph.add_node(name, node)
 
-    graph.add_node("url_handler", url_handler)
-    graph.add_node("extraction_reasoner", extraction_reasoner)
-    graph.add_node("tools", ToolNode(tools))
-    graph.add_node("feature_binder", feature_binder)
-    graph.add_node("summarizer", summarizer)
-    graph.add_node("data_collator", data_collator)
-    graph.add_node("post_processor", post_processor)
+    add_node("url_handler", aurl_handler if use_async else url_handler)
+    add_node("template_matcher", template_matcher)
+    add_node("xpath_discovery", xpath_discovery)
+    add_node("html_compactor", html_compactor)
+    add_node("extraction_reasoner", aextraction_reasoner if use_async else extraction_reasoner)
+    add_node("tools", ToolNode(tools))
+    add_node("feature_binder", feature_binder)
+    add_node("summarizer", asummarizer if use_async else summarizer)
+    add_node("data_collator", data_collator)
+    add_node("post_processor", post_processor)
 
     graph.add_edge(START, "url_handler")
 
@@ -42,9 +78,26 @@ def get_graph(tools):
         is_pdf_condition,
         {
             "pdf": "summarizer",
-            "html": "extraction_reasoner",
+            "html": "template_matcher",
+        },
+    )
+    graph.add_conditional_edges(
+        "template_matcher",
+        template_condition,
+        {
+            "hit": "feature_binder",
+            "miss": "xpath_discovery",
+        },
+    )
+    graph.add_conditional_edges(
+        "xpath_discovery",
+        discovery_condition,
+        {
+            "hit": "feature_binder",
+            "miss": "html_compactor",
         },
     )
+    graph.add_edge("html_compactor", "extraction_reasoner")
 
     graph.add_conditional_edges(
         "extraction_reasoner",
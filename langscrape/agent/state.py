@@ -1,24 +1,36 @@
-from typing import TypedDict, Annotated, Sequence, Union, Dict, Any, NotRequired, List
+import operator
+from typing import TypedDict, Annotated, Sequence, Dict, Any, NotRequired, List, Mapping, Optional, Union
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
-from langchain_openai import ChatOpenAI
-from langchain_deepseek import ChatDeepSeek
+from langchain_core.runnables import Runnable
 from datetime import datetime
 
 class AgentState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], add_messages]
-    extractor: Union[ChatOpenAI, ChatDeepSeek]
-    summarizer: Union[ChatOpenAI, ChatDeepSeek]
+    extractor: Runnable  # ChatOpenAI / ChatDeepSeek, with the tools bound
+    summarizer: Runnable
     url_is_pdf: bool
+    fetch_stage: NotRequired[str]
     invoke_time: datetime
     finish_time: datetime
     id: str
+    run_token: NotRequired[str]  # private key of the run's parked futures, see park_future
     url: str
+    raw_content: NotRequired[Union[str, bytes]]  # the fetched page before cleaning, for newspaper's metadata
     cleaned_content: str
+    compacted_content: NotRequired[str]
+    compaction: NotRequired[Dict[str, Any]]
     iterations: int
+    settings: NotRequired[Mapping[str, Any]]
     global_state: Dict[str, Dict[str, Any]]
+    template_hit: NotRequired[bool]
+    page_signals: NotRequired[Dict[str, List[str]]]  # metadata values read from the raw page, see page_signals
+    discovery_hit: NotRequired[bool]
     extracted_fields: Dict[str, Any]
     summary: BaseMessage
+    speculative_summary: NotRequired[Optional[Dict[str, Any]]]  # summarizer started early, see start_speculative_summary
     result: Dict[str, Any]
-    token_usage: NotRequired[Dict[str, Dict[str, int]]]
+    token_usage: NotRequired[Dict[str, Any]]
+    node_timings: NotRequired[Annotated[List[Dict[str, Any]], operator.add]]
     traditional_flag: List[str] = []
+    traditional_pending: NotRequired[Optional[List[str]]]  # fields the newspaper fallback is still parsing, see feature_binder
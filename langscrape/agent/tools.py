@@ -25,6 +25,7 @@ def make_store_xpath(state_dict: dict):
 
         entry["xpath"] = xpath
         entry.pop("value", None)
+        entry.pop("source", None)
         state_dict[key] = entry
         return f"Stored XPath for '{key}': {xpath}"
     return store_xpath
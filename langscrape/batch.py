@@ -0,0 +1,294 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from .agent.graph import get_graph
+from .agent.tools import make_store_xpath, make_store_value
+from .browser.http import aclose_http_clients
+from .cache import flush_stores, get_fetch_cache, get_template_store
+from .concurrency import configure_limits, drop_futures, new_run_token
+from .settings import as_settings
+from .utils import initialize_global_state, get_extractor, get_summarizer, summarize_token_usage
+
+Row = Tuple[str, str]  # (id, url)
+
+
+class BatchStatus:
+    """
+    Append-only JSONL journal of per-URL status.
+
+    Every transition (``running`` → ``success`` / ``failure``) is a new line,
+    so a crashed run leaves a readable journal and the last line per id wins.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line after a crash
+                    self.entries[str(entry.get("id"))] = entry
+            self._end_last_line()
+
+    def _end_last_line(self) -> None:
+        # a crash can leave the last line without its newline; the next record must not be glued onto it
+        with open(self.path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def is_done(self, id: str) -> bool:
+        return self.entries.get(str(id), {}).get("result") == "success"
+
+    def record(self, id: str, entry: Dict[str, Any]) -> None:
+        entry = {"id": str(id), **entry}
+        with self._lock:
+            self.entries[str(id)] = entry
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+                f.flush()
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for entry in self.entries.values():
+            counts[entry.get("result")] = counts.get(entry.get("result"), 0) + 1
+        return counts
+
+
+def load_table(path: str, url_column: str = "url", id_column: str = "ID") -> List[Row]:
+    """Read (id, url) rows from an .xlsx/.xls/.csv table."""
+    import pandas as pd
+
+    if path.lower().endswith((".xlsx", ".xls")):
+        df = pd.read_excel(path)
+    else:
+        df = pd.read_csv(path)
+    return [(str(id), str(url)) for id, url in zip(df[id_column], df[url_column])]
+
+
+def build_models(config: dict):
+    """Create the extractor and summarizer once; they are shared by all rows."""
+    load_dotenv(config["api_keys"])
+    return get_extractor(config), get_summarizer(config)
+
+
+def _prepare(url: str, id: str, config: dict, extractor, summarizer, use_async: bool = False):
+    # tools close over the per-URL global_state, so the graph is built per row
+    config = as_settings(config)
+    global_state = initialize_global_state(config, url=url)
+    store_xpath = make_store_xpath(global_state)
+    store_field_value = make_store_value(global_state)
+    tools = [store_xpath, store_field_value]
+    graph = get_graph(tools=tools, use_async=use_async, settings=config)
+    extractor_with_tools = extractor.bind_tools(tools, parallel_tool_calls=config["extractor"]["allow_parallel_tool_calls"])
+    initial_state = {
+        "messages": [],
+        "url": url,
+        "global_state": global_state,
+        "extractor": extractor_with_tools,
+        "summarizer": summarizer,
+        "iterations": 1,
+        "id": id,
+        "run_token": new_run_token(),
+        "invoke_time": datetime.now(),
+        "settings": config,
+    }
+    return graph, initial_state
+
+
+def extract(url: str, id: str, config: dict = None, extractor=None, summarizer=None) -> dict:
+    """
+    Run the extraction graph for a single URL.
+    ``config`` is a dict or `Settings`, e.g.
+    ``get_settings().with_overrides({"extractor": {"max_iters": 3}})`` for
+    this run only; it defaults to the process-wide settings.
+    """
+    config = as_settings(config)
+    if extractor is None or summarizer is None:
+        extractor, summarizer = build_models(config)
+    graph, initial_state = _prepare(url, id, config, extractor, summarizer)
+    try:
+        return graph.invoke(initial_state)
+    finally:
+        drop_futures(initial_state["run_token"])
+
+
+async def aextract(url: str, id: str, config: dict = None, extractor=None, summarizer=None) -> dict:
+    """Async `extract`: runs the async-compiled graph with ``ainvoke``."""
+    config = as_settings(config)
+    if extractor is None or summarizer is None:
+        extractor, summarizer = build_models(config)
+    graph, initial_state = _prepare(url, id, config, extractor, summarizer, use_async=True)
+    try:
+        return await graph.ainvoke(initial_state)
+    finally:
+        drop_futures(initial_state["run_token"])
+
+
+def _success_entry(url: str, extraction: dict, start: float) -> Dict[str, Any]:
+    return {
+        "url": url,
+        "result": "success",
+        "error": None,
+        "token_usage": extraction.get("token_usage", {}),
+        "traditional_flag": extraction.get("traditional_flag", []),
+        "time": round(time.perf_counter() - start, 2),
+    }
+
+
+def _failure_entry(url: str, error: Exception, start: float) -> Dict[str, Any]:
+    print(f"failed with {url}: {error}")
+    return {
+        "url": url,
+        "result": "failure",
+        "error": str(error),
+        "token_usage": None,
+        "time": round(time.perf_counter() - start, 2),
+    }
+
+
+def _run_row(id: str, url: str, config: dict, extractor, summarizer, status: BatchStatus) -> Dict[str, Any]:
+    status.record(id, {"url": url, "result": "running", "started": datetime.now().isoformat()})
+    start = time.perf_counter()
+    try:
+        entry = _success_entry(url, extract(url, id, config, extractor, summarizer), start)
+    except Exception as e:
+        entry = _failure_entry(url, e, start)
+    status.record(id, entry)
+    return entry
+
+
+async def _arun_row(id: str, url: str, config: dict, extractor, summarizer, status: BatchStatus) -> Dict[str, Any]:
+    status.record(id, {"url": url, "result": "running", "started": datetime.now().isoformat()})
+    start = time.perf_counter()
+    try:
+        entry = _success_entry(url, await aextract(url, id, config, extractor, summarizer), start)
+    except Exception as e:
+        entry = _failure_entry(url, e, start)
+    status.record(id, entry)
+    return entry
+
+
+def _start_batch(rows, config, fetch_concurrency, llm_concurrency, status_path, resume):
+    batch_config = config.get("batch", {}) or {}
+    status_path = status_path or batch_config.get("status_path", "log.jsonl")
+    configure_limits(
+        fetch=fetch_concurrency or batch_config.get("fetch_concurrency"),
+        llm=llm_concurrency or batch_config.get("llm_concurrency"),
+    )
+
+    if not resume and os.path.exists(status_path):
+        os.remove(status_path)
+    status = BatchStatus(status_path)
+    rows = list(rows)
+    pending = [(id, url) for id, url in rows if not status.is_done(id)]
+    print(f"{len(rows) - len(pending)} / {len(rows)} already done, {len(pending)} to go")
+    return status, pending
+
+
+def _finish_batch(config: dict, status: BatchStatus) -> Dict[str, int]:
+    flush_stores()
+    store = get_template_store(config)
+    if store is not None:
+        print(f"XPath templates: {len(store.templates)} domains, {store.stats}")
+    fetch_cache = get_fetch_cache(config)
+    if fetch_cache is not None:
+        print(f"Fetch cache: {fetch_cache.stats}")
+    usage = summarize_token_usage(entry.get("token_usage") for entry in status.entries.values())
+    for agent, totals in usage.items():
+        print(f"LLM usage [{agent}]: {totals}")
+    return status.counts()
+
+
+def run_batch(
+    rows: Iterable[Row],
+    config: dict = None,
+    workers: Optional[int] = None,
+    fetch_concurrency: Optional[int] = None,
+    llm_concurrency: Optional[int] = None,
+    status_path: Optional[str] = None,
+    resume: bool = True,
+    extractor=None,
+    summarizer=None,
+) -> Dict[str, int]:
+    """
+    Extract many URLs concurrently.
+
+    ``workers`` bounds the number of graphs in flight, while
+    ``fetch_concurrency`` and ``llm_concurrency`` bound browser/HTTP fetches
+    and LLM calls across all of them. Rows already marked ``success`` in the
+    status journal are skipped when ``resume`` is set. ``extractor`` and
+    ``summarizer`` default to the configured models.
+    """
+    config = as_settings(config)
+    workers = workers or (config.get("batch", {}) or {}).get("workers", 4)
+    status, pending = _start_batch(rows, config, fetch_concurrency, llm_concurrency, status_path, resume)
+
+    if extractor is None or summarizer is None:
+        extractor, summarizer = build_models(config)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_run_row, id, url, config, extractor, summarizer, status): url
+            for id, url in pending
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            entry = future.result()
+            print(f"[{done} / {len(pending)}] {entry['result']}: {futures[future]}")
+
+    return _finish_batch(config, status)
+
+
+async def arun_batch(
+    rows: Iterable[Row],
+    config: dict = None,
+    workers: Optional[int] = None,
+    fetch_concurrency: Optional[int] = None,
+    llm_concurrency: Optional[int] = None,
+    status_path: Optional[str] = None,
+    resume: bool = True,
+    extractor=None,
+    summarizer=None,
+) -> Dict[str, int]:
+    """
+    Async `run_batch`: every graph runs on the current event loop, so
+    ``workers`` can be far larger than a thread pool would allow.
+    """
+    config = as_settings(config)
+    workers = workers or (config.get("batch", {}) or {}).get("workers", 4)
+    status, pending = _start_batch(rows, config, fetch_concurrency, llm_concurrency, status_path, resume)
+
+    if extractor is None or summarizer is None:
+        extractor, summarizer = build_models(config)
+    in_flight = asyncio.Semaphore(workers)
+
+    async def run(id: str, url: str):
+        async with in_flight:
+            return url, await _arun_row(id, url, config, extractor, summarizer, status)
+
+    tasks = [asyncio.ensure_future(run(id, url)) for id, url in pending]
+    try:
+        for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+            url, entry = await task
+            print(f"[{done} / {len(pending)}] {entry['result']}: {url}")
+    finally:
+        await aclose_http_clients()
+
+    return _finish_batch(config, status)
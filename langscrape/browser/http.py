@@ -0,0 +1,219 @@
+import asyncio
+import contextlib
+import threading
+import weakref
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..settings import get_settings
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# longest Retry-After (s) honoured when http.max_retry_after is not set
+MAX_RETRY_AFTER = 60
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/140.0.0.0 Safari/537.36"
+)
+
+
+def _has_module(name: str) -> bool:
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+# requests/urllib3 and httpx decode brotli only when a brotli package is installed
+ACCEPT_ENCODING = "gzip, deflate, br" if _has_module("brotli") or _has_module("brotlicffi") else "gzip, deflate"
+
+
+def _settings(config: dict = None) -> dict:
+    if config is None:
+        config = get_settings()
+    return config.get("http", {}) or {}
+
+
+class _CappedRetry(Retry):
+    """`Retry` that waits at most ``max_retry_after`` seconds for a ``Retry-After``."""
+
+    max_retry_after: float = MAX_RETRY_AFTER
+
+    def new(self, **kw) -> "_CappedRetry":
+        retry = super().new(**kw)
+        retry.max_retry_after = self.max_retry_after
+        return retry
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, self.max_retry_after)
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session(config: dict = None) -> requests.Session:
+    """
+    Return the process-wide `requests.Session`.
+
+    Connections are kept alive in per-host pools (``http.per_host``
+    connections for up to ``http.max_hosts`` hosts), and idempotent requests
+    are retried with exponential backoff on connection errors and
+    429/5xx responses, honouring ``Retry-After`` up to
+    ``http.max_retry_after`` seconds.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            settings = _settings(config)
+            retry = _CappedRetry(
+                total=settings.get("retries", 3),
+                backoff_factor=settings.get("backoff_factor", 0.5),
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=frozenset({"GET", "HEAD"}),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            retry.max_retry_after = settings.get("max_retry_after", MAX_RETRY_AFTER)
+            adapter = HTTPAdapter(
+                pool_connections=settings.get("max_hosts", 64),
+                pool_maxsize=settings.get("per_host", 8),
+                pool_block=True,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING})
+            _session = session
+        return _session
+
+
+def _timeout(settings: dict):
+    return settings.get("connect_timeout", 5), settings.get("timeout", 20)
+
+
+def http_get(url: str, headers: dict = None, stream: bool = False, **kwargs) -> requests.Response:
+    """GET through the pooled session with the configured timeouts and retries."""
+    kwargs.setdefault("timeout", _timeout(_settings()))
+    return get_session().get(url, headers=headers, stream=stream, **kwargs)
+
+
+def http_head(url: str, headers: dict = None, **kwargs) -> requests.Response:
+    """HEAD through the pooled session (redirects are followed)."""
+    kwargs.setdefault("timeout", _timeout(_settings()))
+    kwargs.setdefault("allow_redirects", True)
+    return get_session().head(url, headers=headers, **kwargs)
+
+
+class _AsyncPool:
+    """An `httpx.AsyncClient` plus per-host semaphores, bound to one event loop."""
+
+    def __init__(self, settings: dict):
+        http2 = settings.get("http2", True) and _has_module("h2")
+        self.per_host = settings.get("per_host", 8)
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING},
+            timeout=httpx.Timeout(settings.get("timeout", 20), connect=settings.get("connect_timeout", 5)),
+            limits=httpx.Limits(
+                max_connections=settings.get("max_hosts", 64) * self.per_host,
+                max_keepalive_connections=settings.get("max_hosts", 64),
+            ),
+        )
+        self.hosts: Dict[str, asyncio.Semaphore] = {}
+
+    def host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self.hosts:
+            self.hosts[host] = asyncio.Semaphore(self.per_host)
+        return self.hosts[host]
+
+
+_async_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _AsyncPool]" = weakref.WeakKeyDictionary()
+
+
+def _get_async_pool(config: dict = None) -> _AsyncPool:
+    loop = asyncio.get_running_loop()
+    pool = _async_pools.get(loop)
+    if pool is None:
+        pool = _async_pools[loop] = _AsyncPool(_settings(config))
+    return pool
+
+
+def get_async_client(config: dict = None) -> httpx.AsyncClient:
+    """Return the pooled `httpx.AsyncClient` of the running event loop (HTTP/2 when ``h2`` is installed)."""
+    return _get_async_pool(config).client
+
+
+def _retry_delay(settings: dict, response: Optional[httpx.Response], attempt: int) -> float:
+    """Seconds before the next attempt: ``Retry-After`` (capped) or exponential backoff."""
+    retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+    if retry_after.isdigit():
+        return min(float(retry_after), settings.get("max_retry_after", MAX_RETRY_AFTER))
+    return settings.get("backoff_factor", 0.5) * 2 ** attempt
+
+
+async def _asend(pool: _AsyncPool, settings: dict, method: str, url: str, headers: dict, stream: bool, slot: bool, **kwargs):
+    retries = settings.get("retries", 3)
+    for attempt in range(retries + 1):
+        request = pool.client.build_request(method, url, headers=headers, **kwargs)
+        try:
+            if slot:
+                async with pool.host_slot(url):
+                    response = await pool.client.send(request, stream=stream)
+            else:
+                response = await pool.client.send(request, stream=stream)
+        except httpx.TransportError:
+            if attempt == retries:
+                raise
+            await asyncio.sleep(_retry_delay(settings, None, attempt))
+            continue
+        if response.status_code not in RETRY_STATUSES or attempt == retries:
+            return response
+        if stream:
+            await response.aclose()
+        await asyncio.sleep(_retry_delay(settings, response, attempt))
+    return response
+
+
+async def ahttp_request(method: str, url: str, headers: dict = None, **kwargs) -> httpx.Response:
+    """
+    Async request through the loop's pooled client, with the same per-host
+    limit and retry/backoff policy as the sync session.
+    """
+    return await _asend(_get_async_pool(), _settings(), method, url, headers, stream=False, slot=True, **kwargs)
+
+
+@contextlib.asynccontextmanager
+async def ahttp_stream(method: str, url: str, headers: dict = None, **kwargs) -> AsyncIterator[httpx.Response]:
+    """
+    `ahttp_request` whose body is read in chunks inside the ``async with``
+    block; the per-host slot is held until the block exits.
+    """
+    pool = _get_async_pool()
+    async with pool.host_slot(url):
+        response = await _asend(pool, _settings(), method, url, headers, stream=True, slot=False, **kwargs)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+
+async def ahttp_get(url: str, headers: dict = None, **kwargs) -> httpx.Response:
+    return await ahttp_request("GET", url, headers=headers, **kwargs)
+
+
+async def aclose_http_clients() -> None:
+    """Close the running loop's async client (call before the loop exits)."""
+    pool = _async_pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.client.aclose()
@@ -0,0 +1,238 @@
+import asyncio
+import re
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from .chrome import fetch_html_patchright, fetch_html_patchright_sync
+from .request import afetch_response, fetch_response
+from .sniff import PDF, HTML, asniff_content_kind, response_content_kind, sniff_content_kind
+from ..cache import domain_key
+from ..cache.json_store import JsonStore
+from ..concurrency import fetch_slot
+from ..exceptions import TooShortHtml
+from ..html.utils import clean_html_for_extraction3
+from ..settings import get_settings
+
+Raw = Union[str, bytes]
+# a stage returns the raw body, or ``(body, metadata)`` with e.g. the HTTP status
+Response = Union[Raw, Tuple[Raw, Dict[str, Any]]]
+
+# pages that need a real browser to render or to get past a bot check
+JS_MARKERS = re.compile(
+    r"enable javascript|javascript is (?:disabled|required)|please turn on javascript"
+    r"|just a moment\.\.\.|cf-browser-verification|challenge-platform|captcha-delivery"
+    r"|<div id=[\"'](?:root|app|__next)[\"']>\s*</div>|<app-root>\s*</app-root>",
+    re.IGNORECASE,
+)
+SNIFF_BYTES = 200_000
+
+
+class Fetcher:
+    """A named fetch stage with a sync and an async implementation."""
+
+    def __init__(self, name: str, fetch: Callable[[str], Response], afetch: Callable[[str], Awaitable[Response]]):
+        self.name = name
+        self.fetch = fetch
+        self.afetch = afetch
+
+
+FETCHERS: Dict[str, Fetcher] = {}
+
+
+def register_fetcher(
+    name: str, fetch: Callable[[str], Response], afetch: Callable[[str], Awaitable[Response]] = None
+) -> None:
+    """
+    Make a fetch stage available to ``fetch.stages`` in the config. ``fetch``
+    returns the raw body or ``(body, metadata)``; a ``status`` in the
+    metadata outside 2xx rejects the response.
+    """
+    if afetch is None:
+        async def afetch(url: str) -> Response:
+            return await asyncio.to_thread(fetch, url)
+    FETCHERS[name] = Fetcher(name, fetch, afetch)
+
+
+register_fetcher("requests", fetch_response, afetch_response)
+register_fetcher("browser", fetch_html_patchright_sync, fetch_html_patchright)
+
+
+class FetchHistory(JsonStore):
+    """
+    Per-domain record of which stages produced usable HTML.
+
+    A stage that failed ``skip_after`` times in a row for a domain is
+    skipped there (the last stage never is), so JS-only sites go straight to
+    the browser. One success resets the count.
+    """
+
+    def __init__(self, path: Optional[str] = None, skip_after: int = 3):
+        super().__init__(path)
+        self.skip_after = skip_after
+        self.domains: Dict[str, Dict[str, Dict[str, int]]] = self._load() or {}
+
+    def _payload(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        return self.domains
+
+    def should_skip(self, url: str, stage: str) -> bool:
+        record = self.domains.get(domain_key(url), {}).get(stage, {})
+        return record.get("consecutive_failures", 0) >= self.skip_after
+
+    def record(self, url: str, stage: str, ok: bool) -> None:
+        with self._lock:
+            record = self.domains.setdefault(domain_key(url), {}).setdefault(
+                stage, {"successes": 0, "failures": 0, "consecutive_failures": 0}
+            )
+            if ok:
+                record["successes"] += 1
+                record["consecutive_failures"] = 0
+            else:
+                record["failures"] += 1
+                record["consecutive_failures"] += 1
+            self._changed()
+
+
+_history: Optional[FetchHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_fetch_history(config: dict = None) -> FetchHistory:
+    global _history
+    with _history_lock:
+        if _history is None:
+            settings = (config or get_settings()).get("fetch", {}) or {}
+            _history = FetchHistory(settings.get("history_path"), settings.get("skip_after_failures", 3))
+        return _history
+
+
+def _split_response(response: Response) -> Tuple[Raw, Dict[str, Any]]:
+    if isinstance(response, tuple):
+        raw, meta = response
+        return raw, meta or {}
+    return response, {}
+
+
+def _is_error(status: Optional[int]) -> bool:
+    return status is not None and not 200 <= status < 300
+
+
+def rejection_reason(raw: Raw, min_raw_bytes: int, status: Optional[int] = None) -> Optional[str]:
+    """Why a raw response is not worth cleaning, or None if it looks usable."""
+    if _is_error(status):
+        return f"HTTP {status}"
+    if not raw:
+        return "empty response"
+    if len(raw) < min_raw_bytes:
+        return f"only {len(raw)} bytes"
+    head = raw[:SNIFF_BYTES]
+    if isinstance(head, bytes):
+        head = head.decode("utf-8", "ignore")
+    match = JS_MARKERS.search(head)
+    if match:
+        return f"needs JavaScript ({match.group(0)[:40]!r})"
+    return None
+
+
+def _stages(url: str, config: dict) -> List[Fetcher]:
+    settings = config.get("fetch", {}) or {}
+    names = settings.get("stages", ["requests", "browser"])
+    history = get_fetch_history(config)
+    stages = [FETCHERS[name] for name in names]
+    # never skip the last stage, it is the one that raises
+    return [s for s in stages[:-1] if not history.should_skip(url, s.name)] + stages[-1:]
+
+
+def _accept(url: str, stage: Fetcher, raw: Raw, meta: dict, config: dict, last: bool) -> Tuple[Optional[str], int]:
+    """
+    Return ``(cleaned_html or None, cleaned length)`` for one stage's output.
+    Error statuses are rejected at every stage; the size and JavaScript
+    checks are left to the cleaned length at the last one.
+    """
+    settings = config.get("fetch", {}) or {}
+    min_len = (config.get("exceptions", {}) or {}).get("min_html_length", 3000)
+    status = meta.get("status")
+    if not last:
+        reason = rejection_reason(raw, settings.get("min_raw_bytes", 2000), status)
+    else:
+        reason = f"HTTP {status}" if _is_error(status) else None
+    if reason:
+        print(f"[{stage.name}] {url}: {reason}, trying next stage")
+        return None, 0
+    cleaned_html = clean_html_for_extraction3(raw) if raw else ""
+    if len(cleaned_html) < min_len:
+        print(f"[{stage.name}] {url}: cleaned HTML too short ({len(cleaned_html)} chars)")
+        return None, len(cleaned_html)
+    return cleaned_html, len(cleaned_html)
+
+
+def fetch_page(url: str, config: dict = None) -> Tuple[str, str, Optional[Raw], str]:
+    """
+    Run the configured fetch stages in order until one yields usable HTML.
+
+    Returns ``(cleaned_html, stage_name, raw, kind)``. Each stage's output is
+    cleaned at most once; raises `TooShortHtml` when every stage falls short.
+
+    The content kind comes from the first successful response (its
+    ``Content-Type`` or ``%PDF-`` magic bytes); only when a response tells
+    nothing, e.g. browser-rendered HTML, is `sniff_content_kind` asked. A PDF
+    is returned uncleaned as ``("", stage_name, body, "pdf")``, with ``body``
+    None when the response was not the document itself.
+    """
+    if config is None:
+        config = get_settings()
+    history = get_fetch_history(config)
+    stages = _stages(url, config)
+    best = 0
+    for i, stage in enumerate(stages):
+        with fetch_slot():
+            raw, meta = _split_response(stage.fetch(url))
+            seen = kind = None
+            if not _is_error(meta.get("status")):
+                seen = response_content_kind(url, raw, meta, config)
+                kind = seen or sniff_content_kind(url, config)
+        if kind == PDF:
+            history.record(url, stage.name, True)
+            return "", stage.name, raw if seen == PDF else None, PDF
+        cleaned_html, length = _accept(url, stage, raw, meta, config, last=i == len(stages) - 1)
+        history.record(url, stage.name, cleaned_html is not None)
+        if cleaned_html is not None:
+            return cleaned_html, stage.name, raw, HTML
+        best = max(best, length)
+    raise TooShortHtml(best)
+
+
+def fetch_clean_html(url: str, config: dict = None) -> Tuple[str, str]:
+    """`fetch_page` without the raw response: ``(cleaned_html, stage_name)``."""
+    return fetch_page(url, config)[:2]
+
+
+async def afetch_page(url: str, config: dict = None) -> Tuple[str, str, Optional[Raw], str]:
+    """Async `fetch_page`; cleaning runs in a worker thread."""
+    if config is None:
+        config = get_settings()
+    history = get_fetch_history(config)
+    stages = _stages(url, config)
+    best = 0
+    for i, stage in enumerate(stages):
+        async with fetch_slot():
+            raw, meta = _split_response(await stage.afetch(url))
+            seen = kind = None
+            if not _is_error(meta.get("status")):
+                seen = response_content_kind(url, raw, meta, config)
+                kind = seen or await asniff_content_kind(url, config)
+        if kind == PDF:
+            history.record(url, stage.name, True)
+            return "", stage.name, raw if seen == PDF else None, PDF
+        cleaned_html, length = await asyncio.to_thread(
+            _accept, url, stage, raw, meta, config, i == len(stages) - 1
+        )
+        history.record(url, stage.name, cleaned_html is not None)
+        if cleaned_html is not None:
+            return cleaned_html, stage.name, raw, HTML
+        best = max(best, length)
+    raise TooShortHtml(best)
+
+
+async def afetch_clean_html(url: str, config: dict = None) -> Tuple[str, str]:
+    """Async `fetch_clean_html`."""
+    return (await afetch_page(url, config))[:2]
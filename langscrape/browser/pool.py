@@ -0,0 +1,205 @@
+import asyncio
+import atexit
+import threading
+from typing import List, Optional
+
+from ..settings import get_settings
+
+LAUNCH_ARGS = [
+    "--start-maximized",
+    "--disable-blink-features=AutomationControlled",
+    "--disable-web-security",
+    "--disable-features=IsolateOrigins,site-per-process",
+    "--disable-gpu",
+]
+
+
+class _Slot:
+    """One persistent context bound to its own profile directory."""
+
+    def __init__(self, user_data_dir: str):
+        self.user_data_dir = user_data_dir
+        self.context = None
+        self.pages_served = 0
+
+    async def close(self):
+        context, self.context = self.context, None
+        self.pages_served = 0
+        if context is not None:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+
+class BrowserPool:
+    """
+    Long-lived pool of Patchright contexts.
+
+    Each slot owns a persistent context with its own profile directory, so
+    slots can fetch concurrently. A context is recycled after
+    ``max_pages_per_context`` pages or when it crashes. The pool lives on a
+    private event loop thread, which lets sync callers (``fetch``) and
+    coroutines on any loop (``afetch``) share the same warm browsers.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_pages_per_context: int = 50,
+        headless: bool = False,
+        channel: str = "chrome",
+        user_data_dir: str = "/tmp/patchright-profile",
+        wait_for_timeout: int = 750,
+    ):
+        self.size = size
+        self.max_pages_per_context = max_pages_per_context
+        self.headless = headless
+        self.channel = channel
+        self.wait_for_timeout = wait_for_timeout
+        self._slots: List[_Slot] = [_Slot(f"{user_data_dir}-{i}") for i in range(size)]
+        self._idle: Optional[asyncio.Queue] = None
+        self._started: Optional[asyncio.Future] = None
+        self._playwright = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="browser-pool", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def fetch(self, url: str) -> str:
+        """Fetch rendered HTML from a sync caller."""
+        return self._submit(self._fetch(url)).result()
+
+    async def afetch(self, url: str) -> str:
+        """Fetch rendered HTML from a coroutine running on any loop."""
+        return await asyncio.wrap_future(self._submit(self._fetch(url)))
+
+    async def _launch(self):
+        from patchright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        self._idle = asyncio.Queue()
+        for slot in self._slots:
+            self._idle.put_nowait(slot)
+
+    async def _start(self):
+        # every coroutine here runs on the pool loop, so this check is race-free
+        if self._started is None:
+            self._started = asyncio.ensure_future(self._launch())
+        try:
+            await self._started
+        except Exception:
+            self._started = None
+            raise
+
+    async def _get_context(self, slot: _Slot):
+        if slot.context is not None and slot.pages_served >= self.max_pages_per_context:
+            await slot.close()
+        if slot.context is None:
+            slot.context = await self._playwright.chromium.launch_persistent_context(
+                user_data_dir=slot.user_data_dir,
+                channel=self.channel,
+                headless=self.headless,
+                no_viewport=True,
+                args=LAUNCH_ARGS,
+            )
+        return slot.context
+
+    async def _fetch(self, url: str) -> str:
+        from patchright.async_api import TimeoutError as PlaywrightTimeoutError
+
+        await self._start()
+        slot = await self._idle.get()
+        try:
+            for attempt in range(2):
+                try:
+                    page = await (await self._get_context(slot)).new_page()
+                except Exception as e:
+                    # the context died between pages: relaunch once
+                    print(f"Browser context crashed: {e}")
+                    await slot.close()
+                    if attempt:
+                        return ""
+                    continue
+
+                slot.pages_served += 1
+                print(f"Navigating to {url} ...")
+                try:
+                    await page.goto(url)
+                    await page.wait_for_timeout(self.wait_for_timeout)
+                    html = await page.content()
+                    print(f"HTML fetched ({len(html)} chars)")
+                except PlaywrightTimeoutError as e:
+                    print(f"Failed to fetch: {e}")
+                    html = ""
+                except Exception as e:
+                    print(f"Failed to fetch: {e}")
+                    html = ""
+                    if page.is_closed():
+                        await slot.close()
+                finally:
+                    if not page.is_closed():
+                        try:
+                            await page.close()
+                        except Exception:
+                            await slot.close()
+                return html
+            return ""
+        finally:
+            self._idle.put_nowait(slot)
+
+    async def _shutdown(self):
+        for slot in self._slots:
+            await slot.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self._idle = None
+        self._started = None
+
+    def close(self) -> None:
+        """Close every context and stop the pool thread."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool(config: dict = None) -> BrowserPool:
+    """Return the process-wide pool, creating it from config on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if config is None:
+                config = get_settings()
+            browser = config["browser"]
+            _pool = BrowserPool(
+                size=browser.get("pool_size", 1),
+                max_pages_per_context=browser.get("max_pages_per_context", 50),
+                headless=browser.get("headless", False),
+                channel=browser["name"],
+                user_data_dir=browser.get("user_data_dir", "/tmp/patchright-profile"),
+                wait_for_timeout=browser["wait_for_timeout"],
+            )
+            atexit.register(_pool.close)
+        return _pool
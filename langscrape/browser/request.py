@@ -1,5 +1,6 @@
-import requests
 from urllib.parse import urlparse
+from ..cache import acached_fetch, acached_fetch_response, cached_fetch, cached_fetch_file, cached_fetch_response
+from .http import USER_AGENT, ahttp_get, http_get
 
 def _get_referer(url: str) -> str:
     parsed = urlparse(url)
@@ -7,18 +8,59 @@ def _get_referer(url: str) -> str:
 
 def _get_headers(url: str) -> dict:
     return {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/140.0.0.0 Safari/537.36"
-        ),
+        "User-Agent": USER_AGENT,
         "Referer": _get_referer(url),
     }
 
-def simple_url_to_html(url: str) -> str:
+def _response_meta(response) -> dict:
+    return {
+        "status": response.status_code,
+        "content_type": response.headers.get("Content-Type"),
+        "content_disposition": response.headers.get("Content-Disposition"),
+        "final_url": str(response.url),
+        "cacheable": 200 <= response.status_code < 400,
+    }
+
+def _download(url: str):
+    r = http_get(url, headers=_get_headers(url))
+    return r.content, _response_meta(r)
+
+async def _adownload(url: str):
+    r = await ahttp_get(url, headers=_get_headers(url))
+    return r.content, _response_meta(r)
+
+def _download_to_file(url: str, dest: str) -> dict:
+    with http_get(url, headers=_get_headers(url), stream=True) as r:
+        with open(dest, "wb") as f:
+            for chunk in r.iter_content(chunk_size=1 << 16):
+                f.write(chunk)
+        return _response_meta(r)
+
+def simple_url_to_file(url: str, dest: str) -> dict:
+    """
+    Stream a URL's body into the file ``dest`` without holding it in memory.
+    Returns the response metadata; uses the fetch cache when it is enabled.
     """
-    Download PDF from URL (in-memory), extract, normalize, and return text.
+    return cached_fetch_file(url, dest, "http", _download_to_file)
+
+def simple_url_to_html(url: str) -> bytes:
+    """
+    Download the raw response body for a URL (HTML page or PDF bytes).
+    Uses the pooled HTTP session and the fetch cache when it is enabled.
     """
-    headers = _get_headers(url)
-    r = requests.get(url, headers=headers)
-    return r.content
\ No newline at end of file
+    return cached_fetch(url, "http", _download)
+
+async def asimple_url_to_html(url: str) -> bytes:
+    """Async `simple_url_to_html` on the event loop's pooled client."""
+    return await acached_fetch(url, "http", _adownload)
+
+def fetch_response(url: str):
+    """
+    `simple_url_to_html` returning ``(body, metadata)``, so callers can check
+    the HTTP ``status`` and ``content_type``.
+    """
+    return cached_fetch_response(url, "http", _download)
+
+async def afetch_response(url: str):
+    """Async `fetch_response`."""
+    return await acached_fetch_response(url, "http", _adownload)
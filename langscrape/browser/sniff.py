@@ -0,0 +1,196 @@
+import threading
+from typing import Dict, Optional
+
+from .http import ahttp_request, ahttp_stream, http_get, http_head
+from .request import _get_headers
+from ..cache import get_fetch_cache
+from ..cache.json_store import JsonStore
+from ..settings import get_settings
+
+PDF = "pdf"
+HTML = "html"
+PDF_MAGIC = b"%PDF-"
+# the PDF header may be preceded by junk; readers look within the first 1 KB
+SNIFF_RANGE = 1024
+_AMBIGUOUS_TYPES = ("", "application/octet-stream", "binary/octet-stream", "application/force-download",
+                    "application/download", "application/x-download")
+
+
+def _suffix_kind(url: str) -> str:
+    return PDF if str(url).lower().split("?", 1)[0].endswith(".pdf") else HTML
+
+
+def _header_kind(content_type: str, disposition: str) -> Optional[str]:
+    """Kind from response headers, or None when they do not say."""
+    content_type = (content_type or "").split(";", 1)[0].strip().lower()
+    if content_type in ("application/pdf", "application/x-pdf"):
+        return PDF
+    if ".pdf" in (disposition or "").lower():
+        return PDF
+    if content_type in _AMBIGUOUS_TYPES:
+        return None
+    return HTML
+
+
+def _bytes_kind(head: bytes) -> str:
+    return PDF if PDF_MAGIC in head[:SNIFF_RANGE] else HTML
+
+
+def _body_kind(body, meta: dict) -> Optional[str]:
+    """Kind of a fetched body, or None when neither it nor its headers say."""
+    if isinstance(body, bytes) and _bytes_kind(body) == PDF:
+        return PDF
+    if not meta.get("content_type"):
+        return None
+    # the body was read, so an inconclusive header means HTML
+    return _header_kind(meta["content_type"], meta.get("content_disposition")) or HTML
+
+
+class ContentTypeCache(JsonStore):
+    """Per-URL "pdf"/"html" verdicts, optionally persisted to a JSON file."""
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__(path)
+        self.kinds: Dict[str, str] = self._load() or {}
+
+    def _payload(self) -> Dict[str, str]:
+        return self.kinds
+
+    def get(self, url: str) -> Optional[str]:
+        return self.kinds.get(url)
+
+    def set(self, url: str, kind: str) -> None:
+        with self._lock:
+            if self.kinds.get(url) != kind:
+                self.kinds[url] = kind
+                self._changed()
+
+
+_content_types: Optional[ContentTypeCache] = None
+_content_types_lock = threading.Lock()
+
+
+def get_content_type_cache(config: dict = None) -> ContentTypeCache:
+    global _content_types
+    with _content_types_lock:
+        if _content_types is None:
+            settings = (config or get_settings()).get("fetch", {}) or {}
+            _content_types = ContentTypeCache(settings.get("content_types_path"))
+        return _content_types
+
+
+def _skip_network(url: str, config: dict) -> bool:
+    if not (config.get("fetch", {}) or {}).get("sniff", True):
+        return True
+    cache = get_fetch_cache(config)
+    return cache is not None and cache.offline
+
+
+def _sniff(url: str) -> str:
+    response = http_head(url, headers=_get_headers(url))
+    if response.ok:
+        kind = _header_kind(response.headers.get("Content-Type"), response.headers.get("Content-Disposition"))
+        if kind is not None:
+            return kind
+    # HEAD refused or inconclusive: read the first bytes (servers ignoring Range are cut off too)
+    headers = {**_get_headers(url), "Range": f"bytes=0-{SNIFF_RANGE - 1}"}
+    with http_get(url, headers=headers, stream=True) as response:
+        kind = _header_kind(response.headers.get("Content-Type"), response.headers.get("Content-Disposition"))
+        if kind == PDF:
+            return kind
+        head = b""
+        for chunk in response.iter_content(chunk_size=SNIFF_RANGE):
+            head += chunk
+            if len(head) >= SNIFF_RANGE:
+                break
+    return _bytes_kind(head)
+
+
+async def _asniff(url: str) -> str:
+    response = await ahttp_request("HEAD", url, headers=_get_headers(url))
+    if response.is_success:
+        kind = _header_kind(response.headers.get("Content-Type"), response.headers.get("Content-Disposition"))
+        if kind is not None:
+            return kind
+    headers = {**_get_headers(url), "Range": f"bytes=0-{SNIFF_RANGE - 1}"}
+    async with ahttp_stream("GET", url, headers=headers) as response:
+        kind = _header_kind(response.headers.get("Content-Type"), response.headers.get("Content-Disposition"))
+        if kind == PDF:
+            return kind
+        head = b""
+        async for chunk in response.aiter_bytes():
+            head += chunk
+            if len(head) >= SNIFF_RANGE:
+                break
+    return _bytes_kind(head)
+
+
+def known_content_kind(url: str, config: dict = None) -> Optional[str]:
+    """
+    ``"pdf"`` for a ``.pdf`` suffix, else the cached verdict for ``url``, or
+    None. Never touches the network.
+    """
+    if _suffix_kind(url) == PDF:
+        return PDF
+    return get_content_type_cache(config).get(url)
+
+
+def response_content_kind(url: str, body, meta: dict, config: dict = None) -> Optional[str]:
+    """
+    Kind of a fetch stage's response to ``url``: the ``%PDF-`` magic bytes
+    in ``body``, then the ``Content-Type``/``Content-Disposition`` in
+    ``meta``. Returns None when neither says (e.g. a browser-rendered page);
+    a verdict is cached for ``url``.
+    """
+    kind = _body_kind(body, meta or {})
+    if kind is not None:
+        get_content_type_cache(config).set(url, kind)
+    return kind
+
+
+def sniff_content_kind(url: str, config: dict = None) -> str:
+    """
+    Return ``"pdf"`` or ``"html"`` for ``url`` without fetching its body.
+
+    The fallback for when no fetch stage's response told the kind (see
+    `response_content_kind`). A ``.pdf`` suffix is trusted as is. Otherwise a
+    HEAD request decides from ``Content-Type``/``Content-Disposition``; when
+    that is refused or inconclusive (e.g. ``application/octet-stream``), a
+    ranged GET of the first kilobyte is checked for the ``%PDF-`` magic
+    bytes. Verdicts are cached per URL; network errors fall back to the
+    suffix and are not cached.
+    """
+    if config is None:
+        config = get_settings()
+    kind = known_content_kind(url, config)
+    if kind is not None:
+        return kind
+    cache = get_content_type_cache(config)
+    if _skip_network(url, config):
+        return HTML
+    try:
+        kind = _sniff(url)
+    except Exception as e:
+        print(f"Content-type sniffing failed for {url}: {e}")
+        return HTML
+    cache.set(url, kind)
+    return kind
+
+
+async def asniff_content_kind(url: str, config: dict = None) -> str:
+    """Async `sniff_content_kind` through the loop's pooled client."""
+    if config is None:
+        config = get_settings()
+    kind = known_content_kind(url, config)
+    if kind is not None:
+        return kind
+    cache = get_content_type_cache(config)
+    if _skip_network(url, config):
+        return HTML
+    try:
+        kind = await _asniff(url)
+    except Exception as e:
+        print(f"Content-type sniffing failed for {url}: {e}")
+        return HTML
+    cache.set(url, kind)
+    return kind
@@ -0,0 +1,29 @@
+from .fetch_cache import (
+    FetchCache,
+    acached_fetch,
+    acached_fetch_response,
+    cached_fetch,
+    cached_fetch_file,
+    cached_fetch_response,
+    get_fetch_cache,
+    set_fetch_cache,
+)
+from .json_store import JsonStore, flush_stores, write_atomic
+from .xpath_templates import XPathTemplateStore, domain_key, get_template_store
+
+__all__ = [
+    "FetchCache",
+    "acached_fetch",
+    "acached_fetch_response",
+    "cached_fetch",
+    "cached_fetch_response",
+    "cached_fetch_file",
+    "get_fetch_cache",
+    "set_fetch_cache",
+    "JsonStore",
+    "flush_stores",
+    "write_atomic",
+    "XPathTemplateStore",
+    "domain_key",
+    "get_template_store",
+]
@@ -0,0 +1,279 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from .json_store import write_atomic
+from ..exceptions import FetchCacheMiss
+from ..settings import get_settings
+
+Body = Union[str, bytes]
+CHUNK_SIZE = 1 << 16
+
+
+class FetchCache:
+    """
+    On-disk cache of fetched pages and documents.
+
+    Entries are keyed by ``(kind, url)``; ``kind`` separates e.g. browser
+    rendered HTML from the raw bytes of a plain HTTP fetch. Bodies are
+    gzip-compressed and content-addressed (``blobs/<sha256>.gz``), so the
+    same bytes served under several URLs are stored once. Each entry keeps
+    the response metadata next to the body's hash.
+
+    ``ttl`` (seconds, None = never) only applies online: in ``offline`` mode
+    every stored entry is replayed and a miss raises `FetchCacheMiss`
+    instead of touching the network.
+    """
+
+    def __init__(self, root: str, ttl: Optional[float] = None, offline: bool = False):
+        self.root = root
+        self.ttl = ttl
+        self.offline = offline
+        self.stats = {"hits": 0, "misses": 0, "stores": 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, kind: str) -> str:
+        return hashlib.sha256(f"{kind}:{url}".encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.root, "entries", key[:2], f"{key}.json")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2], f"{digest}.gz")
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def get(self, url: str, kind: str = "http") -> Optional[Tuple[Body, Dict[str, Any]]]:
+        """Return ``(body, metadata)`` for a fresh entry, or None."""
+        try:
+            with open(self._entry_path(self.key(url, kind)), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if not self.offline and self.ttl is not None and time.time() - entry["fetched_at"] > self.ttl:
+                return None
+            with gzip.open(self._blob_path(entry["sha256"]), "rb") as f:
+                body = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+        if entry.get("text"):
+            body = body.decode("utf-8")
+        return body, entry.get("meta", {})
+
+    def put(self, url: str, body: Body, kind: str = "http", **meta) -> None:
+        """Store a fetched body with its response metadata."""
+        is_text = isinstance(body, str)
+        data = body.encode("utf-8") if is_text else bytes(body)
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            write_atomic(blob_path, gzip.compress(data, compresslevel=6))
+        entry = {
+            "url": url,
+            "kind": kind,
+            "fetched_at": time.time(),
+            "sha256": digest,
+            "size": len(data),
+            "text": is_text,
+            "meta": meta,
+        }
+        write_atomic(
+            self._entry_path(self.key(url, kind)),
+            json.dumps(entry, ensure_ascii=False).encode("utf-8"),
+        )
+        self._count("stores")
+
+    def get_file(self, url: str, dest: str, kind: str = "http") -> Optional[Dict[str, Any]]:
+        """Stream a fresh entry's body into ``dest``; returns its metadata, or None."""
+        try:
+            with open(self._entry_path(self.key(url, kind)), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if not self.offline and self.ttl is not None and time.time() - entry["fetched_at"] > self.ttl:
+                return None
+            with gzip.open(self._blob_path(entry["sha256"]), "rb") as src, open(dest, "wb") as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        except (OSError, ValueError, KeyError):
+            return None
+        return entry.get("meta", {})
+
+    def put_file(self, url: str, path: str, kind: str = "http", **meta) -> None:
+        """`put` for a body already spooled to ``path``, without reading it into memory."""
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                size += len(chunk)
+        digest = digest.hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f"{blob_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(path, "rb") as src, gzip.open(tmp_path, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            os.replace(tmp_path, blob_path)
+        entry = {
+            "url": url,
+            "kind": kind,
+            "fetched_at": time.time(),
+            "sha256": digest,
+            "size": size,
+            "text": False,
+            "meta": meta,
+        }
+        write_atomic(
+            self._entry_path(self.key(url, kind)),
+            json.dumps(entry, ensure_ascii=False).encode("utf-8"),
+        )
+        self._count("stores")
+
+    def fetch_file(self, url: str, dest: str, kind: str, downloader: Callable[[str, str], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        File-backed `fetch`: fill ``dest`` from the cache, or call
+        ``downloader(url, dest)`` (which returns the response metadata) and
+        store the file.
+        """
+        meta = self.get_file(url, dest, kind)
+        if meta is not None:
+            self._count("hits")
+            return meta
+        self._count("misses")
+        if self.offline:
+            raise FetchCacheMiss(url, kind)
+        meta = dict(downloader(url, dest) or {})
+        if meta.pop("cacheable", True) and os.path.getsize(dest):
+            self.put_file(url, dest, kind, **meta)
+        return meta
+
+    def fetch_response(self, url: str, kind: str, fetcher: Callable[[str], Any]) -> Tuple[Body, Dict[str, Any]]:
+        """
+        Return ``(body, metadata)`` for ``url`` from the cache, or call
+        ``fetcher(url)`` and store its result. ``fetcher`` returns either the
+        body or ``(body, metadata)``; empty bodies and responses marked not
+        ``cacheable`` are returned but not stored.
+        """
+        cached = self.get(url, kind)
+        if cached is not None:
+            self._count("hits")
+            return cached
+        self._count("misses")
+        if self.offline:
+            raise FetchCacheMiss(url, kind)
+        body, meta = _split(fetcher(url))
+        cacheable = meta.pop("cacheable", True)
+        if body and cacheable:
+            self.put(url, body, kind, **meta)
+        return body, meta
+
+    def fetch(self, url: str, kind: str, fetcher: Callable[[str], Any]) -> Body:
+        """`fetch_response` without the metadata."""
+        return self.fetch_response(url, kind, fetcher)[0]
+
+    async def afetch_response(self, url: str, kind: str, fetcher) -> Tuple[Body, Dict[str, Any]]:
+        """Async `fetch_response`; ``fetcher`` is a coroutine function, disk I/O runs in a thread."""
+        cached = await asyncio.to_thread(self.get, url, kind)
+        if cached is not None:
+            self._count("hits")
+            return cached
+        self._count("misses")
+        if self.offline:
+            raise FetchCacheMiss(url, kind)
+        body, meta = _split(await fetcher(url))
+        cacheable = meta.pop("cacheable", True)
+        if body and cacheable:
+            await asyncio.to_thread(self.put, url, body, kind, **meta)
+        return body, meta
+
+    async def afetch(self, url: str, kind: str, fetcher) -> Body:
+        """Async `fetch`."""
+        return (await self.afetch_response(url, kind, fetcher))[0]
+
+def _split(result) -> Tuple[Body, Dict[str, Any]]:
+    if isinstance(result, tuple):
+        body, meta = result
+        return body, dict(meta or {})
+    return result, {}
+
+
+_cache: Optional[FetchCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_fetch_cache(config: dict = None) -> Optional[FetchCache]:
+    """
+    Return the process-wide fetch cache, or None when it is disabled.
+    ``LANGSCRAPE_OFFLINE=1`` forces offline replay.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            if config is None:
+                config = get_settings()
+            settings = config.get("fetch_cache", {}) or {}
+            offline = settings.get("offline", False) or os.environ.get("LANGSCRAPE_OFFLINE") == "1"
+            if not (settings.get("enabled", False) or offline):
+                return None
+            ttl_hours = settings.get("ttl_hours")
+            _cache = FetchCache(
+                settings.get("path", "data/fetch_cache"),
+                ttl=ttl_hours * 3600 if ttl_hours is not None else None,
+                offline=offline,
+            )
+        return _cache
+
+
+def set_fetch_cache(cache: Optional[FetchCache]) -> None:
+    """Install ``cache`` as the process-wide fetch cache (e.g. a replay corpus)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+
+def cached_fetch_response(url: str, kind: str, fetcher: Callable[[str], Any]) -> Tuple[Body, Dict[str, Any]]:
+    """
+    Fetch ``(body, metadata)`` through the process-wide cache when it is
+    enabled; the metadata holds e.g. the HTTP ``status`` and ``content_type``.
+    """
+    cache = get_fetch_cache()
+    if cache is None:
+        body, meta = _split(fetcher(url))
+        meta.pop("cacheable", None)
+        return body, meta
+    return cache.fetch_response(url, kind, fetcher)
+
+
+def cached_fetch(url: str, kind: str, fetcher: Callable[[str], Any]) -> Body:
+    """Fetch through the process-wide cache when it is enabled."""
+    return cached_fetch_response(url, kind, fetcher)[0]
+
+
+def cached_fetch_file(url: str, dest: str, kind: str, downloader: Callable[[str, str], Dict[str, Any]]) -> Dict[str, Any]:
+    """File-backed `cached_fetch`: the body ends up in ``dest`` either way."""
+    cache = get_fetch_cache()
+    if cache is None:
+        meta = dict(downloader(url, dest) or {})
+        meta.pop("cacheable", None)
+        return meta
+    return cache.fetch_file(url, dest, kind, downloader)
+
+
+async def acached_fetch_response(url: str, kind: str, fetcher) -> Tuple[Body, Dict[str, Any]]:
+    """Async `cached_fetch_response`."""
+    cache = get_fetch_cache()
+    if cache is None:
+        body, meta = _split(await fetcher(url))
+        meta.pop("cacheable", None)
+        return body, meta
+    return await cache.afetch_response(url, kind, fetcher)
+
+
+async def acached_fetch(url: str, kind: str, fetcher) -> Body:
+    """Async `cached_fetch`."""
+    return (await acached_fetch_response(url, kind, fetcher))[0]
@@ -0,0 +1,88 @@
+import atexit
+import json
+import os
+import threading
+import time
+import weakref
+from typing import Any, Optional
+
+# seconds between writes of a store that keeps changing
+FLUSH_INTERVAL = 30.0
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write ``data`` to a temporary file next to ``path`` and rename it into place."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class JsonStore:
+    """
+    Base for the small state files kept across runs (XPath templates,
+    fetch history, content types).
+
+    Changes only mark the store dirty; it is written atomically at most
+    every ``flush_interval`` seconds while it changes, by `flush`, and at
+    interpreter exit. ``path=None`` keeps everything in memory.
+    """
+
+    flush_interval = FLUSH_INTERVAL
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flushed_at = time.monotonic()
+        _stores.add(self)
+
+    def _load(self) -> Any:
+        """The stored JSON, or None when the file is missing or unreadable."""
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Ignoring unreadable {type(self).__name__} file {self.path}: {e}")
+            return None
+
+    def _payload(self) -> Any:
+        raise NotImplementedError
+
+    def _changed(self) -> None:
+        # called with the lock held
+        self._dirty = True
+        if time.monotonic() - self._flushed_at >= self.flush_interval:
+            self._write()
+
+    def _write(self) -> None:
+        if self.path:
+            write_atomic(self.path, json.dumps(self._payload(), ensure_ascii=False, indent=2).encode("utf-8"))
+        self._dirty = False
+        self._flushed_at = time.monotonic()
+
+    def flush(self) -> None:
+        """Write pending changes now."""
+        with self._lock:
+            if self._dirty:
+                self._write()
+
+
+_stores: "weakref.WeakSet[JsonStore]" = weakref.WeakSet()
+
+
+def flush_stores() -> None:
+    """Write the pending changes of every open store."""
+    for store in list(_stores):
+        try:
+            store.flush()
+        except OSError as e:
+            print(f"Could not write {store.path}: {e}")
+
+
+atexit.register(flush_stores)
@@ -0,0 +1,103 @@
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from .json_store import JsonStore
+
+STATS_KEYS = ("hits", "misses", "invalidations", "stores")
+
+
+def domain_key(url: str) -> str:
+    """Template key for a URL: its host, lowercased and without ``www.``."""
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class XPathTemplateStore(JsonStore):
+    """
+    Persistent per-domain XPath maps learned by successful runs.
+
+    Stored as one JSON file ``{"templates": {domain: {...}}, "stats": {...}}``
+    and written in batches (see `JsonStore`). Statistics are cumulative
+    across runs:
+
+    - ``hits``: cached XPaths validated and used without the LLM loop
+    - ``misses``: no template for the domain
+    - ``invalidations``: a template stopped matching and was dropped
+    - ``stores``: templates written after a successful run
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        data = self._load() or {}
+        self.templates: Dict[str, Dict[str, Any]] = data.get("templates", {}) or {}
+        self.stats: Dict[str, int] = {key: 0 for key in STATS_KEYS}
+        self.stats.update(data.get("stats", {}) or {})
+
+    def _payload(self) -> Dict[str, Any]:
+        return {"templates": self.templates, "stats": self.stats}
+
+    def lookup(self, url: str) -> Optional[Dict[str, str]]:
+        """Return the cached ``field -> xpath`` map for the URL's domain, counting misses."""
+        key = domain_key(url)
+        with self._lock:
+            template = self.templates.get(key)
+            if template is None:
+                # counted, but left for the next write
+                self.stats["misses"] += 1
+                self._dirty = True
+                return None
+            return dict(template["xpaths"])
+
+    def record_hit(self, url: str) -> None:
+        with self._lock:
+            self.stats["hits"] += 1
+            template = self.templates.get(domain_key(url))
+            if template is not None:
+                template["hits"] = template.get("hits", 0) + 1
+                template["last_hit"] = datetime.now().isoformat()
+            self._changed()
+
+    def invalidate(self, url: str, failed_fields=()) -> None:
+        """Drop the domain's template after its XPaths stopped matching."""
+        key = domain_key(url)
+        with self._lock:
+            self.stats["invalidations"] += 1
+            if self.templates.pop(key, None) is not None:
+                print(f"XPath template for {key} invalidated: {', '.join(failed_fields) or 'no match'}")
+            self._changed()
+
+    def store(self, url: str, xpaths: Dict[str, str]) -> None:
+        """Save the XPath map that produced a successful extraction."""
+        key = domain_key(url)
+        if not key or not xpaths:
+            return
+        with self._lock:
+            previous = self.templates.get(key) or {}
+            if previous.get("xpaths") == xpaths:
+                return  # a hit re-validating the same template
+            self.stats["stores"] += 1
+            self.templates[key] = {
+                "xpaths": dict(xpaths),
+                "source_url": url,
+                "stored_at": datetime.now().isoformat(),
+                "hits": 0,
+            }
+            self._changed()
+
+
+_stores: Dict[str, XPathTemplateStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_template_store(config: dict) -> Optional[XPathTemplateStore]:
+    """Return the process-wide store for ``config``, or None when templates are disabled."""
+    settings = config.get("templates", {}) or {}
+    if not settings.get("enabled", False):
+        return None
+    path = settings.get("path", "data/xpath_templates.json")
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = XPathTemplateStore(path)
+        return _stores[path]
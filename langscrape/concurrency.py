@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+_POLL_INTERVAL = 0.05
+
+
+class Limiter:
+    """
+    Bounded slot counter shared by worker threads and event loops.
+
+    Used as ``with limiter:`` from sync code and ``async with limiter:`` from
+    coroutines. A ``limit`` of ``None`` (or 0) means unlimited.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit or None
+        self._semaphore = threading.BoundedSemaphore(self.limit) if self.limit else None
+
+    def __enter__(self):
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._semaphore is not None:
+            self._semaphore.release()
+        return False
+
+    async def __aenter__(self):
+        if self._semaphore is not None:
+            # poll instead of blocking a thread so cancellation never leaks a slot
+            while not self._semaphore.acquire(blocking=False):
+                await asyncio.sleep(_POLL_INTERVAL)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+_fetch_limiter = Limiter()
+_llm_limiter = Limiter()
+
+
+def configure_limits(fetch: Optional[int] = None, llm: Optional[int] = None) -> None:
+    """Set process-wide limits on concurrent browser/HTTP fetches and LLM calls."""
+    global _fetch_limiter, _llm_limiter
+    _fetch_limiter = Limiter(fetch)
+    _llm_limiter = Limiter(llm)
+
+
+def fetch_slot() -> Limiter:
+    return _fetch_limiter
+
+
+def llm_slot() -> Limiter:
+    return _llm_limiter
+
+
+# background jobs that outlive the node that started them, keyed by (run token, job name)
+_pending: Dict[Tuple[str, str], Any] = {}
+_pending_lock = threading.Lock()
+
+
+def new_run_token() -> str:
+    """A private key for one graph run's parked futures (``state["run_token"]``)."""
+    return uuid.uuid4().hex
+
+
+def park_future(token: str, name: str, future: Any) -> None:
+    """
+    Keep a background job's future (``concurrent.futures`` or asyncio) for
+    a later node of the same run, so the graph state stays plain data.
+    """
+    with _pending_lock:
+        _pending[(token, name)] = future
+
+
+def claim_future(token: Optional[str], name: str) -> Optional[Any]:
+    """Remove and return the future parked by `park_future`, or None."""
+    with _pending_lock:
+        return _pending.pop((token, name), None)
+
+
+def drop_futures(token: Optional[str]) -> None:
+    """Cancel and forget what a finished or failed run left parked."""
+    with _pending_lock:
+        keys = [key for key in _pending if key[0] == token]
+        futures = [_pending.pop(key) for key in keys]
+    for future in futures:
+        if isinstance(future, asyncio.Future):
+            # may be called from a worker thread; asyncio futures are cancelled on their loop
+            loop = future.get_loop()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(future.cancel)
+        else:
+            future.cancel()
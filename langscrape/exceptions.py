@@ -9,4 +9,19 @@ class InvalidUrl(Exception):
     def __init__(self, url: str, message="Invalid or unsupported URL"):
         self.url = url
         self.message = message
-        super().__init__(f"{message}: {url}")
\ No newline at end of file
+        super().__init__(f"{message}: {url}")
+
+class FetchCacheMiss(Exception):
+    """Raised in offline mode when a URL is not in the fetch cache."""
+    def __init__(self, url: str, kind: str = "http", message="Not in fetch cache (offline mode)"):
+        self.url = url
+        self.kind = kind
+        self.message = message
+        super().__init__(f"{message}: [{kind}] {url}")
+
+class ConfigError(Exception):
+    """Raised when a config file is missing required keys or has values of the wrong type."""
+    def __init__(self, path: str = None, problem: str = "invalid config"):
+        self.path = path
+        self.problem = problem
+        super().__init__(f"{path or 'config'}: {problem}")
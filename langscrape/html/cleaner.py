@@ -0,0 +1,707 @@
+import re
+from typing import Dict, Iterable, List, Optional, Union
+
+from lxml import etree
+
+from feilian.html_constants import INTERACTIVE_ELEMENTS
+
+CHUNK_SIZE = 1 << 16
+
+# attributes feilian's soup cleaner keeps, in the (sorted) order html5lib emits them
+_KEPT_ATTRIBUTES = ("alt", "class", "href", "id", "src", "title")
+
+# html5lib tree-construction rules we need to mirror on top of libxml2's events
+_IN_HEAD = {"base", "basefont", "bgsound", "link", "meta", "noframes", "noscript", "script", "style", "template", "title"}
+_IN_HEAD_NOSCRIPT = {"basefont", "bgsound", "link", "meta", "noframes", "style"}
+_AFTER_HEAD = _IN_HEAD - {"noscript"}
+_TABLE_SECTIONS = {"caption", "colgroup", "tbody", "tfoot", "thead"}
+_TABLE_CONTEXT = {"table", "tbody", "tfoot", "thead", "tr"}
+_TABLE_CONTENT = _TABLE_SECTIONS | {"col", "form", "input", "script", "style", "table", "td", "th", "tr"}
+_HEADINGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+# subtrees dropped entirely (html5lib keeps <template> content out of the tree)
+_DROPPED = set(INTERACTIVE_ELEMENTS) | {"template"}
+# HTML5 void elements; libxml2 only knows the HTML4 ones and nests content in e.g. <wbr>
+_VOID = {"area", "base", "basefont", "bgsound", "br", "col", "embed", "frame", "hr", "img",
+         "input", "keygen", "link", "meta", "param", "source", "track", "wbr"}
+
+_NON_WHITESPACE_RE = re.compile(r"\S+")
+_WHITESPACE_RE = re.compile(r"\s+")
+_ESCAPE_RE = re.compile(r"[&<>]")
+_ESCAPES = {"&": "&amp;", "<": "&lt;", ">": "&gt;"}
+
+
+def _escape(text: str) -> str:
+    if "&" in text or "<" in text or ">" in text:
+        return _ESCAPE_RE.sub(lambda m: _ESCAPES[m.group(0)], text)
+    return text
+
+
+def _quote(value: str) -> str:
+    value = _escape(value)
+    if '"' in value:
+        if "'" in value:
+            return '"' + value.replace('"', "&quot;") + '"'
+        return "'" + value + "'"
+    return '"' + value + '"'
+
+
+def _filter_attributes(tag: str, attrib) -> Dict[str, str]:
+    attrs = {}
+    for key in _KEPT_ATTRIBUTES:
+        if key not in attrib:
+            continue
+        value = attrib[key]
+        if key == "class":
+            value = " ".join(_NON_WHITESPACE_RE.findall(value))
+        elif key == "href" and value.startswith("javascript:"):
+            continue
+        elif key == "src" and tag == "img":
+            continue
+        attrs[key] = value
+    return attrs
+
+
+class _Frame:
+    __slots__ = ("tag", "attrs", "parts", "has_text", "implicit", "fostered")
+
+    def __init__(self, tag: str, attrs: Dict[str, str], implicit: bool = False, fostered: bool = False):
+        self.tag = tag
+        self.attrs = attrs
+        self.parts: List[Union[str, "_Frame"]] = []
+        self.has_text = False
+        self.implicit = implicit
+        self.fostered = fostered
+
+    def render(self) -> str:
+        inner = []
+        for part in self.parts:
+            if isinstance(part, _Frame):
+                # the head is rendered late because html5lib may re-open it
+                self.has_text = self.has_text or part.has_text
+                part = part.render() if part.has_text else ""
+            inner.append(part)
+        attrs = "".join(f" {key}={_quote(value)}" for key, value in self.attrs.items())
+        if self.tag == "img" and not inner:
+            return f"<img{attrs}/>"
+        return f"<{self.tag}{attrs}>{''.join(inner)}</{self.tag}>"
+
+
+class _CleaningTarget:
+    """
+    lxml parser target that cleans while parsing.
+
+    Elements are buffered on a stack and emitted to their parent only when
+    they close and turn out to contain text, which replaces feilian's
+    post-order ``get_text()`` walk (quadratic on deep pages) with a single
+    pass. The head/body bookkeeping mirrors how html5lib builds the tree, so
+    the output matches the BeautifulSoup + html5lib cleaner wherever libxml2
+    nests the elements the same way (see `_tree_divergence`).
+    """
+
+    def __init__(self):
+        self.stack: List[_Frame] = []
+        self.html: Optional[_Frame] = None
+        self.head: Optional[_Frame] = None
+        self.body: Optional[_Frame] = None
+        self.head_closed = False
+        self.skip = 0
+        self.in_head_noscript = False
+        self.after_pre = False
+
+    # -- tree bookkeeping -------------------------------------------------
+
+    def _push(self, frame: _Frame) -> _Frame:
+        self.stack.append(frame)
+        return frame
+
+    def _pop(self) -> None:
+        frame = self.stack.pop()
+        if frame is self.head:
+            return
+        if frame.tag != "img" and not frame.has_text:
+            return
+        parent = self._foster_parent() if frame.fostered else self.stack[-1]
+        parent.parts.append(frame.render())
+        parent.has_text = parent.has_text or frame.has_text
+
+    def _foster_parent(self) -> _Frame:
+        # content misplaced inside a table goes right before the table; the
+        # table is only rendered into its parent when it closes, so appending
+        # to the parent now puts it in front
+        for idx in range(len(self.stack) - 1, 0, -1):
+            if self.stack[idx].tag == "table":
+                return self.stack[idx - 1]
+        return self.stack[-1]
+
+    def _ensure_html(self) -> _Frame:
+        if self.html is None:
+            self.html = self._push(_Frame("html", {}))
+        return self.html
+
+    def _open_head(self, attrs: Dict[str, str]) -> None:
+        self.head = _Frame("head", attrs)
+        self._ensure_html().parts.append(self.head)
+        self._push(self.head)
+
+    def _close_head(self) -> None:
+        while self.head in self.stack:
+            self._pop()
+        self.head_closed = True
+
+    def _open_body(self, attrs: Dict[str, str]) -> None:
+        self._ensure_html()
+        if self.head is None:
+            self.head = _Frame("head", {})
+            self.html.parts.append(self.head)
+        self._close_head()
+        self.body = self._push(_Frame("body", attrs))
+
+    def _in_head(self) -> bool:
+        return self.head is not None and self.head in self.stack
+
+    def _prepare_insert(self, tag: Optional[str]) -> None:
+        """Move to the insertion point html5lib would use for ``tag`` (None: text)."""
+        if self.body is not None:
+            return
+        if self._in_head():
+            if tag is None or tag not in _IN_HEAD:
+                self._open_body({})
+        elif self.head_closed:
+            if tag in _AFTER_HEAD:
+                self._push(self.head)
+            else:
+                self._open_body({})
+        elif tag in _IN_HEAD:
+            self._open_head({})
+        else:
+            self._open_body({})
+
+    # -- parser target interface -------------------------------------------
+
+    def start(self, tag, attrib):
+        self.after_pre = False
+        if self.skip:
+            if not (self.in_head_noscript and tag not in _IN_HEAD_NOSCRIPT):
+                self.skip += 1
+                return
+            # html5lib pops a <noscript> in <head> at the first unexpected tag
+            self.skip = 0
+            self.in_head_noscript = False
+
+        if tag == "html":
+            if self.html is None:
+                self.html = self._push(_Frame("html", _filter_attributes(tag, attrib)))
+            return
+        if tag == "head":
+            if self.head is None and self.body is None:
+                self._open_head(_filter_attributes(tag, attrib))
+            return
+        if tag == "body":
+            attrs = _filter_attributes(tag, attrib)
+            if self.body is None:
+                self._open_body(attrs)
+            else:
+                for key, value in attrs.items():
+                    self.body.attrs.setdefault(key, value)
+            return
+
+        self._ensure_html()
+        self._prepare_insert(tag)
+
+        top = self.stack[-1]
+        if top.implicit and tag in _TABLE_SECTIONS | {"tr"}:
+            while self.stack[-1].implicit and (tag != "tr" or self.stack[-1].tag == "tr"):
+                self._pop()
+        elif tag in ("tr", "td", "th") and top.tag in _TABLE_CONTEXT:
+            if top.tag == "table":
+                self._push(_Frame("tbody", {}, implicit=True))
+            if tag != "tr" and self.stack[-1].tag != "tr":
+                self._push(_Frame("tr", {}, implicit=True))
+        elif tag in _HEADINGS and top.tag in _HEADINGS:
+            self._pop()
+
+        if tag in _DROPPED:
+            self.skip = 0 if tag in _VOID else 1
+            self.in_head_noscript = tag == "noscript" and self._in_head()
+            return
+
+        fostered = top.tag in _TABLE_CONTEXT and tag not in _TABLE_CONTENT
+        self._push(_Frame(tag, _filter_attributes(tag, attrib), fostered=fostered))
+        if tag in _VOID:
+            self._pop()
+        # html5lib drops a newline right after <pre>/<listing>
+        self.after_pre = tag in ("pre", "listing")
+
+    def end(self, tag):
+        self.after_pre = False
+        if self.skip:
+            self.skip -= 1
+            if not self.skip:
+                self.in_head_noscript = False
+            return
+
+        if tag in ("html", "body") or tag in _VOID:
+            # html5lib keeps <body> open for content after </body> and </html>
+            return
+        if tag == "head":
+            if self._in_head():
+                self._close_head()
+            return
+
+        for idx in range(len(self.stack) - 1, -1, -1):
+            frame = self.stack[idx]
+            if frame is self.body or frame is self.html:
+                return
+            if frame.tag == tag and not frame.implicit:
+                while len(self.stack) > idx:
+                    self._pop()
+                return
+
+    def data(self, text):
+        if self.after_pre:
+            self.after_pre = False
+            if text.startswith("\n"):
+                text = text[1:]
+        if self.skip:
+            if not (self.in_head_noscript and text.strip()):
+                return
+            self.skip = 0
+            self.in_head_noscript = False
+
+        is_text = bool(text.strip())
+        if self.html is None:
+            if not is_text:
+                return
+            self._ensure_html()
+
+        top = self.stack[-1]
+        if self.body is None and (top is self.html or top is self.head):
+            if top is self.html and self.head is None and not is_text:
+                return  # "before head" whitespace is dropped
+            if is_text:
+                self._prepare_insert(None)
+
+        top = self.stack[-1]
+        if is_text and top.tag in _TABLE_CONTEXT:
+            top = self._foster_parent()
+        top.parts.append(_escape(text))
+        if is_text:
+            top.has_text = True
+
+    def close(self) -> str:
+        while len(self.stack) > 1:
+            self._pop()
+        if not self.stack:
+            return ""
+        html = self.stack.pop()
+        rendered = html.render()
+        return rendered if html.has_text else ""
+
+
+# -- tree-construction check ------------------------------------------------
+#
+# The target above replays libxml2's events, so it can only mirror html5lib
+# where libxml2 builds the same tree. `_tree_divergence` tokenizes the markup
+# and runs both tree builders' stack operations side by side; on anything it
+# does not model (adoption agency, foster parenting, ...) it gives up and the
+# page goes through the reference cleaner instead.
+
+_TAG_RE = re.compile(r"<(/?)([A-Za-z][^\t\n\f\r />]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>")
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+_DECLARATION_RE = re.compile(r"<[!?][^>]*>")
+_RAW_TEXT_RE = re.compile(r"(<(iframe|script|style|textarea|title)\b[^>]*>)(.*?)</\2\s*>", re.S | re.I)
+_RAW_TEXT_START_RE = re.compile(r"<(?:iframe|script|style|textarea|title)\b", re.I)
+_HTML5_DOCTYPE_RE = re.compile(r"\ufeff?\s*(?:<!--.*?-->\s*)*<!doctype\s+html\s*>", re.S | re.I)
+
+_FORMATTING = {"a", "b", "big", "code", "em", "font", "i", "nobr", "s", "small", "strike", "strong", "tt", "u"}
+# html5lib's "special" elements (it predates main, summary, hgroup, figcaption)
+_SPECIAL = {
+    "address", "applet", "area", "article", "aside", "base", "basefont", "bgsound", "blockquote", "body", "br",
+    "button", "caption", "center", "col", "colgroup", "command", "dd", "details", "dir", "div", "dl", "dt", "embed",
+    "fieldset", "figure", "footer", "form", "frame", "frameset", "h1", "h2", "h3", "h4", "h5", "h6", "head",
+    "header", "hr", "html", "iframe", "image", "img", "input", "isindex", "li", "link", "listing", "marquee",
+    "menu", "meta", "nav", "noembed", "noframes", "noscript", "object", "ol", "p", "param", "plaintext", "pre",
+    "script", "section", "select", "style", "table", "tbody", "td", "textarea", "tfoot", "th", "thead", "title",
+    "tr", "ul", "wbr", "xmp",
+}
+_SCOPE = {"applet", "caption", "html", "marquee", "object", "table", "td", "th"}
+_BUTTON_SCOPE = _SCOPE | {"button"}
+_LIST_SCOPE = _SCOPE | {"ol", "ul"}
+_TABLE_SCOPE = {"html", "table"}
+_CLOSES_P = {
+    "address", "article", "aside", "blockquote", "center", "details", "dir", "div", "dl", "fieldset", "figcaption",
+    "figure", "footer", "form", "header", "hgroup", "hr", "listing", "main", "menu", "nav", "ol", "p", "pre",
+    "section", "summary", "ul",
+} | _HEADINGS
+# end tags html5lib closes by scope; other end tags stop at any special element
+_BLOCK_END = {
+    "address", "article", "aside", "blockquote", "button", "center", "details", "dialog", "dir", "div", "dl", "dd",
+    "dt", "fieldset", "figcaption", "figure", "footer", "header", "hgroup", "listing", "main", "menu", "nav", "ol",
+    "pre", "section", "summary", "ul",
+}
+_CELLS = {"td", "th"}
+_ROWS = {"tbody", "tfoot", "thead", "tr"}
+# open elements libxml2 (2.14) closes when a start tag arrives, checked against
+# the current node until it no longer matches
+_LIBXML2_CLOSES = {
+    "address": {"p", "ul"},
+    "blockquote": {"p"},
+    "center": {"b", "font", "i", "p"},
+    "dd": {"address", "dir", "dt", "listing", "menu", "p", "pre"},
+    "dir": {"p"},
+    "div": {"p"},
+    "dl": {"address", "dir", "dt", "listing", "menu", "p", "pre"},
+    "dt": {"address", "dd", "dir", "listing", "menu", "p", "pre"},
+    "fieldset": {"a", "listing", "p", "pre", "legend"} | _HEADINGS,
+    "form": {"address", "dir", "dl", "form", "listing", "menu", "ol", "p", "pre", "ul"} | _HEADINGS,
+    "hr": {"p"},
+    "li": {"address", "dl", "li", "listing", "p", "pre"} | _HEADINGS,
+    "listing": {"p"},
+    "menu": {"p", "ul"},
+    "ol": {"p"},
+    "optgroup": {"option"},
+    "option": {"option"},
+    "p": {"b", "big", "i", "p", "s", "small", "strike", "tt", "u"} | _HEADINGS,
+    "pre": {"p", "ul"},
+    "table": {"a", "listing", "p", "pre"} | _HEADINGS,
+    "tbody": {"p", "thead", "tbody", "tfoot", "tr", "td", "th"},
+    "td": {"a", "b", "font", "i", "p", "span", "u", "td", "th"},
+    "tfoot": {"p", "thead", "tbody", "tr", "td", "th"},
+    "th": {"a", "b", "font", "i", "p", "span", "u", "td", "th"},
+    "thead": set(),
+    "tr": {"p", "tr", "td", "th"},
+    "ul": {"address", "dir", "listing", "menu", "p", "pre"},
+    "xmp": {"p"},
+}
+for _heading in _HEADINGS:
+    _LIBXML2_CLOSES[_heading] = {"p"}
+# libxml2 ignores an end tag when a higher-priority element is open above it
+_LIBXML2_END_PRIORITY = {"div": 150, "td": 160, "th": 160, "tr": 170, "thead": 180, "tbody": 180, "tfoot": 180,
+                         "table": 190, "head": 200, "body": 200, "html": 220}
+# HTML5 void elements libxml2 keeps open, nesting what follows inside them
+_LIBXML2_OPEN_VOID = {"bgsound", "embed", "source", "track", "wbr"}
+_SKIPPED_TAGS = {"html", "head", "body"}
+_RAW_TEXT = {"iframe", "script", "style", "textarea", "title"}
+_UNMODELED = {
+    "applet", "caption", "col", "colgroup", "frame", "frameset", "image", "isindex", "keygen", "marquee",
+    "noembed", "noframes", "object", "plaintext", "rb", "rp", "rt", "rtc", "ruby", "template", "xmp",
+}
+_FOREIGN = {"svg", "math"}
+# start tags that break out of svg/math back into HTML
+_FOREIGN_BREAKOUT = {
+    "b", "big", "blockquote", "body", "br", "center", "code", "dd", "div", "dl", "dt", "em", "embed", "font",
+    "head", "hr", "i", "img", "li", "listing", "menu", "meta", "nobr", "ol", "p", "pre", "ruby", "s", "small",
+    "span", "strong", "strike", "sub", "sup", "table", "tt", "u", "ul", "var",
+} | _HEADINGS
+_MAX_DEPTH = 200
+# start tags that may imply end tags in either parser
+_IMPLYING_START = _CLOSES_P | _CELLS | _ROWS | set(_LIBXML2_CLOSES) | {"button", "dd", "dt", "li", "table"}
+
+
+def _find(stack: List[str], names, boundaries) -> int:
+    """Index of the topmost element named in ``names`` in the given scope, else -1."""
+    for idx in range(len(stack) - 1, -1, -1):
+        name = stack[idx]
+        if name in names:
+            return idx
+        if name in boundaries:
+            return -1
+    return -1
+
+
+def _close_p(stack: List[str], cut: int) -> int:
+    idx = _find(stack[:cut], ("p",), _BUTTON_SCOPE)
+    return cut if idx < 0 else idx
+
+
+def _html5_start(stack: List[str], tag: str, no_quirks: bool) -> Optional[int]:
+    """Stack length after html5lib's implied end tags for start ``tag``; None if not modeled."""
+    cut = len(stack)
+    if tag in ("li", "dd", "dt"):
+        names = ("li",) if tag == "li" else ("dd", "dt")
+        for idx in range(cut - 1, -1, -1):
+            name = stack[idx]
+            if name in names:
+                cut = idx
+                break
+            if name in _SPECIAL and name not in ("address", "div", "p"):
+                break
+        return _close_p(stack, cut)
+    if tag in _CLOSES_P or (tag == "table" and no_quirks):
+        cut = _close_p(stack, cut)
+        if tag in _HEADINGS and cut and stack[cut - 1] in _HEADINGS:
+            cut -= 1
+        return cut
+    if tag in _CELLS or tag in _ROWS:
+        table = _find(stack, ("table",), ("html",))
+        if table < 0:
+            return None
+        cell = _find(stack, _CELLS, _TABLE_SCOPE)
+        if cell >= 0:
+            cut = cell
+        stop = ("tr",) if tag in _CELLS else ("tbody", "tfoot", "thead") if tag == "tr" else ()
+        while cut > table + 1 and stack[cut - 1] not in stop:
+            if stack[cut - 1] not in _ROWS:
+                return None
+            cut -= 1
+        return cut
+    if tag == "button":
+        idx = _find(stack, ("button",), _SCOPE)
+        return cut if idx < 0 else idx
+    if tag in ("option", "optgroup"):
+        if stack and stack[-1] == "option":
+            cut -= 1
+        if tag == "optgroup" and "select" in stack and cut and stack[cut - 1] == "optgroup":
+            cut -= 1
+        return cut
+    return cut
+
+
+def _libxml2_start(stack: List[str], tag: str, floor: int) -> int:
+    closes = _LIBXML2_CLOSES.get(tag)
+    cut = len(stack)
+    while closes and cut > floor and stack[cut - 1] in closes:
+        cut -= 1
+    return cut
+
+
+def _html5_end(stack: List[str], tag: str, form_open: bool) -> Optional[int]:
+    """Stack length after html5lib processes end ``tag``; None if not modeled."""
+    cut = len(stack)
+    if tag == "p":
+        idx = _find(stack, ("p",), _BUTTON_SCOPE)
+        return None if idx < 0 else idx
+    if tag == "br":
+        return None
+    if tag == "form":
+        return cut - 1 if form_open and stack and stack[-1] == "form" else None
+    if tag in _FORMATTING:
+        # anything but closing the current node runs the adoption agency
+        return cut - 1 if stack and stack[-1] == tag else None
+    if tag in _HEADINGS:
+        idx = _find(stack, _HEADINGS, _SCOPE)
+    elif tag == "li":
+        idx = _find(stack, ("li",), _LIST_SCOPE)
+    elif tag == "table" or tag in _CELLS or tag in _ROWS:
+        idx = _find(stack, (tag,), _TABLE_SCOPE)
+    elif tag in _BLOCK_END:
+        idx = _find(stack, (tag,), _SCOPE)
+    else:
+        idx = _find(stack, (tag,), _SPECIAL)
+    return cut if idx < 0 else idx
+
+
+def _libxml2_end(stack: List[str], tag: str) -> int:
+    priority = _LIBXML2_END_PRIORITY.get(tag, 100)
+    for idx in range(len(stack) - 1, -1, -1):
+        if stack[idx] == tag:
+            return idx
+        if _LIBXML2_END_PRIORITY.get(stack[idx], 100) > priority:
+            break
+    return len(stack)
+
+
+def _tree_divergence(html_content: str) -> Optional[str]:
+    """
+    Why libxml2 may build a different tree than html5lib for this markup,
+    or None when both are known to agree.
+    """
+    if "<!-->" in html_content or "<!--->" in html_content:
+        return "comment"
+    no_quirks = bool(_HTML5_DOCTYPE_RE.match(html_content))
+    html_content = _COMMENT_RE.sub("", html_content)
+    if "<!--" in html_content:
+        return "comment"
+    html_content = _DECLARATION_RE.sub("", html_content)
+    # raw text markup is replaced by a NUL, which only matters inside svg/math
+    html_content, raw_texts = _RAW_TEXT_RE.subn(
+        lambda m: m.group(1) + "\0" if "<" in m.group(3) else m.group(1), html_content
+    )
+    if len(_RAW_TEXT_START_RE.findall(html_content)) != raw_texts:
+        return "unclosed raw text"
+
+    stack: List[str] = []
+    # stack depths of the voids libxml2 left open
+    open_voids: List[int] = []
+    seen = set()
+    in_body = head_tags = after_head = head_gap = form_open = False
+    # html5lib keeps appending to the elements still open at </body>
+    ended: Optional[str] = None
+    # open svg/math elements, which both parsers only nest
+    foreign: List[str] = []
+    selects = 0
+    pos = 0
+    for match in _TAG_RE.finditer(html_content):
+        closing, tag, attrs = match.groups()
+        tag = tag.lower()
+        start = match.start()
+        if start != pos and (ended or not in_body or (stack and stack[-1] in _TABLE_CONTEXT)):
+            text = html_content[pos:start].lstrip("\0")
+            if text and ended:
+                return f"content after </{ended}>"
+            if text and after_head and not in_body:
+                # html5lib keeps whitespace between </head> and <body> in <html>
+                head_gap = True
+            if text.strip():
+                if after_head and not in_body:
+                    return "text after </head>"
+                if stack and stack[-1] in _TABLE_CONTEXT:
+                    return "text in table"
+                in_body = True
+        pos = match.end()
+
+        if foreign:
+            if closing:
+                if foreign[-1] != tag:
+                    return f"</{tag}> in foreign content"
+                foreign.pop()
+            elif tag in _FOREIGN_BREAKOUT or tag in _LIBXML2_CLOSES or html_content.startswith("\0", match.end()):
+                return f"<{tag}> in foreign content"
+            elif not attrs.endswith("/") and tag not in _RAW_TEXT:
+                foreign.append(tag)
+            continue
+        if ended and not (closing and tag in ("body", "html")):
+            return f"content after </{ended}>"
+        if closing and stack and stack[-1] == tag and tag != "form":
+            # closing the current node is the same in both parsers
+            stack.pop()
+            if open_voids and open_voids[-1] > len(stack):
+                open_voids.pop()
+            selects -= tag == "select"
+            continue
+        if tag in _SKIPPED_TAGS:
+            if closing:
+                if (tag == "head") == in_body:
+                    return f"misplaced </{tag}>"
+                if tag == "head":
+                    after_head = True
+                elif stack:
+                    ended = tag
+            elif tag in seen or in_body or (tag == "html" and (head_tags or seen)):
+                # html5lib merges the attributes of repeated and late <html>/<body> tags
+                return f"late <{tag}>"
+            seen.add(tag)
+            after_head = after_head or attrs.endswith("/")
+            if tag == "body":
+                in_body = True
+                head_gap = False
+            continue
+        if head_gap and not in_body:
+            return "whitespace after </head>"
+        if not closing and tag == "title" and in_body:
+            return "<title> in body"
+        if not in_body and not closing:
+            if tag == "noscript":
+                return "<noscript> in head"
+            in_body = tag not in _IN_HEAD
+            head_tags = True
+        if tag in _UNMODELED:
+            return f"<{tag}>"
+        if selects and tag not in ("option", "optgroup", "select"):
+            return f"<{tag}> in select"
+
+        if closing:
+            if tag in _VOID or tag in _RAW_TEXT:
+                if tag == "br" or tag in _LIBXML2_OPEN_VOID:
+                    return f"</{tag}>"
+                continue
+            cut = _html5_end(stack, tag, form_open)
+            if cut is None or cut != _libxml2_end(stack, tag):
+                return f"</{tag}>"
+            if any(name in _FORMATTING for name in stack[cut + 1:]):
+                return f"</{tag}> closes formatting"
+            if tag == "form":
+                form_open = False
+            selects -= stack[cut:].count("select")
+            del stack[cut:]
+            while open_voids and open_voids[-1] > cut:
+                open_voids.pop()
+            continue
+
+        if stack and stack[-1] in _TABLE_CONTEXT and tag not in _CELLS and tag not in _ROWS \
+                and tag not in ("script", "style"):
+            return f"<{tag}> in table"
+        if attrs.endswith("/") and tag not in _VOID and tag not in _FOREIGN:
+            return f"<{tag}/>"
+        if (tag in ("a", "nobr") and tag in stack) or (tag == "form" and form_open) or (tag == "select" and selects):
+            return f"nested <{tag}>"
+        if tag in _IMPLYING_START or tag in ("option", "optgroup"):
+            cut = _html5_start(stack, tag, no_quirks)
+            if cut is None or cut != _libxml2_start(stack, tag, open_voids[-1] if open_voids else 0):
+                return f"<{tag}>"
+            if any(name in _FORMATTING for name in stack[cut:]):
+                return f"<{tag}> closes formatting"
+            selects -= stack[cut:].count("select")
+            del stack[cut:]
+        if tag in _FOREIGN:
+            if not attrs.endswith("/"):
+                foreign.append(tag)
+            continue
+        if tag == "form":
+            form_open = True
+        selects += tag == "select"
+        if tag in _CELLS or tag == "tr":
+            top = stack[-1]
+            if top == "table":
+                stack.append("tbody")
+            if tag in _CELLS and top != "tr":
+                stack.append("tr")
+        if tag in _LIBXML2_OPEN_VOID:
+            open_voids.append(len(stack))
+        elif tag not in _VOID and tag not in _RAW_TEXT:
+            stack.append(tag)
+            if len(stack) > _MAX_DEPTH:
+                return "too deep"
+    tail = html_content[pos:]
+    if tail and ended:
+        return f"content after </{ended}>"
+    if foreign:
+        return f"unclosed <{foreign[0]}>"
+    return None
+
+
+def _decode(html_content: Union[str, bytes]) -> str:
+    if isinstance(html_content, str):
+        return html_content
+    from bs4 import UnicodeDammit
+
+    return UnicodeDammit(html_content, is_html=True).unicode_markup or ""
+
+
+def clean_html_chunks(chunks: Iterable[str]) -> str:
+    """
+    Clean HTML fed as an iterable of text chunks (e.g. a streamed response).
+
+    Unlike `clean_html_lxml` this does not check the markup first, so it
+    matches the reference cleaner only where libxml2 builds the same tree.
+    """
+    parser = etree.HTMLParser(
+        target=_CleaningTarget(),
+        remove_comments=True,
+        remove_pis=True,
+        no_network=True,
+    )
+    for chunk in chunks:
+        if chunk:
+            parser.feed(chunk)
+    cleaned_html = parser.close()
+    return _WHITESPACE_RE.sub(" ", cleaned_html).strip()
+
+
+def clean_html_lxml(html_content: Union[str, bytes]) -> str:
+    """
+    Single-pass lxml equivalent of the BeautifulSoup/html5lib cleaner.
+
+    Markup libxml2 nests differently from html5lib (misnested formatting,
+    HTML5 sectioning elements inside ``<p>``, ...) goes through that cleaner.
+    """
+    html_content = _decode(html_content)
+    if not html_content:
+        return ""
+    if _tree_divergence(html_content):
+        from .utils import clean_html_for_extraction3_soup
+
+        return clean_html_for_extraction3_soup(html_content)
+    return clean_html_chunks(
+        html_content[i:i + CHUNK_SIZE] for i in range(0, len(html_content), CHUNK_SIZE)
+    )
@@ -0,0 +1,148 @@
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Optional, Tuple
+
+from lxml import etree
+
+CHARS_PER_TOKEN = 4
+ELLIPSIS = " …"
+
+
+class TokenCounter:
+    """
+    Counts tokens with tiktoken, or estimates ~4 chars per token when the
+    encoding is unavailable (no tiktoken, or offline without a cached BPE).
+
+    ``encode`` mimics `tokenizers.Tokenizer.encode` so the counter can be
+    passed to feilian's pruning helpers.
+    """
+
+    def __init__(self, encoding: Optional[str] = "o200k_base"):
+        self.name = "approximate"
+        self._encoding = None
+        if encoding:
+            try:
+                import tiktoken
+
+                self._encoding = tiktoken.get_encoding(encoding)
+                self.name = encoding
+            except Exception as e:
+                print(f"Tokenizer {encoding} unavailable, estimating tokens: {e}")
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is None:
+            return -(-len(text) // CHARS_PER_TOKEN)
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if self._encoding is None:
+            return text[: max_tokens * CHARS_PER_TOKEN]
+        ids = self._encoding.encode(text, disallowed_special=())
+        return self._encoding.decode(ids[:max_tokens])
+
+    def encode(self, text: str):
+        if self._encoding is None:
+            return SimpleNamespace(ids=range(self.count(text)))
+        return SimpleNamespace(ids=self._encoding.encode(text, disallowed_special=()))
+
+    def __call__(self, text: str) -> int:
+        return self.count(text)
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(encoding: Optional[str] = "o200k_base") -> TokenCounter:
+    return TokenCounter(encoding)
+
+
+def _shorten(text: Optional[str], counter: TokenCounter, max_tokens: int) -> Tuple[Optional[str], int]:
+    if not text or not text.strip():
+        return text, 0
+    tokens = counter.count(text)
+    if tokens <= max_tokens:
+        return text, 0
+    shortened = counter.truncate(text, max_tokens).rstrip() + ELLIPSIS
+    return shortened, tokens - counter.count(shortened)
+
+
+def truncate_texts(
+    ele: etree._Element, counter: TokenCounter, max_tokens: int, until: Optional[int] = None
+) -> int:
+    """
+    Shorten text nodes under ``ele`` to ``max_tokens``, in document order,
+    stopping once ``until`` tokens are saved (default: shorten all).
+    Elements are kept, so XPaths into the fragment stay valid.
+    Returns the number of tokens saved.
+    """
+    saved = 0
+    for node in ele.iter():
+        if until is not None and saved >= until:
+            break
+        node.text, node_saved = _shorten(node.text, counter, max_tokens)
+        saved += node_saved
+        if node is not ele:
+            node.tail, node_saved = _shorten(node.tail, counter, max_tokens)
+            saved += node_saved
+    return saved
+
+
+def compact_html(
+    html_content: str,
+    max_tokens: int,
+    counter: TokenCounter = None,
+    text_node_tokens: int = 48,
+) -> Tuple[str, int, int]:
+    """
+    Fit cleaned HTML under ``max_tokens`` for the extractor prompt.
+
+    1. The heaviest text fragments (feilian's ``extract_fragments_by_weight``)
+       have their text nodes shortened to ``text_node_tokens`` each.
+    2. If that is not enough, ``prune_by_tokens`` keeps the leading children
+       that fit and drops the rest.
+
+    Both steps only remove text or trailing siblings, so XPaths to the
+    elements that remain select the same nodes in the original page.
+
+    Returns ``(compacted_html, original_tokens, compacted_tokens)``.
+    """
+    if counter is None:
+        counter = get_token_counter()
+    original_tokens = counter.count(html_content)
+    if original_tokens <= max_tokens:
+        return html_content, original_tokens, original_tokens
+
+    root = etree.HTML(html_content)
+    if root is None:
+        return html_content, original_tokens, original_tokens
+    tree = root.getroottree()
+
+    # feilian pulls in numpy and html5lib; only pages over budget need it
+    from feilian.etree_token_stats import extract_fragments_by_weight
+    from feilian.etree_tools import prune_by_tokens
+
+    remaining = original_tokens
+    for xpath in extract_fragments_by_weight(
+        tree, counter.count, until_html_tokens=max_tokens, max_text_tokens=max_tokens
+    ):
+        for ele in tree.xpath(xpath):
+            remaining -= truncate_texts(ele, counter, text_node_tokens, until=remaining - max_tokens)
+        if remaining <= max_tokens:
+            break
+
+    compacted = etree.tostring(root, encoding="unicode", method="html")
+    compacted_tokens = counter.count(compacted)
+    body = root.find("body")
+    target = body if body is not None else root
+    budget = max_tokens
+    for _ in range(3):
+        if compacted_tokens <= max_tokens:
+            break
+        # feilian counts the XML serialization; tighten the budget by the overshoot
+        overhead = compacted_tokens - counter.count(etree.tostring(target, encoding="unicode"))
+        prune_by_tokens(counter, target, max(budget - overhead, 0))
+        compacted = etree.tostring(root, encoding="unicode", method="html")
+        compacted_tokens = counter.count(compacted)
+        budget -= max(compacted_tokens - max_tokens, 0)
+
+    return compacted, original_tokens, compacted_tokens
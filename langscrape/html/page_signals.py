@@ -0,0 +1,104 @@
+import json
+from typing import Any, Dict, List, Union
+
+from lxml import etree
+from lxml import html as lxml_html
+
+Raw = Union[str, bytes]
+Signals = Dict[str, List[str]]
+
+# JSON-LD types describing the page's main content
+ARTICLE_TYPES = {"Article", "NewsArticle", "BlogPosting", "Report", "ReportageNewsArticle", "AnalysisNewsArticle", "OpinionNewsArticle"}
+JSON_LD_KEYS = {
+    "headline": "title",
+    "name": "title",
+    "author": "author",
+    "datePublished": "datetime",
+    "dateCreated": "datetime",
+    "articleBody": "article_body",
+}
+# <meta property|name=...> -> field
+META_KEYS = {
+    "og:title": "title",
+    "twitter:title": "title",
+    "author": "author",
+    "article:author": "author",
+    "article:published_time": "datetime",
+    "date": "datetime",
+    "pubdate": "datetime",
+}
+ITEMPROP_KEYS = {"headline": "title", "author": "author", "datePublished": "datetime", "articleBody": "article_body"}
+
+
+def _add(signals: Signals, field: str, value: Any) -> None:
+    if isinstance(value, dict):
+        value = value.get("name")
+    if isinstance(value, list):
+        for item in value:
+            _add(signals, field, item)
+        return
+    if not isinstance(value, str):
+        return
+    value = " ".join(value.split())
+    if value and value not in signals.setdefault(field, []):
+        signals[field].append(value)
+
+
+def _json_ld_objects(data: Any):
+    if isinstance(data, list):
+        for item in data:
+            yield from _json_ld_objects(item)
+    elif isinstance(data, dict):
+        yield data
+        yield from _json_ld_objects(data.get("@graph"))
+
+
+def _is_article(obj: Dict[str, Any]) -> bool:
+    types = obj.get("@type")
+    types = types if isinstance(types, list) else [types]
+    return any(t in ARTICLE_TYPES for t in types if isinstance(t, str))
+
+
+def extract_page_signals(raw: Raw) -> Signals:
+    """
+    Candidate values per field from the raw page's metadata: JSON-LD
+    articles, OpenGraph and other ``<meta>`` tags, microdata (``itemprop``),
+    ``rel=author`` links and ``<time datetime>`` elements.
+
+    Cleaning drops all of these, so they are read from the fetched HTML and
+    later located in the cleaned tree (see `langscrape.html.xpath_discovery`).
+    """
+    if not raw:
+        return {}
+    try:
+        tree = lxml_html.fromstring(raw)
+    except (etree.ParserError, ValueError):
+        return {}
+
+    signals: Signals = {}
+    for script in tree.xpath("//script[@type='application/ld+json']"):
+        try:
+            data = json.loads(script.text or "")
+        except ValueError:
+            continue
+        for obj in _json_ld_objects(data):
+            if _is_article(obj):
+                for key, field in JSON_LD_KEYS.items():
+                    _add(signals, field, obj.get(key))
+
+    for meta in tree.xpath("//meta[@content]"):
+        field = META_KEYS.get(meta.get("property") or meta.get("name") or "")
+        if field:
+            _add(signals, field, meta.get("content"))
+
+    for ele in tree.xpath("//*[@itemprop]"):
+        field = ITEMPROP_KEYS.get(ele.get("itemprop"))
+        if field:
+            names = ele.xpath(".//*[@itemprop='name']")
+            _add(signals, field, (names[0] if names else ele).text_content())
+
+    for ele in tree.xpath("//a[contains(concat(' ', normalize-space(@rel), ' '), ' author ')]"):
+        _add(signals, "author", ele.text_content())
+    for ele in tree.xpath("//time[@datetime]"):
+        _add(signals, "datetime", ele.text_content())
+    return signals
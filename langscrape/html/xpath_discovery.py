@@ -0,0 +1,118 @@
+from typing import Any, Dict, List, Optional
+
+from lxml import html as lxml_html
+
+from .page_signals import Signals
+from .xpath_extractor import extract_by_xpath_map_from_tree, parse_html_document
+from ..utils import validate_extracts
+
+AUTHOR_CLASSES = ("author", "byline", "writer")
+DATE_CLASSES = ("date", "time", "publish", "posted")
+# signal values are matched against the cleaned text by their start
+MAX_ANCHOR_CHARS = 200
+BODY_CONTAINERS = 3
+
+
+def _class_test(names) -> str:
+    return " or ".join(f"contains(@class, '{name}')" for name in names)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def _innermost(elements: List[lxml_html.HtmlElement]) -> List[lxml_html.HtmlElement]:
+    """``elements`` without the ones containing another of them."""
+    chosen = set(elements)
+    return [e for e in elements if not any(d in chosen for d in e.iterdescendants())]
+
+
+def _structural(tree, field: str) -> List[lxml_html.HtmlElement]:
+    """Elements the usual article markup puts ``field`` in, most likely first."""
+    if field == "title":
+        return tree.xpath("//h1")[:2]
+    if field == "author":
+        found = _innermost(tree.xpath(f"//*[{_class_test(AUTHOR_CLASSES)}]"))
+        return [e for e in found if 0 < len(e.text_content().split()) <= 6][:3]
+    if field == "datetime":
+        found = tree.xpath("//time") + _innermost(tree.xpath(f"//*[{_class_test(DATE_CLASSES)}]"))
+        return [e for e in found if any(c.isdigit() for c in e.text_content())][:3]
+    return []
+
+
+def _body_containers(tree, anchors: List[lxml_html.HtmlElement]) -> List[lxml_html.HtmlElement]:
+    """Containers of the article's paragraphs: parents of the signal's text, then those with the most direct <p> text."""
+    totals: Dict[Any, int] = {}
+    for p in tree.iter("p"):
+        parent = p.getparent()
+        if parent is not None:
+            totals[parent] = totals.get(parent, 0) + len(p.text_content().strip())
+    ranked = sorted(totals, key=lambda e: -totals[e])[:BODY_CONTAINERS]
+    parents = [a.getparent() for a in anchors if a.getparent() is not None]
+    return list(dict.fromkeys(parents + ranked))
+
+
+def candidate_xpaths(tree, field: str, values: List[str], index=None) -> List[str]:
+    """
+    XPaths for ``field`` in the cleaned ``tree``, best first: the elements
+    whose text matches a signal value, then the structural candidates.
+    """
+    from feilian.etree_tools import XPathIndex, gen_xpath_by_text
+
+    if index is None:
+        index = XPathIndex(tree)
+    anchors = []
+    for value in values:
+        value = value[:MAX_ANCHOR_CHARS]
+        for xpath in gen_xpath_by_text(tree, value, index=index):
+            # feilian also matches texts that are only part of the value
+            anchors.extend(
+                e for e in tree.xpath(xpath)
+                if isinstance(e, lxml_html.HtmlElement)
+                and not e.xpath("ancestor-or-self::head")
+                and _normalize(value) in _normalize(e.text_content())
+            )
+    if field == "article_body":
+        return [f"{index.get_xpath(e)}//p" for e in _body_containers(tree, anchors)]
+    elements = list(dict.fromkeys(anchors + _structural(tree, field)))
+    return [index.get_xpath(e) for e in elements]
+
+
+def best_xpath(tree, field: str, candidates: List[str], values: List[str], config=None) -> Optional[str]:
+    """
+    The candidate whose extraction passes `validate_extracts`, preferring
+    one that agrees with a signal value, then the earlier one.
+    """
+    signals = [_normalize(v) for v in values if v.strip()]
+    best = None
+    for rank, xpath in enumerate(dict.fromkeys(candidates)):
+        extracted = extract_by_xpath_map_from_tree(tree, {field: {"xpath": xpath}})
+        if validate_extracts(extracted, config):
+            continue
+        text = _normalize(" ".join(extracted[field]))
+        agrees = any(s in text or text in s for s in signals)
+        score = (agrees, -rank)
+        if best is None or score > best[0]:
+            best = (score, xpath)
+    return best[1] if best else None
+
+
+def discover_xpaths(html_content: str, fields: List[str], signals: Signals = None, config=None) -> Dict[str, str]:
+    """
+    Rule-based XPaths for ``fields`` in the cleaned HTML, from the page
+    signals (see `langscrape.html.page_signals`) and common article markup
+    (``<h1>``, ``<time>``, byline classes, the densest ``<p>`` container).
+    Only fields with a candidate that validates are returned.
+    """
+    from feilian.etree_tools import XPathIndex
+
+    signals = signals or {}
+    tree = parse_html_document(html_content)
+    index = XPathIndex(tree)
+    found = {}
+    for field in fields:
+        values = signals.get(field, [])
+        xpath = best_xpath(tree, field, candidate_xpaths(tree, field, values, index), values, config)
+        if xpath:
+            found[field] = xpath
+    return found
@@ -1,11 +1,15 @@
 from collections.abc import Mapping, Sequence
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
 
 from lxml import html as lxml_html
 
 
 FieldState = Dict[str, Any]
 
+# Parsed trees kept alive at once; sized for a few runs in flight per process.
+DOCUMENT_CACHE_SIZE = 16
+
 
 def _ensure_list(value: Any) -> List[str]:
     if value is None:
@@ -44,6 +48,17 @@ def _get_xpath(entry: Any) -> Optional[str]:
     return None
 
 
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def parse_html_document(html_content: str) -> lxml_html.HtmlElement:
+    """Parse cleaned HTML once and share the tree.
+
+    The cache is keyed by the content itself, so every node of a run (and
+    every iteration of the extraction loop) evaluates XPaths against the
+    same tree. Callers must treat the returned tree as read-only.
+    """
+    return lxml_html.fromstring(html_content)
+
+
 def extract_by_xpath_map_from_html(html_content: str, field_state: Dict[str, FieldState]) -> Dict[str, List[str]]:
     """Extract structured content using field definitions.
 
@@ -52,7 +67,16 @@ def extract_by_xpath_map_from_html(html_content: str, field_state: Dict[str, Fie
     The helper gracefully handles both strategies, returning a map of
     ``field -> list[str]`` for downstream formatting.
     """
+    return _extract_by_xpath_map(lambda: parse_html_document(html_content), field_state)
+
+
+def extract_by_xpath_map_from_tree(tree: lxml_html.HtmlElement, field_state: Dict[str, FieldState]) -> Dict[str, List[str]]:
+    """Same as `extract_by_xpath_map_from_html` for an already parsed tree."""
+    return _extract_by_xpath_map(lambda: tree, field_state)
+
 
+def _extract_by_xpath_map(get_tree: Callable[[], Any], field_state: Dict[str, FieldState]) -> Dict[str, List[str]]:
+    # the tree is only requested once a field actually needs an XPath
     result: Dict[str, List[str]] = {}
     tree = None
 
@@ -72,7 +96,7 @@ def extract_by_xpath_map_from_html(html_content: str, field_state: Dict[str, Fie
             continue
 
         if tree is None:
-            tree = lxml_html.fromstring(html_content)
+            tree = get_tree()
 
         try:
             values = tree.xpath(xpath)
@@ -0,0 +1,50 @@
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage, message_chunk_to_message
+
+Timing = Dict[str, Optional[float]]
+
+
+def _timing(start: float, first: Optional[float]) -> Timing:
+    end = time.perf_counter()
+    return {
+        "latency_s": round(end - start, 3),
+        "ttft_s": round(first - start, 3) if first is not None else None,
+    }
+
+
+def invoke_llm(model: Any, messages: Sequence[BaseMessage], stream: bool = False) -> Tuple[BaseMessage, Timing]:
+    """
+    Call ``model`` and return ``(response, timing)``.
+
+    With ``stream`` the response is streamed and merged back into one
+    message, which also gives the time to the first chunk (``ttft_s``);
+    otherwise only the wall-clock ``latency_s`` is known.
+    """
+    start = time.perf_counter()
+    if not stream:
+        response = model.invoke(messages)
+        return response, _timing(start, None)
+    first = None
+    merged = None
+    for chunk in model.stream(messages):
+        if first is None:
+            first = time.perf_counter()
+        merged = chunk if merged is None else merged + chunk
+    return message_chunk_to_message(merged), _timing(start, first)
+
+
+async def ainvoke_llm(model: Any, messages: Sequence[BaseMessage], stream: bool = False) -> Tuple[BaseMessage, Timing]:
+    """Async `invoke_llm`."""
+    start = time.perf_counter()
+    if not stream:
+        response = await model.ainvoke(messages)
+        return response, _timing(start, None)
+    first = None
+    merged = None
+    async for chunk in model.astream(messages):
+        if first is None:
+            first = time.perf_counter()
+        merged = chunk if merged is None else merged + chunk
+    return message_chunk_to_message(merged), _timing(start, first)
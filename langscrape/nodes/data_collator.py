@@ -3,9 +3,8 @@ import os
 import re
 
 from ..agent.state import AgentState
-from ..utils import load_config
-
-config = load_config()
+from ..concurrency import drop_futures
+from .feature_binder import resolve_traditional, traditional_summary_fields
 
 def extract_json_block(text: str) -> dict:
     """
@@ -44,7 +43,18 @@ def extract_json_block(text: str) -> dict:
 
 
 def data_collator(state: AgentState) -> AgentState:
+    pending = state.get("traditional_pending") or []
+    updates = resolve_traditional(state)
+    state = {**state, **updates}
+    # fields newspaper filled while the summarizer ran
+    late_fields = [k for k in pending if k in (updates.get("traditional_flag") or [])]
     final_json = {'meta_data': {'id': state['id'],'url': state.get("url", "")}}
+    if not state.get("url_is_pdf", False):
+        final_json['meta_data']['template_hit'] = state.get("template_hit", False)
+        final_json['meta_data']['discovery_hit'] = state.get("discovery_hit", False)
+        final_json['meta_data']['fetch_stage'] = state.get("fetch_stage")
+    if state.get("compaction"):
+        final_json['meta_data']['compaction'] = state["compaction"]
 
     base_result = state.get("extracted_fields") or state.get("extracted_fields") or {}
     final_json['extraction'] = dict(base_result)
@@ -57,6 +67,9 @@ def data_collator(state: AgentState) -> AgentState:
         summary_json = {}
 
     if isinstance(summary_json, dict):
+        summary_json.update(traditional_summary_fields(final_json['extraction'], late_fields))
         final_json['summary'] = summary_json
 
-    return {"result": final_json}
+    # nothing of this run is waited on past this point
+    drop_futures(state.get("run_token"))
+    return {**updates, "result": final_json}
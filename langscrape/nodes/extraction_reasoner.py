@@ -1,18 +1,62 @@
-from langchain_core.messages import SystemMessage
+from typing import Any, Dict, List, Tuple
+from langchain_core.messages import BaseMessage
 from ..html.xpath_extractor import extract_by_xpath_map_from_html
 from ..agent.state import AgentState
-from ..utils import get_system_prompt, get_formatted_extracts, update_token_usage
+from ..utils import (
+    get_formatted_extracts,
+    get_prefix_prompt,
+    get_state_message,
+    get_system_prompt,
+    update_token_usage,
+)
+from ..settings import run_settings
+from ..concurrency import llm_slot
+from ..llm import ainvoke_llm, invoke_llm
+from .summarizer import start_speculative_summary
 
-def extraction_reasoner(state: AgentState) -> AgentState:
-    iters = state["iterations"]
+def _build_prompt(state: AgentState) -> Tuple[List[BaseMessage], List[BaseMessage], Dict[str, Any]]:
+    """
+    Return ``(request_messages, new_history, current_extracts)``.
+
+    ``extractor.prompt_layout: prefix_cache`` (the default) keeps the system
+    message (instructions + HTML) identical across iterations and appends the
+    per-iteration state as a user message that stays in the history, so each
+    request extends the previous one and hits the provider's prefix cache.
+    ``legacy`` rebuilds the system message every iteration.
+    """
     current_extracts = extract_by_xpath_map_from_html(state['cleaned_content'], state['global_state'])
     formatted_extracts = get_formatted_extracts(current_extracts)
-    system_prompt = get_system_prompt(state, formatted_extracts, iters)
+    layout = run_settings(state)["extractor"].get("prompt_layout", "prefix_cache")
+    if layout == "prefix_cache":
+        state_message = get_state_message(state, formatted_extracts, state["iterations"])
+        print(f"\n=== 🧠 STATE MESSAGE (ITERATION: {state["iterations"]}) ===\n")
+        print(state_message.content)
+        print("\n=== END OF PROMPT ===\n")
+        return [get_prefix_prompt(state)] + list(state["messages"]) + [state_message], [state_message], current_extracts
+    system_prompt = get_system_prompt(state, formatted_extracts, state["iterations"])
     print(f"\n=== 🧠 SYSTEM PROMPT (ITERATION: {state["iterations"]}) ===\n")
     print(system_prompt.content)
     print("\n=== END OF PROMPT ===\n")
-    response = state['extractor'].invoke([system_prompt] + state["messages"])
+    return [system_prompt] + list(state["messages"]), [], current_extracts
+
+def _stream(state: AgentState) -> bool:
+    return run_settings(state)["extractor"].get("stream", False)
+
+def _apply_response(state: AgentState, new_history: List[BaseMessage], response, timing) -> AgentState:
     print("DEBUG tool_calls:", getattr(response, "tool_calls", None))
-    iters += 1
-    token_usage = update_token_usage(state, "extractor", response)
-    return {"messages": [response], "iterations": iters, "token_usage": token_usage}
+    token_usage = update_token_usage(state, "extractor", response, timing, node="extraction_reasoner")
+    return {"messages": new_history + [response], "iterations": state["iterations"] + 1, "token_usage": token_usage}
+
+def extraction_reasoner(state: AgentState) -> AgentState:
+    messages, new_history, current_extracts = _build_prompt(state)
+    speculative = start_speculative_summary(state, current_extracts)
+    with llm_slot():
+        response, timing = invoke_llm(state['extractor'], messages, stream=_stream(state))
+    return {**_apply_response(state, new_history, response, timing), **speculative}
+
+async def aextraction_reasoner(state: AgentState) -> AgentState:
+    messages, new_history, current_extracts = _build_prompt(state)
+    speculative = start_speculative_summary(state, current_extracts, use_async=True)
+    async with llm_slot():
+        response, timing = await ainvoke_llm(state['extractor'], messages, stream=_stream(state))
+    return {**_apply_response(state, new_history, response, timing), **speculative}
@@ -1,18 +1,46 @@
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
 from ..agent.state import AgentState
+from ..concurrency import claim_future, new_run_token, park_future
 from ..html.xpath_extractor import extract_by_xpath_map_from_html
 from ..warnings import TooShortArticleBody
-from ..utils import load_config
-import newspaper
-import nltk
+from ..settings import as_settings, run_settings
 
-# newspaper3k requires 'punkt' (not 'punkt_tab')
-nltk.download('punkt')
+_punkt_lock = threading.Lock()
+_punkt_ready = False
 
-def apply_articlebody_logic(article_body: str, min_len: int = None) -> bool:
-    """Check article body length and emit a warning if too short."""
+
+def ensure_punkt() -> None:
+    """
+    newspaper3k requires NLTK's 'punkt' (not 'punkt_tab'). Look for it in
+    the local NLTK data first and download only when it is missing, once per
+    process; a failed download is retried on the next call.
+    """
+    global _punkt_ready
+    if _punkt_ready:
+        return
+    with _punkt_lock:
+        if _punkt_ready:
+            return
+        import nltk
+
+        try:
+            nltk.data.find("tokenizers/punkt")
+        except LookupError:
+            if not nltk.download("punkt", quiet=True):
+                print("Could not download NLTK 'punkt'; newspaper may fail to parse articles")
+                return
+        _punkt_ready = True
+
+def apply_articlebody_logic(article_body: str, min_len: int = None, config=None) -> bool:
+    """
+    Check article body length and emit a warning if too short; ``min_len``
+    defaults to the run config's ``min_article_body``.
+    """
     if min_len is None:
-        min_len = load_config()['warnings']['min_article_body']
+        min_len = as_settings(config).min_article_body
 
     ab_len = len(article_body)
     if ab_len < min_len:
@@ -20,48 +48,135 @@ def apply_articlebody_logic(article_body: str, min_len: int = None) -> bool:
         return False
     return True
 
-def get_article_traditional(url):
+def get_article_traditional(url, html=None):
+    """
+    newspaper's article for ``url``, parsed from ``html`` when given (no
+    download), or None when it cannot be parsed.
+    """
     try:
+        ensure_punkt()
+        import newspaper
+
+        if html:
+            return newspaper.article(url, input_html=html)
         return newspaper.article(url)
-    except:
+    except Exception as e:
+        print(f"newspaper could not parse {url}: {e!r}")
         return None
     
 def _is_empty(c):
     return c == ["(Empty Result)"] or c == "(Empty Result)"
 
+# field -> Article attribute used when the XPath result is empty
+TRADITIONAL_FIELDS = {"title": "title", "author": "authors", "datetime": "publish_date"}
+# name of the parked newspaper future, see `park_future`
+TRADITIONAL_JOB = "traditional"
+# field -> summary key the summarizer fills from it
+SUMMARY_KEYS = {"title": "title", "author": "author", "datetime": "publication_date"}
+
+_fallback_pool = None
+_fallback_lock = threading.Lock()
+
+
+def _get_fallback_pool(workers: int) -> ThreadPoolExecutor:
+    global _fallback_pool
+    with _fallback_lock:
+        if _fallback_pool is None:
+            _fallback_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="newspaper")
+        return _fallback_pool
+
+
+def apply_traditional(extracted_fields: Dict[str, Any], article, fields: List[str], min_len: int = None) -> List[str]:
+    """Fill ``fields`` of ``extracted_fields`` from ``article``; returns the fields taken from it."""
+    flags = []
+    if article is None:
+        return flags
+    for k in fields:
+        try:
+            if k == "article_body":
+                flags.append("article_body")
+                extracted_fields["article_body"] = article.text
+                apply_articlebody_logic(article.text, min_len)
+            else:
+                flags.append(k)
+                extracted_fields[k] = getattr(article, TRADITIONAL_FIELDS[k])
+        except:
+            pass
+    return flags
+
+
+def _summary_value(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value if v)
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d")
+    return str(value or "")
+
+
+def traditional_summary_fields(extracted_fields: Dict[str, Any], fields: List[str]) -> Dict[str, str]:
+    """
+    Summary values for ``fields`` filled by a fallback that finished after
+    the summarizer ran, which therefore never saw them (empty ones are left
+    to the summary).
+    """
+    values = {SUMMARY_KEYS[k]: _summary_value(extracted_fields.get(k)) for k in fields if k in SUMMARY_KEYS}
+    return {k: v for k, v in values.items() if v}
+
+
+def resolve_traditional(state: AgentState) -> Dict[str, Any]:
+    """
+    Wait for a fallback `feature_binder` left running and merge it into
+    ``extracted_fields``/``traditional_flag``; {} when there is none.
+    """
+    fields = state.get("traditional_pending")
+    if not fields:
+        return {}
+    future = claim_future(state.get("run_token"), TRADITIONAL_JOB)
+    extracted_fields = dict(state.get("extracted_fields") or {})
+    min_len = run_settings(state).min_article_body
+    flags = apply_traditional(extracted_fields, future.result() if future else None, fields, min_len)
+    return {
+        "extracted_fields": extracted_fields,
+        "traditional_flag": list(state.get("traditional_flag") or []) + flags,
+        "traditional_pending": None,
+    }
+
+
 def feature_binder(state: AgentState) -> AgentState:
-    """Extract features from cleaned HTML and validate article body length."""
+    """
+    Extract features from cleaned HTML and validate article body length.
+
+    newspaper only runs when a field needs it (a short article body or an
+    empty title/author/datetime) and parses the raw HTML that was already
+    fetched, meta tags and JSON-LD included. A short body is needed by the
+    summarizer, so it is filled right away; missing metadata alone is parsed
+    in a worker thread while the summarizer runs (``fallback.concurrent``)
+    and merged by `data_collator`, into the summary as well.
+    """
     extracted_fields = extract_by_xpath_map_from_html(
         state["cleaned_content"],
         state["global_state"],
     )
-    traditional_flag_updates = []
+    settings = run_settings(state)
+    min_len = settings.min_article_body
+    fallback = settings.get("fallback", {}) or {}
     article_body = " ".join(extracted_fields.get("article_body", "")) or ""
-    articlebody_len_ok = apply_articlebody_logic(article_body)
-    article = get_article_traditional(state["url"])
-
-    if not articlebody_len_ok and article:
-        try:
-            traditional_flag_updates.append("article_body")
-            article_body = article.text
-            extracted_fields["article_body"] = article_body
-            apply_articlebody_logic(article_body)
-        except:
-            pass
+    articlebody_len_ok = apply_articlebody_logic(article_body, min_len)
+    fields = [] if articlebody_len_ok else ["article_body"]
+    fields += [k for k, v in extracted_fields.items() if k in TRADITIONAL_FIELDS and _is_empty(v)]
+    if not fields:
+        return {"extracted_fields": extracted_fields, "traditional_flag": []}
 
-    empty_checks = {k: _is_empty(v) for k, v in extracted_fields.items()}
-    if article:
-        for k, empty in empty_checks.items():
-            try:
-                if empty and k == "title":
-                    traditional_flag_updates.append("title")
-                    extracted_fields["title"] = article.title
-                elif empty and k == "author":
-                    traditional_flag_updates.append("author")
-                    extracted_fields["author"] = article.authors
-                elif empty and k == "datetime":
-                    traditional_flag_updates.append("datetime")
-                    extracted_fields["datetime"] = article.publish_date
-            except:
-                pass
-    return {"extracted_fields": extracted_fields, "traditional_flag": traditional_flag_updates}
\ No newline at end of file
+    args = (state["url"], state.get("raw_content") or state["cleaned_content"])
+    if articlebody_len_ok and fallback.get("concurrent", True):
+        future = _get_fallback_pool(fallback.get("workers", 4)).submit(get_article_traditional, *args)
+        token = state.get("run_token") or new_run_token()
+        park_future(token, TRADITIONAL_JOB, future)
+        return {
+            "extracted_fields": extracted_fields,
+            "traditional_flag": [],
+            "traditional_pending": fields,
+            "run_token": token,
+        }
+    flags = apply_traditional(extracted_fields, get_article_traditional(*args), fields, min_len)
+    return {"extracted_fields": extracted_fields, "traditional_flag": flags}
@@ -0,0 +1,30 @@
+from ..agent.state import AgentState
+from ..html.compaction import compact_html, get_token_counter
+from ..settings import run_settings
+
+
+def html_compactor(state: AgentState) -> AgentState:
+    """Fit the cleaned HTML under the extractor's token budget."""
+    settings = run_settings(state).get("compaction", {}) or {}
+    counter = get_token_counter(settings.get("encoding", "o200k_base"))
+    html = state["cleaned_content"]
+    if settings.get("enabled", True):
+        compacted, original_tokens, compacted_tokens = compact_html(
+            html,
+            max_tokens=settings.get("max_tokens", 24000),
+            counter=counter,
+            text_node_tokens=settings.get("text_node_tokens", 48),
+        )
+    else:
+        compacted = html
+        original_tokens = compacted_tokens = counter.count(html)
+    if compacted_tokens < original_tokens:
+        print(f"html compacted: {original_tokens} -> {compacted_tokens} tokens")
+    return {
+        "compacted_content": compacted,
+        "compaction": {
+            "original_tokens": original_tokens,
+            "compacted_tokens": compacted_tokens,
+            "tokenizer": counter.name,
+        },
+    }
@@ -2,10 +2,16 @@ from ..agent.state import AgentState
 from ..json import SchemeValidator, JSON_SCHEME
 import json
 import os
-from langscrape.utils import load_config, get_default_token_usage
+import threading
+from datetime import datetime
+from langscrape.utils import get_default_token_usage, validate_extracts
+from ..settings import run_settings
+from ..cache import get_template_store
 from ..tags import LOCATIONS, FIGURES, COUNTRIES_AND_ORGANIZATIONS, THEME_TAGS
 from typing import List
 
+# logging.json is shared by every run writing to the same output_dir
+_logging_lock = threading.Lock()
 
 
 def clean_tags(summary: dict, TAGS: List[str] = LOCATIONS + FIGURES + COUNTRIES_AND_ORGANIZATIONS + THEME_TAGS) -> dict:
@@ -37,12 +43,29 @@ def clean_tags(summary: dict, TAGS: List[str] = LOCATIONS + FIGURES + COUNTRIES_
 
 
 
+def store_xpath_template(state: AgentState, config: dict) -> None:
+    """Remember the run's XPaths for its domain when every field validated."""
+    store = get_template_store(config)
+    if store is None or state.get("url_is_pdf") or state.get("traditional_flag"):
+        return
+    if validate_extracts(state.get("extracted_fields") or {}, config):
+        return
+    xpaths = {
+        key: entry["xpath"]
+        for key, entry in state["global_state"].items()
+        if isinstance(entry, dict)
+        and entry.get("strategy", "xpath_extractor") == "xpath_extractor"
+        and entry.get("xpath")
+    }
+    store.store(state["url"], xpaths)
+
+
 def post_processor(state: AgentState) -> AgentState:
     """
     Validate the extracted summary against JSON_SCHEME and
     attach validation metadata to state['result']['meta_data'].
     """ 
-    config = load_config()
+    config = run_settings(state)
 
     summary = (
         state.get("result", {})
@@ -62,37 +85,46 @@ def post_processor(state: AgentState) -> AgentState:
         validation_report["all_data_keys_in_scheme"]
         and validation_report["all_scheme_keys_in_data"]
     )
+    store_xpath_template(state, config)
     token_usage = state.get("token_usage") or get_default_token_usage()
     meta_data = state['result'].setdefault('meta_data', {})
     meta_data["is_valid_scheme"] = is_valid
     meta_data["token_usage"] = token_usage
-    output_dir = config.get("output_dir", "data")
+    finish_time = datetime.now()
+    if state.get("invoke_time"):
+        meta_data["invoke_time"] = state["invoke_time"].isoformat()
+    meta_data["finish_time"] = finish_time.isoformat()
+    if state.get("node_timings"):
+        meta_data["profile"] = state["node_timings"]
+    output_dir = config.output_dir
     os.makedirs(output_dir, exist_ok=True)
     filename = state.get("url", "output").rstrip("/").split("/")[-1] or "output"
     output_path = os.path.join(output_dir, f"{filename}.json")
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(state['result'], f, ensure_ascii=False, indent=2)
     logging_path = os.path.join(output_dir, "logging.json")
-    if os.path.exists(logging_path):
-        try:
-            with open(logging_path, "r", encoding="utf-8") as log_file:
-                logging_data = json.load(log_file) or {}
-        except json.JSONDecodeError:
+    with _logging_lock:
+        if os.path.exists(logging_path):
+            try:
+                with open(logging_path, "r", encoding="utf-8") as log_file:
+                    logging_data = json.load(log_file) or {}
+            except json.JSONDecodeError:
+                logging_data = {}
+        else:
             logging_data = {}
-    else:
-        logging_data = {}
-
-    log_key = state.get("id") or state.get("url") or filename
-    logging_data[str(log_key)] = {
-        "id": state.get("id"),
-        "url": state.get("url"),
-        "traditional_flag": state.get("traditional_flag", []),
-        "token_usage": token_usage,
-    }
 
-    with open(logging_path, "w", encoding="utf-8") as log_file:
-        json.dump(logging_data, log_file, ensure_ascii=False, indent=2)
+        log_key = state.get("id") or state.get("url") or filename
+        logging_data[str(log_key)] = {
+            "id": state.get("id"),
+            "url": state.get("url"),
+            "traditional_flag": state.get("traditional_flag", []),
+            "token_usage": token_usage,
+        }
+
+        with open(logging_path, "w", encoding="utf-8") as log_file:
+            json.dump(logging_data, log_file, ensure_ascii=False, indent=2)
     return {
+        "finish_time": finish_time,
         "result": {
             "meta_data": {
                 "is_valid_scheme": is_valid,
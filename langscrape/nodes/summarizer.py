@@ -1,11 +1,18 @@
+import asyncio
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
 
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from ..agent.state import AgentState
 from ..json import JSON_SCHEME
 from ..tags import COUNTRIES_AND_ORGANIZATIONS, FIGURES, LOCATIONS, THEME_TAGS
-from ..utils import update_token_usage
+from ..settings import run_settings
+from ..utils import update_token_usage, validate_extracts
+from ..concurrency import claim_future, llm_slot, new_run_token, park_future
+from ..llm import ainvoke_llm, invoke_llm
 
 def get_summarizer_system_prompt(state: AgentState) -> str:
     prompt_template = f"""Your task is to analyze the provided contens.
@@ -112,16 +119,125 @@ def get_pdf_summarizer_user_prompt(state: AgentState) -> str:
     """
     return prompt
 
-def summarizer(state: AgentState) -> AgentState:
-    """Invoke the summarizer model with system + user prompts."""
+def _build_messages(state: AgentState):
     get_user_prompt = (
         get_pdf_summarizer_user_prompt if state.get("url_is_pdf", False)
         else get_html_summarizer_user_prompt
     )
-    messages = [
+    return [
         SystemMessage(content=get_summarizer_system_prompt(state)),
         HumanMessage(content=get_user_prompt(state)),
     ]
-    response = state["summarizer"].invoke(messages)
-    token_usage = update_token_usage(state, "summarizer", response)
-    return {"summary": response, "token_usage": token_usage}
+
+def _stream(state: AgentState) -> bool:
+    return run_settings(state)["summarizer"].get("stream", False)
+
+# extracted fields that must validate before the summary is started early
+SPECULATIVE_FIELDS = ("title", "article_body")
+# every extracted field the summary prompt reads: a change in any of them discards the speculation
+SUMMARY_PROMPT_FIELDS = ("title", "author", "datetime", "article_body")
+# name of the parked summarizer future, see `park_future`
+SPECULATIVE_JOB = "speculative_summary"
+
+_speculative_pool = None
+_speculative_lock = threading.Lock()
+
+
+def _get_speculative_pool() -> ThreadPoolExecutor:
+    global _speculative_pool
+    with _speculative_lock:
+        if _speculative_pool is None:
+            _speculative_pool = ThreadPoolExecutor(thread_name_prefix="speculative-summary")
+        return _speculative_pool
+
+
+def _call(model, messages, stream: bool):
+    with llm_slot():
+        return invoke_llm(model, messages, stream=stream)
+
+
+async def _acall(model, messages, stream: bool):
+    async with llm_slot():
+        return await ainvoke_llm(model, messages, stream=stream)
+
+
+def _speculative_key(extracted_fields: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: extracted_fields.get(k) for k in SUMMARY_PROMPT_FIELDS}
+
+
+def start_speculative_summary(state: AgentState, extracted_fields: Dict[str, Any], use_async: bool = False) -> AgentState:
+    """
+    With ``summarizer.speculative``, start the summarizer in the background
+    as soon as ``extracted_fields`` has a title and article body that pass
+    `validate_extracts`, while the extraction loop keeps working on the
+    other fields. Started once per run; returns the state update ({} when
+    nothing was started). ``use_async`` runs it as a task on the current
+    event loop instead of a worker thread.
+    """
+    settings = run_settings(state)
+    if state.get("speculative_summary") or not settings["summarizer"].get("speculative", False):
+        return {}
+    if validate_extracts({k: extracted_fields.get(k) for k in SPECULATIVE_FIELDS}, settings):
+        return {}
+    key = _speculative_key(extracted_fields)
+    messages = _build_messages({**state, "extracted_fields": extracted_fields})
+    args = (state["summarizer"], messages, _stream(state))
+    if use_async:
+        future = asyncio.ensure_future(_acall(*args))
+    else:
+        future = _get_speculative_pool().submit(_call, *args)
+    token = state.get("run_token") or new_run_token()
+    park_future(token, SPECULATIVE_JOB, future)
+    print(f"Speculative summary started at iteration {state.get('iterations')}")
+    return {"speculative_summary": {"fields": key, "iteration": state.get("iterations")}, "run_token": token}
+
+
+def _speculative_update(state: AgentState, response, timing) -> AgentState:
+    speculative = state["speculative_summary"]
+    token_usage = update_token_usage(
+        {**state, "iterations": speculative["iteration"]}, "summarizer", response, timing,
+        node="summarizer_speculative",
+    )
+    return {"summary": response, "token_usage": token_usage, "speculative_summary": None}
+
+
+def _reusable(state: AgentState):
+    """The speculative summary's future when its prompt had the final extracted fields, else None."""
+    speculative = state.get("speculative_summary")
+    if not speculative:
+        return None
+    future = claim_future(state.get("run_token"), SPECULATIVE_JOB)
+    if future is None or speculative["fields"] == _speculative_key(state.get("extracted_fields") or {}):
+        return future
+    future.cancel()
+    print("Speculative summary discarded: an extracted field in its prompt changed")
+    return None
+
+
+def summarizer(state: AgentState) -> AgentState:
+    """Invoke the summarizer model with system + user prompts."""
+    future = _reusable(state)
+    if future is not None:
+        try:
+            return _speculative_update(state, *future.result())
+        except Exception as e:
+            print(f"Speculative summary failed: {e}")
+    messages = _build_messages(state)
+    with llm_slot():
+        response, timing = invoke_llm(state["summarizer"], messages, stream=_stream(state))
+    token_usage = update_token_usage(state, "summarizer", response, timing, node="summarizer")
+    return {"summary": response, "token_usage": token_usage, "speculative_summary": None}
+
+async def asummarizer(state: AgentState) -> AgentState:
+    """Async `summarizer` using `ainvoke`."""
+    future = _reusable(state)
+    if future is not None:
+        try:
+            return _speculative_update(state, *await future)
+        except Exception as e:
+            print(f"Speculative summary failed: {e}")
+    messages = _build_messages(state)
+    async with llm_slot():
+        response, timing = await ainvoke_llm(state["summarizer"], messages, stream=_stream(state))
+    token_usage = update_token_usage(state, "summarizer", response, timing, node="summarizer")
+    return {"summary": response, "token_usage": token_usage, "speculative_summary": None}
@@ -0,0 +1,33 @@
+from ..agent.state import AgentState
+from ..cache import get_template_store
+from ..html.xpath_extractor import extract_by_xpath_map_from_html
+from ..settings import run_settings
+from ..utils import validate_extracts
+
+
+def template_matcher(state: AgentState) -> AgentState:
+    """
+    Validate XPaths seeded from the domain's template.
+    When every field passes, the extraction loop is skipped; otherwise the
+    template is invalidated and the extractor starts from the seeded map.
+    """
+    global_state = state["global_state"]
+    seeded = [k for k, v in global_state.items() if isinstance(v, dict) and v.get("source") == "template"]
+    if not seeded:
+        return {"template_hit": False}
+
+    config = run_settings(state)
+    store = get_template_store(config)
+    extracts = extract_by_xpath_map_from_html(state["cleaned_content"], global_state)
+    failed = validate_extracts(extracts, config)
+    if not failed:
+        print(f"XPath template hit for {state['url']}")
+        if store:
+            store.record_hit(state["url"])
+        return {"template_hit": True}
+
+    if store:
+        store.invalidate(state["url"], failed)
+    for key in seeded:
+        global_state[key].pop("source", None)
+    return {"template_hit": False}
@@ -1,17 +1,17 @@
 from ..agent.state import AgentState
 import asyncio
-from ..browser.chrome import fetch_html_patchright
-from ..html.utils import clean_html_for_extraction3
+from ..browser.pipeline import afetch_page, fetch_page
+from ..browser.sniff import PDF, known_content_kind
 from ..exceptions import TooShortHtml, InvalidUrl
-from ..utils import load_config
+from ..html.page_signals import extract_page_signals
+from ..settings import as_settings, run_settings
 from urllib.parse import urlparse
-from ..browser.request import simple_url_to_html
-from ..pdf.pdf_utils import pdfurl_to_text
+from ..pdf.pdf_utils import pdfbytes_to_text, pdfurl_to_text
 
-async def fetch_url(url: str) -> str:
-    return await fetch_html_patchright(url)
-
-def apply_html_logic(html, min_len = load_config()['exceptions']['min_html_length']) -> None:
+def apply_html_logic(html, min_len: int = None, config=None) -> None:
+    """Raise TooShortHtml below ``min_len``, by default the run config's ``min_html_length``."""
+    if min_len is None:
+        min_len = as_settings(config).min_html_length
     html_len = len(html)
     if html_len < min_len:
         raise TooShortHtml(html_len)
@@ -22,25 +22,57 @@ def validate_url(url: str) -> None:
     if not parsed.scheme or not parsed.netloc:
         raise InvalidUrl(url)
 
-def _is_pdf(url):
-    return str(url).lower().endswith(".pdf")
+def _discovery_enabled(config) -> bool:
+    return (config.get("discovery", {}) or {}).get("enabled", True)
+
+def _pdf_text(url, body, config) -> str:
+    """
+    Text of a PDF a fetch stage returned, or streamed from ``url`` when it
+    did not keep the body. The extraction never holds a fetch slot.
+    """
+    if body:
+        return pdfbytes_to_text(body, normalize=True, config=config)
+    return pdfurl_to_text(url, normalize=True, config=config)
+
+async def _apdf_text(url, body, config) -> str:
+    return await asyncio.to_thread(_pdf_text, url, body, config)
 
 def url_handler(state: AgentState) -> AgentState:
     url = state["url"]
+    settings = run_settings(state)
+    validate_url(url)
+    # a .pdf suffix or an earlier verdict skips the HTML stages; otherwise the fetch response decides
+    if known_content_kind(str(url), settings) == PDF:
+        return {"cleaned_content": _pdf_text(url, None, settings), "url_is_pdf": True}
+    cleaned_html, stage, raw, kind = fetch_page(url, settings)
+    if kind == PDF:
+        return {"cleaned_content": _pdf_text(url, raw, settings), "url_is_pdf": True}
+    print(f"html len ({stage}):", len(cleaned_html))
+    signals = extract_page_signals(raw) if _discovery_enabled(settings) else {}
+    return {
+        "cleaned_content": cleaned_html,
+        "raw_content": raw,
+        "url_is_pdf": False,
+        "fetch_stage": stage,
+        "page_signals": signals,
+    }
+
+async def aurl_handler(state: AgentState) -> AgentState:
+    """Async `url_handler`: awaits the fetch stages and offloads blocking work to threads."""
+    url = state["url"]
+    settings = run_settings(state)
     validate_url(url)
-    url_is_pdf = _is_pdf(url)
-    if url_is_pdf:
-        pdf_text = pdfurl_to_text(url, normalize=True)
-        return {"cleaned_content": pdf_text, "url_is_pdf": url_is_pdf}
-    else:
-        html_content = asyncio.run(fetch_url(url))
-        cleaned_html = clean_html_for_extraction3(html_content)
-        try:
-            apply_html_logic(cleaned_html)
-        except TooShortHtml:
-            html_content = simple_url_to_html(url)
-            cleaned_html = clean_html_for_extraction3(html_content)
-            apply_html_logic(cleaned_html)
-        cleaned_html = clean_html_for_extraction3(html_content)
-        print("html len:", len(cleaned_html))
-        return {"cleaned_content": cleaned_html, "url_is_pdf": url_is_pdf}
+    if known_content_kind(str(url), settings) == PDF:
+        return {"cleaned_content": await _apdf_text(url, None, settings), "url_is_pdf": True}
+    cleaned_html, stage, raw, kind = await afetch_page(url, settings)
+    if kind == PDF:
+        return {"cleaned_content": await _apdf_text(url, raw, settings), "url_is_pdf": True}
+    print(f"html len ({stage}):", len(cleaned_html))
+    signals = await asyncio.to_thread(extract_page_signals, raw) if _discovery_enabled(settings) else {}
+    return {
+        "cleaned_content": cleaned_html,
+        "raw_content": raw,
+        "url_is_pdf": False,
+        "fetch_stage": stage,
+        "page_signals": signals,
+    }
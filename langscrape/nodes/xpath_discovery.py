@@ -0,0 +1,28 @@
+from ..agent.state import AgentState
+from ..html.xpath_discovery import discover_xpaths
+from ..html.xpath_extractor import extract_by_xpath_map_from_html
+from ..settings import run_settings
+from ..utils import validate_extracts
+
+
+def xpath_discovery(state: AgentState) -> AgentState:
+    """
+    Seed XPaths for the fields that do not validate yet from rule-based
+    candidates (page signals and common article markup), marked
+    ``source: "discovered"``. When every field then passes, the extraction
+    loop is skipped; otherwise the extractor starts from the seeded map.
+    """
+    config = run_settings(state)
+    if not (config.get("discovery", {}) or {}).get("enabled", True):
+        return {"discovery_hit": False}
+
+    global_state = state["global_state"]
+    failed = validate_extracts(extract_by_xpath_map_from_html(state["cleaned_content"], global_state), config)
+    fields = [k for k in failed if global_state[k].get("strategy", "xpath_extractor") == "xpath_extractor"]
+    found = discover_xpaths(state["cleaned_content"], fields, state.get("page_signals"), config) if fields else {}
+    for key, xpath in found.items():
+        global_state[key].update({"xpath": xpath, "source": "discovered"})
+
+    hit = set(found) == set(failed)
+    print(f"XPath discovery for {state['url']}: {len(found)}/{len(failed)} fields{' (hit)' if hit else ''}")
+    return {"discovery_hit": hit}
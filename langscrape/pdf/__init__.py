@@ -1 +1,16 @@
-from .pdf_utils import pdfurl_to_text
\ No newline at end of file
+import importlib
+
+# loaded on first access: page-extraction workers import langscrape.pdf.pages
+# and must not pull in the HTTP stack through pdf_utils
+_LAZY = {
+    "pdfurl_to_text": ".pdf_utils",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["pdfurl_to_text"]
@@ -0,0 +1,29 @@
+import re
+from typing import List
+
+
+def collapse_dots(text: str) -> str:
+    return re.sub(r"\.{2,}", ".", text)
+
+
+def text_normalizer(text: str) -> str:
+    text = collapse_dots(text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def extract_pages(path: str, start: int, stop: int, normalize: bool = True) -> List[str]:
+    """
+    Text of pages ``[start, stop)`` of the PDF at ``path``.
+    Runs in worker processes, so it opens its own document. Unpickling the
+    task imports this module and the lazy `langscrape.pdf` package only, so
+    nothing heavier than pymupdf is loaded there.
+    """
+    import pymupdf
+
+    with pymupdf.open(path) as pdf:
+        texts = []
+        for page in pdf.pages(start, min(stop, pdf.page_count)):
+            text = page.get_text()
+            texts.append(text_normalizer(text) if normalize else text)
+    return texts
@@ -1,17 +1,19 @@
-import re
-import requests
-import pymupdf
-from urllib.parse import urlparse
-from ..browser.request import simple_url_to_html
+import atexit
+import itertools
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from typing import Iterator, Optional
 
-def collapse_dots(text: str) -> str:
-    return re.sub(r"\.{2,}", ".", text)
-
-
-def text_normalizer(text: str) -> str:
-    text = collapse_dots(text)
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+from ..browser.request import simple_url_to_file
+from ..concurrency import fetch_slot
+from ..html.compaction import get_token_counter
+from ..settings import get_settings
+from .pages import extract_pages
 
 
 def get_joined_text(pdf) -> str:
@@ -19,16 +21,128 @@ def get_joined_text(pdf) -> str:
     return " ".join(texts)
 
 
-def pdfurl_to_text(url: str, normalize: bool = True) -> str:
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Process-wide page extraction pool (spawned: the parent runs browser/event-loop threads)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(_executor.shutdown, cancel_futures=True)
+        return _executor
+
+
+def iter_page_texts(
+    path: str,
+    normalize: bool = True,
+    workers: int = 4,
+    pages_per_task: int = 8,
+    parallel_min_pages: int = 32,
+) -> Iterator[str]:
     """
-    Download PDF from URL (in-memory), extract, normalize, and return text.
+    Yield page texts of the PDF at ``path`` in order.
+
+    Large documents are split into ``pages_per_task`` ranges extracted in a
+    process pool, with at most ``2 * workers`` ranges in flight, so closing
+    the generator early (a budget was reached) cancels the rest.
+    """
+    import pymupdf
+
+    with pymupdf.open(path) as pdf:
+        page_count = pdf.page_count
+    ranges = ((start, start + pages_per_task) for start in range(0, page_count, pages_per_task))
+
+    if workers <= 1 or page_count < parallel_min_pages:
+        for start, stop in ranges:
+            yield from extract_pages(path, start, stop, normalize)
+        return
+
+    executor = _get_executor(workers)
+    pending = deque(
+        executor.submit(extract_pages, path, start, stop, normalize)
+        for start, stop in itertools.islice(ranges, 2 * workers)
+    )
+    try:
+        while pending:
+            texts = pending.popleft().result()
+            for start, stop in itertools.islice(ranges, 1):
+                pending.append(executor.submit(extract_pages, path, start, stop, normalize))
+            yield from texts
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def pdf_to_text(
+    path: str,
+    normalize: bool = True,
+    max_chars: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+    **pool_kwargs,
+) -> str:
+    """
+    Extract (and normalize, page by page) the text of a PDF file, stopping
+    once ``max_chars`` characters or ``max_tokens`` tokens were collected.
+    """
+    counter = get_token_counter() if max_tokens else None
+    parts = []
+    chars = tokens = 0
+    with closing(iter_page_texts(path, normalize, **pool_kwargs)) as pages:
+        for text in pages:
+            if normalize and not text:
+                continue
+            parts.append(text)
+            chars += len(text) + 1
+            if counter is not None:
+                tokens += counter.count(text)
+            if (max_chars and chars >= max_chars) or (max_tokens and tokens >= max_tokens):
+                print(f"PDF text budget reached after {len(parts)} pages")
+                break
+    text = " ".join(parts)
+    return text[:max_chars] if max_chars else text
+
+
+def _pdf_file_to_text(path: str, normalize: bool, config: dict = None) -> str:
+    settings = (config or get_settings()).get("pdf", {}) or {}
+    return pdf_to_text(
+        path,
+        normalize=normalize,
+        max_chars=settings.get("max_chars"),
+        max_tokens=settings.get("max_tokens"),
+        workers=settings.get("workers", 4),
+        pages_per_task=settings.get("pages_per_task", 8),
+        parallel_min_pages=settings.get("parallel_min_pages", 32),
+    )
+
+
+def pdfurl_to_text(url: str, normalize: bool = True, config: dict = None) -> str:
+    """
+    Download a PDF to a temporary file, extract, normalize, and return text.
+
+    The download is streamed to disk and pymupdf reads pages from the file,
+    so the document is never held in memory as a whole; see ``pdf`` in the
+    config for the text budget and page-extraction pool. Only the download
+    holds a `fetch_slot`.
     """
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        with fetch_slot():
+            simple_url_to_file(url, path)
+        return _pdf_file_to_text(path, normalize, config)
+    finally:
+        os.remove(path)
 
-    content = simple_url_to_html(url)
-    # open directly from bytes
-    pdf = pymupdf.open(stream=content, filetype="pdf")
 
-    text = get_joined_text(pdf)
-    if normalize:
-        return text_normalizer(text)
-    return text
+def pdfbytes_to_text(data: bytes, normalize: bool = True, config: dict = None) -> str:
+    """`pdfurl_to_text` for a document a fetch stage already downloaded."""
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return _pdf_file_to_text(path, normalize, config)
+    finally:
+        os.remove(path)
@@ -0,0 +1,177 @@
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from langchain_core.runnables import Runnable, RunnableConfig
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS, KB on Linux
+
+
+def _html_chars(state: Dict[str, Any], update: Any) -> int:
+    if isinstance(update, dict) and update.get("cleaned_content"):
+        return len(update["cleaned_content"])
+    return len(state.get("cleaned_content") or "")
+
+
+def trace_id(state: Dict[str, Any], invoke_time: datetime) -> str:
+    """Stable id for one graph run, derived from its id, URL and invoke time."""
+    stamp = invoke_time.isoformat() if isinstance(invoke_time, datetime) else str(invoke_time)
+    return hashlib.sha256(f"{state.get('id')}|{state.get('url')}|{stamp}".encode("utf-8")).hexdigest()[:32]
+
+
+class TraceWriter:
+    """
+    Appends one OpenTelemetry-style span per node run to a JSONL file, for
+    offline flame graphs; optionally mirrors the spans to an OpenTelemetry
+    tracer when ``opentelemetry`` is installed.
+    """
+
+    def __init__(self, path: Optional[str] = None, otel: bool = False):
+        self.path = path
+        self._lock = threading.Lock()
+        self._tracer = None
+        if otel:
+            try:
+                from opentelemetry import trace
+
+                self._tracer = trace.get_tracer("langscrape")
+            except ImportError:
+                print("profiling.otel is set but opentelemetry is not installed; writing JSONL only")
+        if path and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def emit(self, span: Dict[str, Any]) -> None:
+        if self._tracer is not None:
+            otel_span = self._tracer.start_span(
+                span["name"], start_time=span["start_time_unix_nano"], attributes=span["attributes"]
+            )
+            otel_span.end(end_time=span["end_time_unix_nano"])
+        if self.path:
+            with self._lock:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(span, ensure_ascii=False, default=str) + "\n")
+
+
+class _Probe:
+    """Measures one node run: wall time, CPU time of the running thread, peak RSS growth."""
+
+    def __init__(self, name: str, state: Dict[str, Any]):
+        self.name = name
+        self.state = state
+        # the first node of a run without ``invoke_time`` sets it
+        self.invoke_time = state.get("invoke_time") or datetime.now()
+        self.start_ns = time.time_ns()
+        self.wall = time.perf_counter()
+        self.cpu = time.thread_time()
+        self.rss = _peak_rss_kb()
+
+    def finish(self, update: Any, writer: Optional[TraceWriter], error: BaseException = None) -> Dict[str, Any]:
+        rss = _peak_rss_kb()
+        record = {
+            "node": self.name,
+            "iteration": self.state.get("iterations"),
+            "wall_s": round(time.perf_counter() - self.wall, 4),
+            "cpu_s": round(time.thread_time() - self.cpu, 4),
+            "rss_peak_delta_kb": rss - self.rss if rss is not None and self.rss is not None else None,
+            "html_chars": _html_chars(self.state, update),
+        }
+        if writer is not None:
+            writer.emit({
+                "trace_id": trace_id(self.state, self.invoke_time),
+                "span_id": os.urandom(8).hex(),
+                "name": self.name,
+                "start_time_unix_nano": self.start_ns,
+                "end_time_unix_nano": time.time_ns(),
+                "status": "ERROR" if error is not None else "OK",
+                "attributes": {
+                    "langscrape.id": str(self.state.get("id")),
+                    "langscrape.url": self.state.get("url"),
+                    **{f"langscrape.{key}": value for key, value in record.items() if key != "node"},
+                    **({"exception.message": str(error)} if error is not None else {}),
+                },
+            })
+        return record
+
+
+def _with_record(probe: _Probe, update: Any, record: Dict[str, Any]) -> Any:
+    if not isinstance(update, dict):
+        return update
+    update = {**update, "node_timings": [record]}
+    if not probe.state.get("invoke_time"):
+        update["invoke_time"] = probe.invoke_time
+    return update
+
+
+def instrument_node(name: str, node: Any, use_async: bool = False, writer: Optional[TraceWriter] = None) -> Callable:
+    """
+    Wrap a graph node so each run appends a timing record to
+    ``state["node_timings"]`` (and a span to ``writer``). Works for plain
+    functions, coroutine functions and runnables such as `ToolNode`.
+    """
+
+    def run_sync(call: Callable[[], Any], state: Dict[str, Any]) -> Any:
+        probe = _Probe(name, state)
+        try:
+            update = call()
+        except BaseException as e:
+            probe.finish(None, writer, e)
+            raise
+        return _with_record(probe, update, probe.finish(update, writer))
+
+    async def run_async(call: Callable[[], Any], state: Dict[str, Any]) -> Any:
+        probe = _Probe(name, state)
+        try:
+            update = await call()
+        except BaseException as e:
+            probe.finish(None, writer, e)
+            raise
+        return _with_record(probe, update, probe.finish(update, writer))
+
+    if isinstance(node, Runnable):
+        if use_async:
+            async def wrapper(state, config: RunnableConfig):
+                return await run_async(lambda: node.ainvoke(state, config), state)
+        else:
+            def wrapper(state, config: RunnableConfig):
+                return run_sync(lambda: node.invoke(state, config), state)
+    elif inspect.iscoroutinefunction(node):
+        async def wrapper(state):
+            return await run_async(lambda: node(state), state)
+    else:
+        def wrapper(state):
+            return run_sync(lambda: node(state), state)
+
+    wrapper.__name__ = getattr(node, "__name__", name)
+    return wrapper
+
+
+_writers: Dict[tuple, TraceWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_trace_writer(config: dict) -> Optional[TraceWriter]:
+    """Process-wide writer for ``profiling.trace_path``/``profiling.otel``, or None."""
+    settings = config.get("profiling", {}) or {}
+    key = (settings.get("trace_path"), bool(settings.get("otel", False)))
+    if not any(key):
+        return None
+    with _writers_lock:
+        if key not in _writers:
+            _writers[key] = TraceWriter(*key)
+        return _writers[key]
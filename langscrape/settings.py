@@ -0,0 +1,218 @@
+import os
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Optional
+
+import yaml
+
+from .exceptions import ConfigError
+
+DEFAULT_CONFIG_PATH = "config/default_config.yaml"
+
+# (section, key) -> type; key None checks the section itself
+REQUIRED = {
+    ("extractor", "provider"): str,
+    ("extractor", "name"): str,
+    ("extractor", "max_iters"): int,
+    ("summarizer", "provider"): str,
+    ("summarizer", "name"): str,
+    ("fields", None): Mapping,
+}
+OPTIONAL = {
+    ("api_keys", None): str,
+    ("output_dir", None): str,
+    ("extractor", "temperature"): (int, float),
+    ("extractor", "prompt_layout"): str,
+    ("extractor", "stream"): bool,
+    ("summarizer", "temperature"): (int, float),
+    ("summarizer", "stream"): bool,
+    ("summarizer", "speculative"): bool,
+    ("exceptions", "min_html_length"): int,
+    ("warnings", "min_article_body"): int,
+    ("fallback", "concurrent"): bool,
+    ("fallback", "workers"): int,
+    ("discovery", "enabled"): bool,
+    **{
+        (section, None): Mapping
+        for section in (
+            "browser", "exceptions", "warnings", "fallback", "fetch", "http", "fetch_cache",
+            "pdf", "templates", "discovery", "compaction", "profiling", "batch",
+        )
+    },
+}
+
+
+def config_path(path: str = None) -> str:
+    """``path``, else $LANGSCRAPE_CONFIG, else the default config path."""
+    return path or os.environ.get("LANGSCRAPE_CONFIG", DEFAULT_CONFIG_PATH)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _merge(base: Dict[str, Any], overrides: Mapping) -> Dict[str, Any]:
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, Mapping) and isinstance(merged.get(key), Mapping):
+            merged[key] = _merge(dict(merged[key]), value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _lookup(data: Mapping, section: str, key: Optional[str]):
+    if section not in data:
+        return False, None
+    value = data[section]
+    if key is None:
+        return True, value
+    if not isinstance(value, Mapping) or key not in value:
+        return False, None
+    return True, value[key]
+
+
+def validate(data: Any, path: str = None) -> None:
+    """Raise `ConfigError` for missing required keys or values of the wrong type."""
+    if not isinstance(data, Mapping):
+        raise ConfigError(path, "expected a mapping at the top level")
+    for required, schema in ((True, REQUIRED), (False, OPTIONAL)):
+        for (section, key), expected in schema.items():
+            name = section if key is None else f"{section}.{key}"
+            found, value = _lookup(data, section, key)
+            if not found:
+                if required:
+                    raise ConfigError(path, f"missing {name}")
+                continue
+            if value is None and not required:
+                continue
+            # bool is an int, but a flag is never a valid count
+            if not isinstance(value, expected) or (isinstance(value, bool) and expected is int):
+                raise ConfigError(path, f"{name} should be {getattr(expected, '__name__', expected)}, got {value!r}")
+
+
+class Settings(Mapping):
+    """
+    A parsed and validated config that cannot be modified.
+
+    Reads like the dict from `load_config` (``settings["extractor"]["name"]``,
+    ``settings.get("fetch", {})``). Sections are read-only mappings and lists
+    are tuples, so one instance can be shared by concurrent runs. Use
+    `with_overrides` for a per-run variant and `to_dict` for a mutable copy.
+    """
+
+    __slots__ = ("path", "_data")
+
+    def __init__(self, data: Mapping, path: str = None):
+        validate(data, path)
+        object.__setattr__(self, "path", path)
+        object.__setattr__(self, "_data", _freeze(data))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Settings are read-only; use with_overrides()")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"Settings({self.path!r})"
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return Settings, (self.to_dict(), self.path)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return _thaw(self._data)
+
+    def with_overrides(self, overrides: Mapping) -> "Settings":
+        """A copy with ``overrides`` merged in section by section."""
+        return Settings(_merge(self.to_dict(), overrides), self.path)
+
+    @property
+    def max_iters(self) -> int:
+        return self._data["extractor"]["max_iters"]
+
+    @property
+    def min_html_length(self) -> int:
+        return self._data.get("exceptions", {}).get("min_html_length", 3000)
+
+    @property
+    def min_article_body(self) -> int:
+        return self._data.get("warnings", {}).get("min_article_body", 100)
+
+    @property
+    def output_dir(self) -> str:
+        return self._data.get("output_dir", "data")
+
+
+_settings: Dict[str, Settings] = {}
+_settings_lock = threading.Lock()
+
+
+def read_settings(path: str = None) -> Settings:
+    """Parse and validate the YAML at ``path`` without touching the cache."""
+    path = config_path(path)
+    with open(Path(path), "r", encoding="utf-8") as f:
+        return Settings(yaml.safe_load(f), path)
+
+
+def get_settings(path: str = None) -> Settings:
+    """
+    Process-wide `Settings` for ``path`` (default: $LANGSCRAPE_CONFIG or
+    the default config), read from disk once. See `reload_settings`.
+    """
+    key = os.path.abspath(config_path(path))
+    settings = _settings.get(key)
+    if settings is None:
+        with _settings_lock:
+            settings = _settings.get(key)
+            if settings is None:
+                settings = _settings[key] = read_settings(path)
+    return settings
+
+
+def reload_settings(path: str = None) -> Settings:
+    """Re-read ``path`` and replace its cached `Settings`."""
+    settings = read_settings(path)
+    with _settings_lock:
+        _settings[os.path.abspath(config_path(path))] = settings
+    return settings
+
+
+def as_settings(config: Optional[Mapping] = None) -> Settings:
+    """`Settings` for ``config``: the cached default for None, validated for a plain dict."""
+    if config is None:
+        return get_settings()
+    if isinstance(config, Settings):
+        return config
+    return Settings(config)
+
+
+def run_settings(state: Mapping) -> Settings:
+    """The settings of one graph run, threaded through ``state["settings"]``."""
+    return as_settings(state.get("settings"))
@@ -1,46 +1,67 @@
 import json
 import os
 from copy import deepcopy
-from pathlib import Path
-from typing import Any, Dict
-import yaml
-from langchain_deepseek import ChatDeepSeek
-from langchain_core.messages import SystemMessage
-from langchain_openai import ChatOpenAI
+from typing import Any, Dict, List
+from langchain_core.messages import HumanMessage, SystemMessage
 from .html.xpath_extractor import extract_by_xpath_map_from_html
+from .cache import get_template_store
+from .settings import get_settings
+# re-exported: callers such as benchmarks.bench_pipeline import it from here
+from .settings import DEFAULT_CONFIG_PATH  # noqa: F401
+
+AGENT_USAGE_TEMPLATE = {
+    "input_tokens": 0,
+    "output_tokens": 0,
+    "cached_input_tokens": 0,
+    "reasoning_tokens": 0,
+    "calls": 0,
+    "latency_s": 0.0,
+    "ttft_s": 0.0,
+}
 
+# per-agent totals, plus one record per LLM call under "calls"
 TOKEN_USAGE_TEMPLATE = {
-    "extractor": {"input_tokens": 0, "output_tokens": 0},
-    "summarizer": {"input_tokens": 0, "output_tokens": 0},
+    "extractor": dict(AGENT_USAGE_TEMPLATE),
+    "summarizer": dict(AGENT_USAGE_TEMPLATE),
+    "calls": [],
 }
 
-def load_config(path: str = "config/default_config.yaml") -> dict:
+def load_config(path: str = None) -> dict:
     """
-    Load YAML config into a Python dict.
+    Return the config as a mutable Python dict.
+    Falls back to $LANGSCRAPE_CONFIG, then to the default config path.
+    The file is parsed once per process (see `langscrape.settings`); this
+    returns a fresh copy, so hot paths should use `get_settings` instead.
     """
-    with open(Path(path), "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    return get_settings(path).to_dict()
     
 def get_extractor(config=None):
     if config is None:
-        config = load_config()
+        config = get_settings()
 
+    # provider packages are imported on first use, they are slow to load
     if config["extractor"]["provider"] == "openai":
+        from langchain_openai import ChatOpenAI
+
         api_key = os.getenv("OPENAI_API_KEY")
         return ChatOpenAI(
             model=config["extractor"]["name"],
             temperature=config["extractor"]["temperature"],
             top_p=config["extractor"]["top_p"],
             timeout = config['extractor']['time_out'],
+            stream_usage=True,
             api_key=api_key
         )
     elif config["extractor"]["provider"] == "deepseek":
+        from langchain_deepseek import ChatDeepSeek
+
         api_key = os.getenv("DS_API_KEY")
         return ChatDeepSeek(
             model=config["extractor"]["name"],
             temperature=config["extractor"]["temperature"],
             top_p=config["extractor"]["top_p"],
             timeout = config['extractor']['time_out'],
+            stream_usage=True,
             api_key=api_key
         )
     else:
@@ -48,29 +69,35 @@ def get_extractor(config=None):
 
 def get_summarizer(config=None):
     if config is None:
-        config = load_config()
+        config = get_settings()
 
     if config["summarizer"]["provider"] == "openai":
+        from langchain_openai import ChatOpenAI
+
         api_key = os.getenv("OPENAI_API_KEY")
         return ChatOpenAI(
             model=config["summarizer"]["name"],
             temperature=config["summarizer"]["temperature"],
             top_p=config["summarizer"]["top_p"],
+            stream_usage=True,
             api_key=api_key
         )
     elif config["summarizer"]["provider"] == "deepseek":
+        from langchain_deepseek import ChatDeepSeek
+
         api_key = os.getenv("DS_API_KEY")
         return ChatDeepSeek(
             model=config["summarizer"]["name"],
             temperature=config["summarizer"]["temperature"],
             top_p=config["summarizer"]["top_p"],
+            stream_usage=True,
             api_key=api_key
         )
     else:
         raise NameError(f"{config['summarizer']['type']} is not supported.")
 
 
-def get_default_token_usage() -> Dict[str, Dict[str, int]]:
+def get_default_token_usage() -> Dict[str, Any]:
     """Return a fresh token usage template for extractor and summarizer."""
 
     return deepcopy(TOKEN_USAGE_TEMPLATE)
@@ -97,30 +124,86 @@ def _extract_usage_dict(message: Any) -> Dict[str, int]:
         or usage.get("completion_tokens_total")
         or 0
     )
+    # prompt tokens served from the provider's prefix cache
+    cached_input_tokens = (
+        (usage.get("input_token_details") or {}).get("cache_read")
+        or (usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+        or usage.get("prompt_cache_hit_tokens")
+        or 0
+    )
+    reasoning_tokens = (
+        (usage.get("output_token_details") or {}).get("reasoning")
+        or (usage.get("completion_tokens_details") or {}).get("reasoning_tokens")
+        or 0
+    )
 
     return {
         "input_tokens": int(input_tokens or 0),
         "output_tokens": int(output_tokens or 0),
+        "cached_input_tokens": int(cached_input_tokens or 0),
+        "reasoning_tokens": int(reasoning_tokens or 0),
     }
 
 
-def update_token_usage(state: Dict[str, Any], agent: str, message: Any) -> Dict[str, Dict[str, int]]:
-    """Accumulate token usage for a given agent from an LLM message."""
+def update_token_usage(
+    state: Dict[str, Any],
+    agent: str,
+    message: Any,
+    timing: Dict[str, Any] = None,
+    node: str = None,
+) -> Dict[str, Any]:
+    """
+    Accumulate token usage (and ``timing`` from `langscrape.llm.invoke_llm`)
+    for a given agent from an LLM message, and append a per-call record
+    tagged with ``node`` and the current iteration.
+    """
 
     current_usage = state.get("token_usage") or get_default_token_usage()
     usage = deepcopy(current_usage)
     agent_usage = usage.setdefault(agent, {"input_tokens": 0, "output_tokens": 0})
 
     message_usage = _extract_usage_dict(message)
-    agent_usage["input_tokens"] += message_usage.get("input_tokens", 0)
-    agent_usage["output_tokens"] += message_usage.get("output_tokens", 0)
+    for key, value in message_usage.items():
+        agent_usage[key] = agent_usage.get(key, 0) + value
+    agent_usage["calls"] = agent_usage.get("calls", 0) + 1
+    timing = timing or {}
+    for key in ("latency_s", "ttft_s"):
+        if timing.get(key) is not None:
+            agent_usage[key] = round(agent_usage.get(key, 0.0) + timing[key], 3)
 
     usage[agent] = agent_usage
+    usage.setdefault("calls", []).append({
+        "node": node or agent,
+        "iteration": state.get("iterations"),
+        **message_usage,
+        "latency_s": timing.get("latency_s"),
+        "ttft_s": timing.get("ttft_s"),
+    })
     return usage
 
-def initialize_global_state(config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+
+def summarize_token_usage(usages) -> Dict[str, Dict[str, float]]:
+    """Sum the per-agent totals of many runs' ``token_usage`` (e.g. a batch)."""
+    totals: Dict[str, Dict[str, float]] = {}
+    for usage in usages:
+        for agent, agent_usage in (usage or {}).items():
+            if not isinstance(agent_usage, dict):
+                continue
+            agent_totals = totals.setdefault(agent, {})
+            for key, value in agent_usage.items():
+                agent_totals[key] = round(agent_totals.get(key, 0) + value, 3)
+    return totals
+
+def initialize_global_state(config: Dict[str, Any], url: str = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Build the per-run field state from config.
+    With ``url``, XPaths cached for its domain (see `langscrape.cache`) are
+    seeded and marked ``source: "template"`` so the graph validates them first.
+    """
     field_definitions = config.get("fields", {}) or {}
     global_state: Dict[str, Dict[str, Any]] = {}
+    store = get_template_store(config) if url else None
+    template = store.lookup(url) if store else None
 
     for field, spec in field_definitions.items():
         spec = spec or {}
@@ -129,6 +212,9 @@ def initialize_global_state(config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]
         if strategy == "xpath_extractor":
             if "xpath" in spec:
                 entry["xpath"] = spec["xpath"]
+            elif template and template.get(field):
+                entry["xpath"] = template[field]
+                entry["source"] = "template"
         else:
             entry["value"] = []
         global_state[field] = entry
@@ -156,10 +242,7 @@ def _format_xpath_snapshot(global_state: Dict[str, Dict[str, Any]]) -> str:
     return json.dumps(snapshot, ensure_ascii=False, indent=2)
 
 
-def get_system_prompt(state, formatted_extracts, iters):
-    if iters == 1:
-        return SystemMessage(
-            content=f"""You are a ReAct-style HTML extraction agent.
+EXTRACTOR_INSTRUCTIONS = """You are a ReAct-style HTML extraction agent.
 
     GOAL:
     Ensure each field has the correct extracted TEXT from the HTML.
@@ -191,7 +274,13 @@ def get_system_prompt(state, formatted_extracts, iters):
 
     Example:
     ✅ //section[contains(@class, 'article-body')]//p/text()
-    ❌ /html/body/main/article/section/article-details-body-container/article-body
+    ❌ /html/body/main/article/section/article-details-body-container/article-body"""
+
+
+def get_system_prompt(state, formatted_extracts, iters):
+    if iters == 1:
+        return SystemMessage(
+            content=f"""{EXTRACTOR_INSTRUCTIONS}
 
     CURRENT XPATH MAP:
     {_format_xpath_snapshot(state['global_state'])}
@@ -203,7 +292,7 @@ def get_system_prompt(state, formatted_extracts, iters):
     {formatted_extracts}
 
     HTML:
-    {state['cleaned_content']}
+    {state.get('compacted_content') or state['cleaned_content']}
     """
         )
     else:
@@ -228,6 +317,36 @@ def get_system_prompt(state, formatted_extracts, iters):
     USE THE PROVIDED HTML ABOVE.""")
 
 
+def get_prefix_prompt(state) -> SystemMessage:
+    """
+    System message for the ``prefix_cache`` prompt layout.
+
+    Holds only what stays the same for the whole run (instructions, field
+    strategies, HTML), so every extractor call shares it byte for byte and
+    providers can serve it from their prompt cache.
+    """
+    return SystemMessage(content=f"""{EXTRACTOR_INSTRUCTIONS}
+
+    FIELD STRATEGIES:
+    {_format_field_strategies(state['global_state'])}
+
+    HTML:
+    {state.get('compacted_content') or state['cleaned_content']}
+    """)
+
+
+def get_state_message(state, formatted_extracts, iters) -> HumanMessage:
+    """Per-iteration state for the ``prefix_cache`` layout, sent after the history."""
+    return HumanMessage(content=f"""ITERATION {iters}
+
+    CURRENT XPATH MAP:
+    {_format_xpath_snapshot(state['global_state'])}
+
+    CURRENT EXTRACTIONS SUMMARY:
+    {formatted_extracts}
+    """)
+
+
 def get_formatted_extracts(current_extracts):
     lines = []
     for key, vals in current_extracts.items():
@@ -246,6 +365,38 @@ def get_formatted_extracts(current_extracts):
     return "\n".join(lines)
 
 
+PLACEHOLDER_EXTRACTS = {"Skipped: No XPath", "(Empty Result)", "(No stored value)"}
+
+
+def validate_extracts(current_extracts, config=None) -> List[str]:
+    """
+    Return the fields whose extraction fails the same checks the extractor
+    prompt asks for (non-empty, long article body, short author, datetime
+    with a digit). An empty list means every field passes.
+    """
+    if config is None:
+        config = get_settings()
+    min_article_body = config.get("warnings", {}).get("min_article_body", 100)
+    failed = []
+    for key, vals in current_extracts.items():
+        vals = [str(v).strip() for v in (vals or []) if str(v).strip()]
+        vals = [v for v in vals if v not in PLACEHOLDER_EXTRACTS and not v.startswith("Error:")]
+        joined = " ".join(vals)
+        if not joined:
+            ok = False
+        elif key == "article_body":
+            ok = len(joined) >= min_article_body
+        elif key == "author":
+            ok = all(len(v.split()) <= 6 for v in vals)
+        elif key == "datetime":
+            ok = any(c.isdigit() for c in joined)
+        else:
+            ok = True
+        if not ok:
+            failed.append(key)
+    return failed
+
+
 def final_print(global_state, html_content):
 
     # 🎨 ANSI color codes
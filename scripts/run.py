@@ -1,100 +1,52 @@
-from langscrape.agent.graph import get_graph
-from langscrape.agent.tools import make_store_xpath, make_store_value
-from langscrape.utils import load_config, initialize_global_state, get_extractor, get_summarizer
-from dotenv import load_dotenv
+import argparse
+import asyncio
 import os
-import pandas as pd
-import json
-from datetime import datetime
 import time
 
-# def start_sound():
-#     os.system('afplay /System/Library/Sounds/Blow.aiff')
 
-# def end_sound():
-#     os.system('afplay /System/Library/Sounds/Bottle.aiff')
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run langscrape over a table of URLs.")
+    parser.add_argument("table", help="Input .xlsx/.csv with url and ID columns")
+    parser.add_argument("--config", help="Path to a YAML config (default: config/default_config.yaml)")
+    parser.add_argument("--url-column", default="url")
+    parser.add_argument("--id-column", default="ID")
+    parser.add_argument("--workers", type=int, help="Graphs in flight at once")
+    parser.add_argument("--fetch-concurrency", type=int, help="Max concurrent browser/HTTP fetches")
+    parser.add_argument("--llm-concurrency", type=int, help="Max concurrent LLM calls")
+    parser.add_argument("--status", help="Per-URL status journal (JSONL) used for resuming")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore an existing status journal")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Drive every graph from one event loop instead of a thread pool")
+    parser.add_argument("--offline", action="store_true",
+                        help="Replay pages from the fetch cache only; never touch the network")
+    return parser.parse_args()
 
-# def add_sound(func):
-#     def wrapper(*args, **kwargs):
-#         start_sound()
-#         try:
-#             return func(*args, **kwargs)
-#         finally:
-#             end_sound()
-#     return wrapper
-
-# @add_sound
-def extract(url: str, id: str):
-    config = load_config()
-    load_dotenv(config["api_keys"])
-    global_state = initialize_global_state(config)
-    store_xpath = make_store_xpath(global_state)
-    store_field_value = make_store_value(global_state)
-    tools = [store_xpath, store_field_value]
-    graph = get_graph(tools=tools)
-    extractor = get_extractor(config)
-    extractor_with_tools = extractor.bind_tools(tools, parallel_tool_calls=config["extractor"]["allow_parallel_tool_calls"])
-    summarizer = get_summarizer(config)
-    initial_state = {
-        "messages": [],
-        "url": url,
-        "global_state": global_state,  
-        "extractor": extractor_with_tools,
-        "summarizer": summarizer,
-        "iterations": 1,
-        "id": id
-    }
-    response = graph.invoke(initial_state)
-    return response
 
 if __name__ == "__main__":
-    global_start = time.perf_counter()
-    config = load_config()
-    df = pd.read_excel("/Users/delmedigo/Dev/langtest/langscrape/data/production_21_10_2025/real_links_21_10_25.xlsx")
-    urls = df.url.tolist()
-    ids = df.ID.tolist()
-    log_path = "log.json"
-
-    # initialize log file if not exists
-    if not os.path.exists(log_path):
-        with open(log_path, "w", encoding="utf-8") as f:
-            json.dump({}, f, ensure_ascii=False, indent=2)
+    args = parse_args()
+    if args.config:
+        # set before importing langscrape, which reads the config at import time
+        os.environ["LANGSCRAPE_CONFIG"] = args.config
+    if args.offline:
+        os.environ["LANGSCRAPE_OFFLINE"] = "1"
 
-    for idx, (url, id) in enumerate(zip(urls, ids)):
-        start = datetime.now()
-        print(f"[{idx+1} / {len(urls)}]")
-        print(f"working on {url.split('/')[-1]} from {url} ...")
-        try:
-            extraction = extract(url, id)
-            end = datetime.now()
-            entry = {
-                "url": url,
-                "result": "success",
-                "error": None,
-                "token_usage": extraction.get("token_usage", {}),
-                "traditional_flag": extraction.get("traditional_flag", []),
-                "time": (end-start).seconds,
-                "config": config
-            }
-            data = extraction.get("result", {})
-        except Exception as e:
-            print(f"failed with {url}: {e}")
-            entry = {
-                "url": url,
-                "result": "failure",
-                "error": str(e),
-                "token_usage": None,
-                "time": None,
-                "config": config
-            }
+    from langscrape.batch import load_table, run_batch, arun_batch
+    from langscrape.utils import load_config
 
-        # 🔹 Live logging per ID
-        with open(log_path, "r", encoding="utf-8") as f:
-            existing_results = json.load(f)
-
-        existing_results[str(id)] = entry
-
-        with open(log_path, "w", encoding="utf-8") as f:
-            json.dump(existing_results, f, ensure_ascii=False, indent=2)
+    global_start = time.perf_counter()
+    rows = load_table(args.table, url_column=args.url_column, id_column=args.id_column)
+    batch_kwargs = dict(
+        config=load_config(),
+        workers=args.workers,
+        fetch_concurrency=args.fetch_concurrency,
+        llm_concurrency=args.llm_concurrency,
+        status_path=args.status,
+        resume=not args.no_resume,
+    )
+    if args.use_async:
+        counts = asyncio.run(arun_batch(rows, **batch_kwargs))
+    else:
+        counts = run_batch(rows, **batch_kwargs)
     global_end = time.perf_counter()
-    print(f"Running took {global_end-global_start:.3} seconds")
\ No newline at end of file
+    print(counts)
+    print(f"Running took {global_end-global_start:.3} seconds")
@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+
+from langscrape.batch import BatchStatus
+from langscrape.concurrency import Limiter
+
+
+def test_status_journal_resume(tmp_path):
+    path = str(tmp_path / "status.jsonl")
+    status = BatchStatus(path)
+    status.record("1", {"url": "https://a.example/1", "result": "running"})
+    status.record("1", {"url": "https://a.example/1", "result": "success"})
+    status.record("2", {"url": "https://a.example/2", "result": "running"})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"id": "3", "res')  # torn write from a crash
+
+    resumed = BatchStatus(path)
+    assert resumed.is_done("1")
+    assert not resumed.is_done("2")
+    assert not resumed.is_done("3")
+    assert resumed.counts() == {"success": 1, "running": 1}
+
+    # the entry written after the torn line survives the next resume
+    resumed.record("3", {"url": "https://a.example/3", "result": "success"})
+    assert BatchStatus(path).is_done("3")
+
+
+def test_limiter_bounds_threads_and_coroutines():
+    limiter = Limiter(2)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with limiter:
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(peak) == 2
+
+    async def awork():
+        async with limiter:
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.02)
+            active.pop()
+
+    async def main():
+        await asyncio.gather(*(awork() for _ in range(6)))
+
+    peak.clear()
+    asyncio.run(main())
+    assert max(peak) == 2
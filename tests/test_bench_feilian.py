@@ -0,0 +1,25 @@
+from benchmarks.bench_feilian import FUNCTIONS, make_listing, measure, regressions
+
+
+def test_every_function_runs_on_a_small_listing():
+    html = make_listing(0.01)
+    assert len(html) >= 0.01 * 1024 * 1024
+    for name, (setup, func) in FUNCTIONS.items():
+        result = measure(setup, func, html, repeat=1)
+        assert result["best_s"] >= 0, name
+        assert result["alloc_blocks"] >= 0, name
+
+
+def test_regressions_flags_only_slower_cases():
+    previous = {"commit": "abc123", "results": [
+        {"function": "etree.clean_html", "dom": "listing 1MB", "best_s": 0.10},
+        {"function": "soup.clean_html", "dom": "listing 1MB", "best_s": 0.10},
+    ]}
+    results = [
+        {"function": "etree.clean_html", "dom": "listing 1MB", "best_s": 0.11},
+        {"function": "soup.clean_html", "dom": "listing 1MB", "best_s": 0.15},
+        {"function": "etree.get_xpath", "dom": "listing 1MB", "best_s": 9.0},
+    ]
+    slower = regressions(previous, results, threshold=0.2)
+    assert len(slower) == 1
+    assert slower[0].startswith("soup.clean_html on listing 1MB") and "abc123" in slower[0]
@@ -0,0 +1,34 @@
+import json
+
+from benchmarks.bench_pipeline import ScriptedChatModel, load_manifest, percentile, run_benchmark, FIXTURES_DIR
+from langscrape.browser import pipeline, sniff
+from langscrape.cache import fetch_cache
+
+
+def test_offline_pipeline_end_to_end(tmp_path, monkeypatch):
+    # run_benchmark points LANGSCRAPE_CONFIG at its own config and installs process-wide caches
+    monkeypatch.setenv("LANGSCRAPE_CONFIG", "config/default_config.yaml")
+    monkeypatch.setattr(fetch_cache, "_cache", None)
+    monkeypatch.setattr(pipeline, "_history", None)
+    monkeypatch.setattr(sniff, "_content_types", None)
+
+    report = run_benchmark(rounds=1, workdir=str(tmp_path))
+
+    pages = load_manifest(FIXTURES_DIR)
+    assert report["results"] == {"success": len(pages)}
+    assert report["nodes"]["url_handler"]["count"] == len(pages)
+    # one scripted tool turn, then a final answer, for every HTML page
+    html_pages = sum(not p["file"].endswith(".pdf") for p in pages)
+    assert report["nodes"]["extraction_reasoner"]["count"] == 2 * html_pages
+    with open(tmp_path / "out" / "water-supply-restored.json", encoding="utf-8") as f:
+        result = json.load(f)
+    assert result["extraction"]["author"] == ["Dana Levi"]
+    assert [p["node"] for p in result["meta_data"]["profile"]][:2] == ["url_handler", "template_matcher"]
+
+
+def test_scripted_model_and_percentiles():
+    model = ScriptedChatModel(pages=[{"marker": "Hello", "xpaths": {"title": "//h1/text()"}}])
+    first = model.invoke("Hello page")
+    assert first.tool_calls[0]["args"] == {"key": "title", "xpath": "//h1/text()"}
+    assert not model.invoke(["Hello page", first]).tool_calls
+    assert percentile([1, 2, 3, 4], 50) == 2 and percentile([1, 2, 3, 4], 99) == 4
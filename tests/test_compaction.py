@@ -0,0 +1,35 @@
+from lxml import etree
+
+from langscrape.html.compaction import TokenCounter, compact_html
+
+COUNTER = TokenCounter(encoding=None)  # offline-safe 4 chars/token estimate
+
+PAGE = (
+    "<html><head><title>T</title></head><body>"
+    "<header><h1 class='headline'>Headline</h1><span class='byline'>Jane Doe</span></header>"
+    "<div class='article'>" + "".join(f"<p>{'lorem ipsum ' * 400}</p>" for _ in range(30)) + "</div>"
+    "<footer>" + "<a href='/x'>link</a>" * 500 + "</footer>"
+    "</body></html>"
+)
+
+
+def test_small_page_is_untouched():
+    html = "<html><body><p>short</p></body></html>"
+    assert compact_html(html, 1000, COUNTER) == (html, COUNTER.count(html), COUNTER.count(html))
+
+
+def test_fits_budget_and_keeps_xpaths():
+    compacted, original_tokens, compacted_tokens = compact_html(PAGE, 4000, COUNTER)
+    assert original_tokens > 4000
+    assert compacted_tokens <= 4000
+    assert compacted_tokens == COUNTER.count(compacted)
+
+    before = etree.HTML(PAGE)
+    after = etree.HTML(compacted)
+    for xpath in ["//h1/text()", "//span[contains(@class, 'byline')]/text()"]:
+        assert after.xpath(xpath) == before.xpath(xpath)
+    # paragraphs keep their position, only their text is shortened
+    assert after.xpath("count(//div[@class='article']/p)") >= 1
+    assert before.xpath("string(//div[@class='article']/p[1])").startswith(
+        after.xpath("string(//div[@class='article']/p[1])").rstrip(" …")
+    )
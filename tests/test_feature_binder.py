@@ -0,0 +1,133 @@
+from datetime import datetime
+
+import nltk
+from langchain_core.messages import AIMessage
+
+from langscrape.concurrency import claim_future
+from langscrape.nodes import feature_binder as binder_module
+from langscrape.nodes.data_collator import data_collator
+from langscrape.settings import DEFAULT_CONFIG_PATH, get_settings
+
+URL = "https://example.com/news/article"
+BODY = "The city council approved the new budget on Tuesday after a long debate. " * 6
+PAGE = (
+    "<html><head><title>Budget approved</title></head><body>"
+    "<h1>Budget approved</h1><span class='by'>Jane Doe</span>"
+    f"<article><p>{BODY}</p><p>{BODY}</p></article></body></html>"
+)
+# what url_handler fetched: the cleaner drops the meta tags newspaper reads the date and author from
+RAW = PAGE.replace(
+    "<title>",
+    '<meta property="article:published_time" content="2024-05-01T00:00:00">'
+    '<meta name="author" content="Jane Doe"><title>',
+)
+XPATHS = {
+    "title": "//h1/text()",
+    "author": "//span[@class='by']/text()",
+    "datetime": "//time/text()",
+    "article_body": "//article//p/text()",
+}
+
+
+def _state(xpaths, **fallback):
+    settings = get_settings(DEFAULT_CONFIG_PATH).with_overrides({"fallback": fallback} if fallback else {})
+    return {
+        "id": "1",
+        "url": URL,
+        "raw_content": RAW,
+        "cleaned_content": PAGE,
+        "global_state": {k: {"strategy": "xpath_extractor", "xpath": v} for k, v in xpaths.items()},
+        "settings": settings,
+    }
+
+
+def _record_calls(monkeypatch):
+    calls = []
+    get_article = binder_module.get_article_traditional
+
+    def recording(url, html=None):
+        calls.append((url, html))
+        return get_article(url, html)
+
+    monkeypatch.setattr(binder_module, "get_article_traditional", recording)
+    return calls
+
+
+def test_complete_extraction_skips_newspaper(monkeypatch):
+    calls = _record_calls(monkeypatch)
+    xpaths = {k: v for k, v in XPATHS.items() if k != "datetime"}
+    result = binder_module.feature_binder(_state(xpaths))
+    assert calls == []
+    assert result["traditional_flag"] == []
+    assert "traditional_pending" not in result
+
+
+def test_short_body_is_filled_from_fetched_html(monkeypatch):
+    calls = _record_calls(monkeypatch)
+    xpaths = {**XPATHS, "article_body": "//h1/text()"}
+    xpaths.pop("datetime")
+    result = binder_module.feature_binder(_state(xpaths))
+    assert calls == [(URL, RAW)]
+    assert result["traditional_flag"] == ["article_body"]
+    assert "city council approved" in result["extracted_fields"]["article_body"]
+
+
+def test_run_threshold_overrides_the_process_settings(monkeypatch):
+    calls = _record_calls(monkeypatch)
+    xpaths = {**XPATHS, "article_body": "//h1/text()"}
+    xpaths.pop("datetime")
+    state = _state(xpaths)
+    state["settings"] = state["settings"].with_overrides({"warnings": {"min_article_body": 10}})
+    assert binder_module.feature_binder(state)["traditional_flag"] == []
+    assert calls == []
+    assert binder_module.apply_articlebody_logic("short", config=state["settings"]) is False
+
+
+def test_missing_metadata_resolves_in_data_collator(monkeypatch):
+    calls = _record_calls(monkeypatch)
+    state = _state(XPATHS)
+    result = binder_module.feature_binder(state)
+    assert result["traditional_flag"] == []
+    # the state only names the pending fields; the future is parked under the run id
+    assert result["traditional_pending"] == ["datetime"] and result["run_token"]
+
+    summary = AIMessage(content='```json\n{"title": "Budget approved", "publication_date": ""}\n```')
+    collated = data_collator({**state, **result, "summary": summary})
+    assert calls == [(URL, RAW)]
+    # the summarizer ran before newspaper finished, so the summary takes its date too
+    assert collated["result"]["summary"]["publication_date"] == "2024-05-01"
+    assert collated["traditional_flag"] == ["datetime"]
+    assert collated["traditional_pending"] is None
+    assert collated["extracted_fields"]["datetime"] == datetime(2024, 5, 1)
+    assert claim_future(result["run_token"], binder_module.TRADITIONAL_JOB) is None
+
+
+def test_runs_sharing_an_id_keep_their_own_futures(monkeypatch):
+    monkeypatch.setattr(binder_module, "get_article_traditional", lambda url, html=None: html)
+    first = binder_module.feature_binder(_state(XPATHS))
+    second = binder_module.feature_binder({**_state(XPATHS), "raw_content": "other"})
+    assert first["run_token"] != second["run_token"]
+    assert claim_future(second["run_token"], binder_module.TRADITIONAL_JOB).result() == "other"
+    assert claim_future(first["run_token"], binder_module.TRADITIONAL_JOB).result() == RAW
+
+
+def test_sequential_fallback(monkeypatch):
+    _record_calls(monkeypatch)
+    result = binder_module.feature_binder(_state(XPATHS, concurrent=False))
+    assert result["traditional_flag"] == ["datetime"]
+    assert result["extracted_fields"]["datetime"] == datetime(2024, 5, 1)
+    assert "traditional_pending" not in result
+
+
+def test_failed_punkt_download_is_retried(monkeypatch):
+    downloads = []
+
+    def missing(resource):
+        raise LookupError(resource)
+
+    monkeypatch.setattr(binder_module, "_punkt_ready", False)
+    monkeypatch.setattr(nltk.data, "find", missing)
+    monkeypatch.setattr(nltk, "download", lambda *args, **kwargs: downloads.append(args) or False)
+    binder_module.ensure_punkt()
+    binder_module.ensure_punkt()
+    assert len(downloads) == 2 and not binder_module._punkt_ready
@@ -0,0 +1,63 @@
+import asyncio
+import glob
+import os
+
+import pytest
+
+from langscrape.cache import FetchCache
+from langscrape.exceptions import FetchCacheMiss
+
+
+def test_round_trip_and_dedup(tmp_path):
+    cache = FetchCache(str(tmp_path))
+    cache.put("https://a.example/1", b"%PDF-1.7 bytes", kind="http", status=200)
+    cache.put("https://a.example/2", b"%PDF-1.7 bytes", kind="http", status=200)
+    cache.put("https://a.example/1", "<html>é</html>", kind="browser")
+
+    assert cache.get("https://a.example/1", "http") == (b"%PDF-1.7 bytes", {"status": 200})
+    assert cache.get("https://a.example/1", "browser") == ("<html>é</html>", {})
+    assert cache.get("https://a.example/3", "http") is None
+    # identical bodies share one compressed blob
+    assert len(glob.glob(os.path.join(str(tmp_path), "blobs", "*", "*.gz"))) == 2
+
+
+def test_fetch_only_calls_network_on_miss(tmp_path):
+    cache = FetchCache(str(tmp_path))
+    calls = []
+
+    def fetcher(url):
+        calls.append(url)
+        return b"body", {"status": 200}
+
+    assert cache.fetch("https://a.example/", "http", fetcher) == b"body"
+    assert cache.fetch("https://a.example/", "http", fetcher) == b"body"
+    assert calls == ["https://a.example/"]
+    assert cache.stats == {"hits": 1, "misses": 1, "stores": 1}
+
+    # failed fetches are returned but not stored
+    assert cache.fetch("https://a.example/404", "http", lambda url: (b"nope", {"cacheable": False})) == b"nope"
+    assert cache.fetch("https://a.example/empty", "browser", lambda url: "") == ""
+    assert cache.get("https://a.example/404", "http") is None
+    assert cache.get("https://a.example/empty", "browser") is None
+
+
+def test_ttl_and_offline_replay(tmp_path):
+    FetchCache(str(tmp_path)).put("https://a.example/", "<html></html>", kind="browser")
+
+    expired = FetchCache(str(tmp_path), ttl=-1)
+    assert expired.get("https://a.example/", "browser") is None
+
+    offline = FetchCache(str(tmp_path), ttl=-1, offline=True)
+    assert offline.fetch("https://a.example/", "browser", None) == "<html></html>"
+    with pytest.raises(FetchCacheMiss):
+        offline.fetch("https://b.example/", "browser", None)
+
+
+def test_async_fetch(tmp_path):
+    cache = FetchCache(str(tmp_path))
+
+    async def fetcher(url):
+        return "<html>async</html>"
+
+    assert asyncio.run(cache.afetch("https://a.example/", "browser", fetcher)) == "<html>async</html>"
+    assert cache.get("https://a.example/", "browser")[0] == "<html>async</html>"
@@ -0,0 +1,93 @@
+import pytest
+
+from langscrape.browser import pipeline, sniff
+from langscrape.browser.pipeline import Fetcher, FetchHistory, fetch_clean_html, rejection_reason
+from langscrape.exceptions import TooShortHtml
+
+ARTICLE = "<html><body><article>" + "<p>Some long paragraph of static text.</p>" * 200 + "</article></body></html>"
+JS_SHELL = "<html><body><div id='root'></div><noscript>Please enable JavaScript</noscript>" + " " * 3000 + "</body></html>"
+
+
+@pytest.fixture
+def fake_stages(monkeypatch):
+    pages = {}
+    calls = []
+    cleaned = []
+
+    def make(name):
+        def fetch(url):
+            calls.append(name)
+            return pages[name]
+        return fetch
+
+    for name in ("static", "rendered"):
+        monkeypatch.setitem(pipeline.FETCHERS, name, Fetcher(name, make(name), None))
+    monkeypatch.setattr(pipeline, "_history", FetchHistory(skip_after=2))
+    monkeypatch.setattr(sniff, "_content_types", sniff.ContentTypeCache())
+    clean = pipeline.clean_html_for_extraction3
+    monkeypatch.setattr(pipeline, "clean_html_for_extraction3", lambda raw: cleaned.append(raw) or clean(raw))
+    config = {
+        "fetch": {"stages": ["static", "rendered"], "min_raw_bytes": 100, "sniff": False},
+        "exceptions": {"min_html_length": 1000},
+    }
+    return pages, calls, cleaned, config
+
+
+def test_static_page_never_reaches_browser(fake_stages):
+    pages, calls, cleaned, config = fake_stages
+    pages.update(static=ARTICLE.encode(), rendered=ARTICLE)
+    html, stage = fetch_clean_html("https://static.example/a", config)
+    assert stage == "static" and calls == ["static"] and len(cleaned) == 1
+    assert html.startswith("<html><body><article>")
+
+
+def test_js_shell_goes_to_browser_and_domain_history(fake_stages):
+    pages, calls, cleaned, config = fake_stages
+    pages.update(static=JS_SHELL, rendered=ARTICLE)
+    for i in range(3):
+        assert fetch_clean_html(f"https://spa.example/{i}", config)[1] == "rendered"
+    # the shell is never cleaned; after two misses the domain skips the static stage
+    assert calls == ["static", "rendered", "static", "rendered", "rendered"]
+    assert cleaned == [ARTICLE] * 3
+
+
+def test_every_stage_short_raises(fake_stages):
+    pages, calls, cleaned, config = fake_stages
+    pages.update(static="", rendered="<html><body><p>tiny</p></body></html>")
+    with pytest.raises(TooShortHtml):
+        fetch_clean_html("https://blocked.example/", config)
+
+
+def test_error_status_falls_through(fake_stages):
+    pages, calls, cleaned, config = fake_stages
+    error_page = ARTICLE.encode()
+    pages.update(static=(error_page, {"status": 404}), rendered=ARTICLE)
+    assert fetch_clean_html("https://gone.example/a", config)[1] == "rendered"
+    assert calls == ["static", "rendered"] and cleaned == [ARTICLE]
+
+    # a long error page is not accepted from the last stage either
+    pages.update(rendered=(ARTICLE, {"status": 503}))
+    config["fetch"]["stages"] = ["rendered"]
+    with pytest.raises(TooShortHtml):
+        fetch_clean_html("https://down.example/", config)
+
+
+def test_pdf_is_recognized_from_the_response(fake_stages, monkeypatch):
+    pages, calls, cleaned, config = fake_stages
+    monkeypatch.setattr(pipeline, "sniff_content_kind", lambda url, config=None: pytest.fail("HEAD sniffed"))
+    body = b"%PDF-1.7\n" + b"0" * 500
+    pages.update(static=(body, {"status": 200, "content_type": "application/octet-stream"}), rendered=ARTICLE)
+    assert pipeline.fetch_page("https://docs.example/get?id=1", config) == ("", "static", body, "pdf")
+    pages.update(static=(ARTICLE, {"status": 200, "content_type": "text/html"}))
+    assert pipeline.fetch_page("https://docs.example/a", config)[1:] == ("static", ARTICLE, "html")
+    assert calls == ["static", "static"] and cleaned == [ARTICLE]
+    assert sniff.known_content_kind("https://docs.example/get?id=1") == "pdf"
+
+
+def test_rejection_reason():
+    assert rejection_reason(b"", 10) == "empty response"
+    assert "bytes" in rejection_reason(b"<html></html>", 100)
+    assert "JavaScript" in rejection_reason("<title>Just a moment...</title>" + " " * 200, 100)
+    assert rejection_reason(ARTICLE, 100) is None
+    assert rejection_reason(ARTICLE, 100, status=429) == "HTTP 429"
+    assert rejection_reason(ARTICLE, 100, status=200) is None
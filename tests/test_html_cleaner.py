@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from benchmarks.bench_cleaner import make_page
+from langscrape.html.cleaner import _tree_divergence, clean_html_chunks
+from langscrape.html.utils import clean_html_for_extraction3, clean_html_for_extraction3_soup
+
+PAGES = [
+    "",
+    "plain text only",
+    "<title>x</title><p>y",
+    "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=utf-8>\n<title>t</title>\n</head>\n"
+    "<body>\n<ul><li>a<li>b</ul>\n</body>\n</html>\n",
+    "<html><head><title>T</title></head>\n<body><p class='  a   b '>Hi &amp; <b>bye</b></p></body></html>\ntail",
+    "<head><noscript><img src=x alt=pic></noscript><title>t</title></head><body><p>z</p>",
+    "<html><head><title>t</title></head><script>1</script><title>late</title><body><p>x</p></body></html>",
+    "<body class=x><p>x</p></body><body id=y><p>z</p>",
+    "<table><tr><td>a</td></tr><tr><td>b</td></tr></table>",
+    "<table>\n<thead><tr><th>h</th></tr></thead>\n<tr><td>b</td></tr></table>",
+    "<table><td>a<td>b</table>",
+    "<table><caption>c</caption><colgroup><col></colgroup><tr><td>x</td></tr></table>",
+    "<table><div>x</div><tr>t<td>a</td>u</tr></table>",
+    "<a href=1>x<a href=2>y</a>",
+    "<p>a<div>b</div>",
+    "<p>one<p>two",
+    "<h1>a<h2>b</h2>",
+    "<dl><dt>a<dd>b</dl>",
+    "<div><img src=a alt=b></div><div><span> </span></div><br><hr>",
+    "<div>a<wbr>b<br/>c</div><pre>\nkeep  spacing</pre>",
+    "<p title='a\"b'>q</p><p title=\"a'b\">q</p><p title=\"a'&quot;b\">q</p><p title='a<b>c'>r</p>",
+    "<DIV CLASS=X ID=Y>Up</DIV><p id=a id=b>dup</p><h1 id='a' class='b' title='c'>x</h1>",
+    "<a href='javascript:void(0)' id=k>js</a><script>var x=1</script><style>p{}</style>",
+    "<form><label>l</label><input><p>inside form</p></form><button>Click</button>",
+    "<select><option>a</option></select><template><p>t</p></template><p>x</p>",
+    "<svg><title>t</title></svg><video><source src=a>no video</video><p>after</p>",
+    "<div>a&nbsp;b &lt;c&gt; &amp;amp; &copy; &#x27;</div><p>α β — “quotes” 日本</p>",
+    "<p>x</p><!-- c --><?pi x?><p>y</p>",
+    # libxml2 leaves <p> open before HTML5 elements and closes formatting before <p>
+    *(f"<!DOCTYPE html><p>intro<{tag}>x</{tag}>tail" for tag in (
+        "article", "section", "aside", "header", "footer", "nav", "main", "figure", "figcaption", "details")),
+    "<b>bold<p>para</b>rest",
+    "<p><b>x<p>y",
+    "<div><b>x<div>y</div></b>z</div>",
+    "<p>x<table><tr><td>y</td></tr></table>",
+    "<!DOCTYPE html><p>x<table><tr><td>y</td></tr></table>",
+    "<pre>a<dl><dt>b</dl></pre>",
+    "<ul><li>a<dl><dt>b<li>c</dl></ul>",
+    "<div><span>a<div>b</span>c</div>",
+    "<p>a<wbr><dd>b</wbr>c",
+    "<p>a<svg><title>t</title></p></svg>b",
+]
+FUZZ_TAGS = ["p", "div", "b", "i", "a", "span", "em", "article", "section", "aside", "header", "nav", "figure",
+             "details", "summary", "ul", "li", "h1", "h2", "blockquote", "font", "br", "hr", "dl", "dt", "dd", "pre",
+             "table", "tr", "td", "svg", "form", "button", "noscript", "wbr", "body"]
+
+
+@pytest.mark.parametrize("html", PAGES)
+def test_matches_soup_cleaner(html):
+    assert clean_html_for_extraction3(html) == clean_html_for_extraction3_soup(html)
+
+
+def test_random_markup_matches_soup_cleaner():
+    rng = random.Random(0)
+    for _ in range(300):
+        parts = ["<!DOCTYPE html>"] if rng.random() < 0.5 else []
+        for _ in range(10):
+            tag, roll = rng.choice(FUZZ_TAGS), rng.random()
+            parts.append(f"<{tag}>" if roll < 0.45 else f"</{tag}>" if roll < 0.75 else rng.choice(["x", " ", "tail"]))
+        html = "".join(parts)
+        assert clean_html_for_extraction3(html) == clean_html_for_extraction3_soup(html), html
+
+
+def test_well_formed_pages_skip_the_soup_cleaner():
+    assert _tree_divergence(make_page(0.05)) is None
+    assert _tree_divergence(PAGES[3]) is None
+    assert _tree_divergence("<b>bold<p>para</b>rest") is not None
+
+
+def test_chunked_input_matches():
+    html = "".join(PAGES[3:12]) * 3
+    chunks = [html[i:i + 7] for i in range(0, len(html), 7)]
+    assert clean_html_chunks(chunks) == clean_html_chunks([html])
+
+
+def test_bytes_input():
+    html = "<html><head><meta charset='utf-8'></head><body><p>naïve café</p></body></html>"
+    assert clean_html_for_extraction3(html.encode("utf-8")) == clean_html_for_extraction3(html)
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from langscrape.browser import http
+
+SETTINGS = {"retries": 2, "backoff_factor": 0.01, "per_host": 2, "timeout": 5, "connect_timeout": 2, "max_retry_after": 0}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    failures = {}
+    peers = set()
+
+    def do_GET(self):
+        Handler.peers.add(self.client_address)
+        if Handler.failures.get(self.path, 0) > 0:
+            Handler.failures[self.path] -= 1
+            self.send_response(503)
+            self.send_header("Retry-After", "3600")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = f"ok {self.path}".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(http, "_settings", lambda config=None: SETTINGS)
+    monkeypatch.setattr(http, "_session", None)
+    Handler.failures.clear()
+    Handler.peers.clear()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def test_session_retries_and_reuses_connections(server):
+    Handler.failures["/flaky"] = 2
+    start = time.monotonic()
+    assert http.http_get(f"{server}/flaky").text == "ok /flaky"
+    assert time.monotonic() - start < 5  # the hour-long Retry-After is capped
+    for i in range(5):
+        assert http.http_get(f"{server}/page/{i}").status_code == 200
+    assert len(Handler.peers) == 1  # one kept-alive connection for all requests
+
+
+def test_async_client_retries(server):
+    Handler.failures["/flaky"] = 1
+
+    async def main():
+        try:
+            responses = await asyncio.gather(*(http.ahttp_get(f"{server}/flaky") for _ in range(3)))
+            return [r.text for r in responses]
+        finally:
+            await http.aclose_http_clients()
+
+    start = time.monotonic()
+    assert asyncio.run(main()) == ["ok /flaky"] * 3
+    assert time.monotonic() - start < 5
+    assert len(Handler.peers) <= SETTINGS["per_host"]
+
+
+def test_async_stream_retries(server):
+    Handler.failures["/flaky"] = 1
+
+    async def main():
+        try:
+            async with http.ahttp_stream("GET", f"{server}/flaky") as response:
+                return b"".join([chunk async for chunk in response.aiter_bytes()])
+        finally:
+            await http.aclose_http_clients()
+
+    assert asyncio.run(main()) == b"ok /flaky"
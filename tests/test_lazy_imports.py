@@ -0,0 +1,18 @@
+from benchmarks.bench_import import LAZY_DEPENDENCIES, loaded_modules, parse_importtime
+
+
+def test_heavy_dependencies_load_on_first_use():
+    assert set(LAZY_DEPENDENCIES) & set(loaded_modules("langscrape.batch")) == set()
+
+
+def test_pdf_workers_skip_the_http_stack():
+    assert {"httpx", "requests", "langchain_core"} & set(loaded_modules("langscrape.pdf.pages")) == set()
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   re\n"
+        "import time:      2000 |       2120 | langscrape\n"
+    )
+    assert parse_importtime(stderr) == [("re", 120, 120), ("langscrape", 2000, 2120)]
@@ -0,0 +1,18 @@
+import random
+
+from feilian.text_tools import _ENTITIES, _normalize_text_sequential, normalize_text
+
+PIECES = list(_ENTITIES) + ["&", "amp;", "#38;", "&hellip;", "&amp", "a", "Q&A", " ", "  ", "\xa0", "\n", "é", "text"]
+
+
+def test_matches_the_sequential_chain():
+    rng = random.Random(0)
+    for _ in range(20000):
+        text = "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 8)))
+        assert normalize_text(text) == _normalize_text_sequential(text), repr(text)
+
+
+def test_cascading_and_long_text():
+    for text in ["&amp;#38;amp;", "&&#035;38;", "AT&amp;T&nbsp; &nbsp;rocks", " x " * 500]:
+        assert normalize_text(text) == _normalize_text_sequential(text)
+    assert normalize_text("  Water&nbsp;\xa0supply &amp; more ") == "Water supply & more"
@@ -0,0 +1,60 @@
+import pymupdf
+
+from langscrape.cache import FetchCache
+from langscrape.pdf.pages import text_normalizer
+from langscrape.pdf.pdf_utils import get_joined_text, iter_page_texts, pdf_to_text
+
+
+def _make_pdf(path, pages=40):
+    doc = pymupdf.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i} of the report ......")
+        page.insert_text((72, 100), f"Second   line on page {i}.")
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_in_process_matches_joined_text(tmp_path):
+    path = _make_pdf(tmp_path / "doc.pdf", pages=5)
+    with pymupdf.open(path) as pdf:
+        expected = get_joined_text(pdf)
+    assert pdf_to_text(path, normalize=False) == expected
+    assert pdf_to_text(path) == text_normalizer(expected)
+
+
+def test_process_pool_keeps_page_order(tmp_path):
+    path = _make_pdf(tmp_path / "doc.pdf", pages=40)
+    serial = list(iter_page_texts(path, workers=1))
+    pooled = list(iter_page_texts(path, workers=2, pages_per_task=3, parallel_min_pages=10))
+    assert pooled == serial
+    assert pooled[0] == "Page 0 of the report . Second line on page 0."
+    assert len(pooled) == 40
+
+
+def test_budget_stops_early(tmp_path):
+    path = _make_pdf(tmp_path / "doc.pdf", pages=40)
+    full = pdf_to_text(path)
+    text = pdf_to_text(path, max_chars=200, workers=2, pages_per_task=2, parallel_min_pages=10)
+    assert text == full[:200]
+    assert len(pdf_to_text(path, max_tokens=30)) < len(full)
+
+
+def test_file_spool_round_trips_through_cache(tmp_path):
+    cache = FetchCache(str(tmp_path / "cache"))
+    source = _make_pdf(tmp_path / "doc.pdf", pages=3)
+    calls = []
+
+    def downloader(url, dest):
+        calls.append(url)
+        with open(source, "rb") as src, open(dest, "wb") as dst:
+            dst.write(src.read())
+        return {"status": 200, "content_type": "application/pdf"}
+
+    url = "https://a.example/report.pdf"
+    first = cache.fetch_file(url, str(tmp_path / "one.pdf"), "http", downloader)
+    second = cache.fetch_file(url, str(tmp_path / "two.pdf"), "http", downloader)
+    assert first == second == {"status": 200, "content_type": "application/pdf"}
+    assert calls == [url]
+    assert pdf_to_text(str(tmp_path / "two.pdf")) == pdf_to_text(source)
@@ -0,0 +1,85 @@
+import asyncio
+import json
+import operator
+from typing import Annotated, Any, Dict, List, NotRequired, Sequence, TypedDict
+
+import pytest
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.tools import tool
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+from langgraph.prebuilt import ToolNode
+
+from langscrape.profiling import TraceWriter, instrument_node
+
+
+class State(TypedDict):
+    messages: Annotated[Sequence[BaseMessage], add_messages]
+    cleaned_content: NotRequired[str]
+    iterations: int
+    invoke_time: NotRequired[Any]
+    node_timings: NotRequired[Annotated[List[Dict[str, Any]], operator.add]]
+
+
+@tool
+def echo(text: str) -> str:
+    """Echo the text back."""
+    return text
+
+
+def fetch(state):
+    return {"cleaned_content": "<html>" + "x" * 100 + "</html>"}
+
+
+async def afetch(state):
+    return fetch(state)
+
+
+def reason(state):
+    return {"messages": [AIMessage(content="", tool_calls=[{"name": "echo", "args": {"text": "hi"}, "id": "1"}])]}
+
+
+def _graph(writer, use_async):
+    graph = StateGraph(State)
+    nodes = [("fetch", afetch if use_async else fetch), ("reason", reason), ("tools", ToolNode([echo]))]
+    for name, node in nodes:
+        graph.add_node(name, instrument_node(name, node, use_async=use_async, writer=writer))
+    graph.add_edge(START, "fetch")
+    graph.add_edge("fetch", "reason")
+    graph.add_edge("reason", "tools")
+    graph.add_edge("tools", END)
+    return graph.compile()
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_nodes_record_timings_and_spans(tmp_path, use_async):
+    path = tmp_path / "trace.jsonl"
+    graph = _graph(TraceWriter(str(path)), use_async)
+    state = {"messages": [], "iterations": 1}
+    result = asyncio.run(graph.ainvoke(state)) if use_async else graph.invoke(state)
+
+    assert result["messages"][-1].content == "hi"
+    timings = result["node_timings"]
+    assert [t["node"] for t in timings] == ["fetch", "reason", "tools"]
+    assert all(t["wall_s"] >= 0 and t["cpu_s"] >= 0 for t in timings)
+    assert timings[0]["html_chars"] == 113
+    assert "invoke_time" in result
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [s["name"] for s in spans] == ["fetch", "reason", "tools"]
+    assert len({s["trace_id"] for s in spans}) == 1
+    assert all(s["end_time_unix_nano"] >= s["start_time_unix_nano"] for s in spans)
+    assert spans[0]["attributes"]["langscrape.html_chars"] == 113
+
+
+def test_failed_node_emits_error_span(tmp_path):
+    path = tmp_path / "trace.jsonl"
+
+    def broken(state):
+        raise ValueError("boom")
+
+    wrapped = instrument_node("broken", broken, writer=TraceWriter(str(path)))
+    with pytest.raises(ValueError):
+        wrapped({"iterations": 1})
+    span = json.loads(path.read_text())
+    assert span["status"] == "ERROR" and span["attributes"]["exception.message"] == "boom"
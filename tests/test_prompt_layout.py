@@ -0,0 +1,76 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from langscrape.nodes import extraction_reasoner as reasoner_module
+from langscrape.settings import DEFAULT_CONFIG_PATH, get_settings
+from langscrape.utils import get_default_token_usage, update_token_usage
+
+PAGE = "<html><body><h1>Title</h1><article><p>" + "body text " * 10 + "</p></article></body></html>"
+
+
+class RecordingModel:
+    def __init__(self):
+        self.calls = []
+
+    def invoke(self, messages):
+        self.calls.append(list(messages))
+        return AIMessage(
+            content="",
+            usage_metadata={
+                "input_tokens": 1000,
+                "output_tokens": 10,
+                "total_tokens": 1010,
+                "input_token_details": {"cache_read": 800 * (len(self.calls) - 1)},
+            },
+        )
+
+
+def _state(model, layout):
+    return {
+        "settings": get_settings(DEFAULT_CONFIG_PATH).with_overrides({"extractor": {"prompt_layout": layout, "stream": False}}),
+        "cleaned_content": PAGE,
+        "global_state": {
+            "title": {"strategy": "xpath_extractor", "xpath": "//h1/text()"},
+            "author": {"strategy": "lm_capabilities", "value": []},
+        },
+        "messages": [],
+        "iterations": 1,
+        "extractor": model,
+        "token_usage": get_default_token_usage(),
+    }
+
+
+def test_prefix_cache_layout_keeps_a_stable_prefix():
+    model = RecordingModel()
+    state = _state(model, "prefix_cache")
+    for _ in range(2):
+        update = reasoner_module.extraction_reasoner(state)
+        state["global_state"]["title"]["xpath"] = "//article//p/text()"
+        state = {**state, **update, "messages": list(state["messages"]) + update["messages"]}
+
+    first, second = model.calls
+    assert isinstance(first[0], SystemMessage) and PAGE in first[0].content
+    assert "CURRENT XPATH MAP" not in first[0].content
+    # each request extends the previous one, so the provider can reuse its prefix
+    assert second[: len(first)] == first
+    assert isinstance(second[-1], HumanMessage) and "ITERATION 2" in second[-1].content
+    extractor_usage = state["token_usage"]["extractor"]
+    assert (extractor_usage["input_tokens"], extractor_usage["cached_input_tokens"], extractor_usage["calls"]) == (2000, 800, 2)
+
+
+def test_legacy_layout_sends_state_in_system_prompt():
+    model = RecordingModel()
+    update = reasoner_module.extraction_reasoner(_state(model, "legacy"))
+    (request,) = model.calls
+    assert len(request) == 1 and "CURRENT XPATH MAP" in request[0].content and PAGE in request[0].content
+    assert len(update["messages"]) == 1
+
+
+def test_cached_tokens_from_raw_provider_usage():
+    deepseek = AIMessage(content="", response_metadata={"token_usage": {
+        "prompt_tokens": 100, "completion_tokens": 5, "prompt_cache_hit_tokens": 64}})
+    openai = AIMessage(content="", response_metadata={"token_usage": {
+        "prompt_tokens": 100, "completion_tokens": 5, "prompt_tokens_details": {"cached_tokens": 32}}})
+    usage = update_token_usage({}, "extractor", deepseek)
+    usage = update_token_usage({"token_usage": usage}, "extractor", openai)
+    assert usage["extractor"]["input_tokens"] == 200
+    assert usage["extractor"]["cached_input_tokens"] == 96
@@ -0,0 +1,66 @@
+import pytest
+import yaml
+from langchain_core.messages import AIMessage
+
+from langscrape.agent.graph import tools_condition_with_iter_limit
+from langscrape.exceptions import ConfigError
+from langscrape.settings import DEFAULT_CONFIG_PATH, Settings, as_settings, get_settings, read_settings, reload_settings
+from langscrape.utils import load_config
+
+
+def _write(path, config):
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f)
+    return str(path)
+
+
+def test_parsed_once_until_reload(tmp_path):
+    config = read_settings(DEFAULT_CONFIG_PATH).to_dict()
+    path = _write(tmp_path / "config.yaml", config)
+    settings = get_settings(path)
+    assert get_settings(path) is settings and settings.max_iters == config["extractor"]["max_iters"]
+
+    _write(path, {**config, "extractor": {**config["extractor"], "max_iters": 2}})
+    assert get_settings(path).max_iters == config["extractor"]["max_iters"]
+    assert reload_settings(path).max_iters == 2
+    assert get_settings(path).max_iters == 2
+    # load_config keeps returning a mutable dict
+    assert load_config(path)["extractor"]["max_iters"] == 2
+
+
+def test_read_only_and_overrides():
+    settings = get_settings(DEFAULT_CONFIG_PATH)
+    with pytest.raises(TypeError):
+        settings["extractor"]["max_iters"] = 1
+    with pytest.raises(AttributeError):
+        settings.path = "elsewhere.yaml"
+    quick = settings.with_overrides({"extractor": {"max_iters": 1}})
+    assert quick.max_iters == 1 and quick["extractor"]["name"] == settings["extractor"]["name"]
+    assert settings.max_iters != 1
+    assert as_settings(quick) is quick and as_settings() is get_settings()
+
+
+def test_validation():
+    config = read_settings(DEFAULT_CONFIG_PATH).to_dict()
+    del config["extractor"]["provider"]
+    with pytest.raises(ConfigError, match="missing extractor.provider"):
+        Settings(config)
+    config = read_settings(DEFAULT_CONFIG_PATH).to_dict()
+    config["extractor"]["max_iters"] = "7"
+    with pytest.raises(ConfigError, match="extractor.max_iters should be int"):
+        Settings(config)
+
+
+def test_optional_thresholds_have_defaults():
+    config = read_settings(DEFAULT_CONFIG_PATH).to_dict()
+    del config["exceptions"], config["warnings"]
+    settings = Settings(config)
+    assert settings.min_html_length == 3000 and settings.min_article_body == 100
+
+
+def test_runs_use_their_own_settings():
+    base = get_settings(DEFAULT_CONFIG_PATH)
+    call = AIMessage(content="", tool_calls=[{"name": "store_xpath", "args": {}, "id": "1"}])
+    state = {"messages": [call], "iterations": 3}
+    assert tools_condition_with_iter_limit({**state, "settings": base.with_overrides({"extractor": {"max_iters": 5}})}) == "tools"
+    assert tools_condition_with_iter_limit({**state, "settings": base.with_overrides({"extractor": {"max_iters": 2}})}) == "__end__"
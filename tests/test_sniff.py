@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from langscrape.browser import http, sniff
+
+PDF_BODY = b"%PDF-1.7\n" + b"0" * 5000
+HTML_BODY = b"<html><body>" + b"x" * 5000 + b"</body></html>"
+CONFIG = {"fetch": {"sniff": True}, "fetch_cache": {"enabled": False}}
+
+# path -> (content type, body, HEAD allowed)
+ROUTES = {
+    "/download?id=1": ("application/pdf", PDF_BODY, True),
+    "/file?id=2": ("application/octet-stream", PDF_BODY, True),
+    "/no-head": ("text/html; charset=utf-8", PDF_BODY, False),
+    "/article": ("text/html; charset=utf-8", HTML_BODY, True),
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def _respond(self, send_body):
+        Handler.requests.append((self.command, self.path, self.headers.get("Range")))
+        content_type, body, head_ok = ROUTES[self.path]
+        if self.command == "HEAD" and not head_ok:
+            self.send_response(405)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)  # Range is ignored on purpose
+
+    def do_HEAD(self):
+        self._respond(False)
+
+    def do_GET(self):
+        self._respond(True)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(http, "_settings", lambda config=None: {"retries": 0, "timeout": 5})
+    monkeypatch.setattr(http, "_session", None)
+    monkeypatch.setattr(sniff, "_content_types", sniff.ContentTypeCache())
+    Handler.requests.clear()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def test_header_and_magic_byte_detection(server):
+    assert sniff.sniff_content_kind(f"{server}/download?id=1", CONFIG) == "pdf"
+    assert sniff.sniff_content_kind(f"{server}/file?id=2", CONFIG) == "pdf"
+    assert sniff.sniff_content_kind(f"{server}/no-head", CONFIG) == "pdf"
+    assert sniff.sniff_content_kind(f"{server}/article", CONFIG) == "html"
+    ranged = [r for r in Handler.requests if r[0] == "GET"]
+    assert all(r[2] == "bytes=0-1023" for r in ranged)
+    assert {r[1] for r in ranged} == {"/file?id=2", "/no-head"}
+
+
+def test_results_are_cached_and_suffix_needs_no_request(server):
+    url = f"{server}/download?id=1"
+    assert sniff.sniff_content_kind(url, CONFIG) == "pdf"
+    count = len(Handler.requests)
+    assert sniff.sniff_content_kind(url, CONFIG) == "pdf"
+    assert sniff.sniff_content_kind(f"{server}/report.PDF", CONFIG) == "pdf"
+    assert len(Handler.requests) == count
+
+
+def test_network_errors_fall_back_to_html(server):
+    assert sniff.sniff_content_kind("http://127.0.0.1:9/unreachable", CONFIG) == "html"
+    assert sniff._content_types.get("http://127.0.0.1:9/unreachable") is None
+
+
+def test_async_sniff(server):
+    async def main():
+        try:
+            return [
+                await sniff.asniff_content_kind(f"{server}{path}", CONFIG)
+                for path in ("/download?id=1", "/file?id=2", "/no-head", "/article")
+            ]
+        finally:
+            await http.aclose_http_clients()
+
+    assert asyncio.run(main()) == ["pdf", "pdf", "pdf", "html"]
@@ -0,0 +1,107 @@
+import asyncio
+
+from langchain_core.messages import AIMessage
+
+from langscrape.concurrency import claim_future, park_future
+from langscrape.nodes import extraction_reasoner as reasoner_module
+from langscrape.nodes import summarizer as summarizer_module
+from langscrape.settings import DEFAULT_CONFIG_PATH, get_settings
+from langscrape.utils import get_default_token_usage
+
+BODY = "body text " * 20
+PAGE = f"<html><body><h1>Title</h1><span>Jane Doe</span><article><p>{BODY}</p></article></body></html>"
+
+
+class CountingModel:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return AIMessage(content=self.content, usage_metadata={"input_tokens": 10, "output_tokens": 1, "total_tokens": 11})
+
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+
+def _state(speculative=True, body_xpath="//article//p/text()"):
+    settings = get_settings(DEFAULT_CONFIG_PATH).with_overrides({
+        "extractor": {"stream": False},
+        "summarizer": {"stream": False, "speculative": speculative},
+    })
+    return {
+        "id": "a",
+        "settings": settings,
+        "url": "https://example.com/a",
+        "cleaned_content": PAGE,
+        "global_state": {
+            "title": {"strategy": "xpath_extractor", "xpath": "//h1/text()"},
+            "author": {"strategy": "xpath_extractor", "xpath": "//time/text()"},
+            "article_body": {"strategy": "xpath_extractor", "xpath": body_xpath},
+        },
+        "messages": [],
+        "iterations": 1,
+        "extractor": CountingModel(""),
+        "summarizer": CountingModel('```json\n{"summary": "s"}\n```'),
+        "token_usage": get_default_token_usage(),
+    }
+
+
+def _run_loop(state):
+    update = reasoner_module.extraction_reasoner(state)
+    state = {**state, **update, "messages": list(state["messages"]) + update["messages"]}
+    extracted = reasoner_module.extract_by_xpath_map_from_html(state["cleaned_content"], state["global_state"])
+    return {**state, "extracted_fields": extracted}
+
+
+def test_speculative_summary_is_reused_when_body_is_unchanged():
+    state = _run_loop(_state())
+    assert state["speculative_summary"]["fields"]["title"] == ["Title"]
+    assert sorted(state["speculative_summary"]) == ["fields", "iteration"]
+    result = summarizer_module.summarizer(state)
+    assert state["summarizer"].calls == 1
+    assert result["summary"].content.startswith("```json")
+    assert result["speculative_summary"] is None
+    assert [c["node"] for c in result["token_usage"]["calls"]] == ["extraction_reasoner", "summarizer_speculative"]
+
+
+def test_speculative_summary_is_discarded_when_body_changes():
+    state = _run_loop(_state())
+    # the future is parked outside the state; wait for it and put it back
+    future = claim_future(state["run_token"], summarizer_module.SPECULATIVE_JOB)
+    future.result()
+    park_future(state["run_token"], summarizer_module.SPECULATIVE_JOB, future)
+    state["global_state"]["article_body"]["xpath"] = "//span/text() | //article//p/text()"
+    state["extracted_fields"] = reasoner_module.extract_by_xpath_map_from_html(PAGE, state["global_state"])
+    result = summarizer_module.summarizer(state)
+    assert state["summarizer"].calls == 2
+    assert result["token_usage"]["calls"][-1]["node"] == "summarizer"
+
+
+def test_speculative_summary_is_discarded_when_author_changes():
+    state = _run_loop(_state())
+    # the extractor finds the byline after the summary was started
+    state["global_state"]["author"]["xpath"] = "//span/text()"
+    state["extracted_fields"] = reasoner_module.extract_by_xpath_map_from_html(PAGE, state["global_state"])
+    result = summarizer_module.summarizer(state)
+    assert state["summarizer"].calls == 2
+    assert result["token_usage"]["calls"][-1]["node"] == "summarizer"
+
+
+def test_no_speculation_until_body_validates_or_when_disabled():
+    assert "speculative_summary" not in _run_loop(_state(body_xpath="//h1/text()"))
+    assert "speculative_summary" not in _run_loop(_state(speculative=False))
+
+
+def test_async_speculative_summary():
+    async def run():
+        state = _state()
+        update = await reasoner_module.aextraction_reasoner(state)
+        state = {**state, **update}
+        state["extracted_fields"] = reasoner_module.extract_by_xpath_map_from_html(PAGE, state["global_state"])
+        return state, await summarizer_module.asummarizer(state)
+
+    state, result = asyncio.run(run())
+    assert state["summarizer"].calls == 1
+    assert result["token_usage"]["calls"][-1]["node"] == "summarizer_speculative"
@@ -0,0 +1,70 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from langscrape.llm import ainvoke_llm, invoke_llm
+from langscrape.utils import get_default_token_usage, summarize_token_usage, update_token_usage
+
+USAGE = {
+    "input_tokens": 100,
+    "output_tokens": 20,
+    "total_tokens": 120,
+    "input_token_details": {"cache_read": 64},
+    "output_token_details": {"reasoning": 12},
+}
+
+
+class StreamingModel:
+    def _chunks(self):
+        yield AIMessageChunk(content="", tool_call_chunks=[
+            {"name": "store_xpath", "args": '{"key": "title",', "id": "call-1", "index": 0}])
+        yield AIMessageChunk(content="", tool_call_chunks=[
+            {"name": None, "args": ' "new_xpath": "//h1"}', "id": None, "index": 0}], usage_metadata=USAGE)
+
+    def invoke(self, messages):
+        return AIMessage(content="done", usage_metadata=USAGE)
+
+    def stream(self, messages):
+        yield from self._chunks()
+
+    async def astream(self, messages):
+        for chunk in self._chunks():
+            yield chunk
+
+
+def test_streamed_response_is_merged_and_timed():
+    response, timing = invoke_llm(StreamingModel(), [], stream=True)
+    assert isinstance(response, AIMessage)
+    assert response.tool_calls[0]["args"] == {"key": "title", "new_xpath": "//h1"}
+    assert response.usage_metadata["input_tokens"] == 100
+    assert 0 <= timing["ttft_s"] <= timing["latency_s"]
+
+    response, timing = asyncio.run(ainvoke_llm(StreamingModel(), [], stream=True))
+    assert response.tool_calls[0]["name"] == "store_xpath"
+    assert timing["ttft_s"] is not None
+
+    response, timing = invoke_llm(StreamingModel(), [], stream=False)
+    assert response.content == "done" and timing["ttft_s"] is None
+
+
+def test_usage_per_agent_and_per_call():
+    message = AIMessage(content="", usage_metadata=USAGE)
+    state = {"token_usage": get_default_token_usage(), "iterations": 1}
+    state["token_usage"] = update_token_usage(state, "extractor", message, {"latency_s": 1.5, "ttft_s": 0.5}, node="extraction_reasoner")
+    state["iterations"] = 2
+    state["token_usage"] = update_token_usage(state, "extractor", message, {"latency_s": 1.0, "ttft_s": None}, node="extraction_reasoner")
+    usage = update_token_usage(state, "summarizer", message, {"latency_s": 2.0, "ttft_s": 0.25}, node="summarizer")
+
+    assert usage["extractor"] == {
+        "input_tokens": 200, "output_tokens": 40, "cached_input_tokens": 128, "reasoning_tokens": 24,
+        "calls": 2, "latency_s": 2.5, "ttft_s": 0.5,
+    }
+    assert [(c["node"], c["iteration"], c["latency_s"]) for c in usage["calls"]] == [
+        ("extraction_reasoner", 1, 1.5), ("extraction_reasoner", 2, 1.0), ("summarizer", 2, 2.0),
+    ]
+    # the previous state is not mutated
+    assert len(state["token_usage"]["calls"]) == 2
+
+    totals = summarize_token_usage([usage, usage, None])
+    assert totals["summarizer"]["input_tokens"] == 200
+    assert totals["extractor"]["latency_s"] == 5.0
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from benchmarks.bench_pipeline import FIXTURES_DIR, load_manifest
+from langscrape.agent.graph import discovery_condition
+from langscrape.html.page_signals import extract_page_signals
+from langscrape.html.utils import clean_html_for_extraction3
+from langscrape.html.xpath_discovery import discover_xpaths
+from langscrape.html.xpath_extractor import extract_by_xpath_map_from_html
+from langscrape.nodes.xpath_discovery import xpath_discovery
+from langscrape.settings import DEFAULT_CONFIG_PATH, get_settings
+from langscrape.utils import initialize_global_state
+
+FIELDS = ["title", "author", "datetime", "article_body"]
+PAGES = [p for p in load_manifest(FIXTURES_DIR) if p["file"].endswith(".html")]
+
+
+def _load(page):
+    with open(os.path.join(FIXTURES_DIR, page["file"]), "r", encoding="utf-8") as f:
+        raw = f.read()
+    return raw, clean_html_for_extraction3(raw)
+
+
+def _texts(html, xpaths):
+    extracted = extract_by_xpath_map_from_html(html, {k: {"xpath": v} for k, v in xpaths.items()})
+    return {k: " ".join(" ".join(v).split()) for k, v in extracted.items()}
+
+
+def test_page_signals():
+    raw, _ = _load(next(p for p in PAGES if p["file"] == "blog_post.html"))
+    signals = extract_page_signals(raw)
+    assert signals["title"] == ["Notes from the field: a week at the clinic"]
+    assert signals["author"] == ["Omar Haddad"]
+    assert signals["datetime"] == ["2024-05-02", "2024-05-02T10:00:00+00:00", "May 2, 2024"]
+    assert extract_page_signals("") == {}
+
+
+@pytest.mark.parametrize("page", PAGES, ids=[p["file"] for p in PAGES])
+def test_discovered_xpaths_match_the_manual_ones(page):
+    raw, cleaned = _load(page)
+    found = discover_xpaths(cleaned, FIELDS, extract_page_signals(raw), get_settings(DEFAULT_CONFIG_PATH))
+    assert sorted(found) == sorted(FIELDS)
+    assert _texts(cleaned, found) == _texts(cleaned, page["xpaths"])
+
+
+def test_node_seeds_and_skips_the_extractor():
+    raw, cleaned = _load(PAGES[0])
+    settings = get_settings(DEFAULT_CONFIG_PATH).with_overrides({"templates": {"enabled": False}})
+    state = {
+        "url": PAGES[0]["url"],
+        "cleaned_content": cleaned,
+        "page_signals": extract_page_signals(raw),
+        "global_state": initialize_global_state(settings, url=PAGES[0]["url"]),
+        "settings": settings,
+    }
+    assert discovery_condition(xpath_discovery(state)) == "hit"
+    assert {v["source"] for v in state["global_state"].values()} == {"discovered"}
+
+    # a field no rule can fill keeps the extractor in the loop, seeded with the rest
+    no_byline = cleaned.replace("Dana Levi", "")
+    state = {**state, "cleaned_content": no_byline, "page_signals": {}, "global_state": initialize_global_state(settings)}
+    assert discovery_condition(xpath_discovery(state)) == "miss"
+    assert "xpath" not in state["global_state"]["author"]
+    assert state["global_state"]["title"]["source"] == "discovered"
+
+    disabled = settings.with_overrides({"discovery": {"enabled": False}})
+    state = {**state, "global_state": initialize_global_state(settings), "settings": disabled}
+    assert xpath_discovery(state) == {"discovery_hit": False}
+    assert "xpath" not in state["global_state"]["title"]
@@ -0,0 +1,64 @@
+import random
+
+from feilian.etree_tools import XPathIndex, gen_xpath_by_text, gen_xpaths_by_texts, get_xpath, itertext, parse_html
+from feilian.text_tools import normalize_text
+
+
+def _random_page(seed):
+    rng = random.Random(seed)
+
+    def node(depth):
+        tag = rng.choice(["div", "p", "span", "li"])
+        attrs = rng.choice(["", " class='a'", " class='b'", " id='x{}'".format(rng.randint(0, 9)), " id='y' class='a'"])
+        children = "".join(node(depth + 1) for _ in range(rng.randint(0, 4))) if depth < 4 else ""
+        return f"<{tag}{attrs}>text {rng.randint(0, 99)}<!-- c -->{children}</{tag}>"
+
+    return "<html><body>" + "".join(node(0) for _ in range(6)) + "</body></html>"
+
+
+def test_index_matches_get_xpath():
+    for seed in range(20):
+        tree = parse_html(_random_page(seed))
+        index = XPathIndex(tree)
+        for ele in tree.getroot().iter("div", "p", "span", "li"):
+            for short in (True, False):
+                for with_id, with_class in [(True, True), (False, True), (True, False), (False, False)]:
+                    kwargs = dict(short=short, with_id=with_id, with_class=with_class)
+                    assert index.get_xpath(ele, **kwargs) == get_xpath(ele, **kwargs)
+
+
+def test_gen_xpath_by_text_on_a_wide_list():
+    items = "".join(f"<li class='r'><a>Item number {i}</a></li>" for i in range(3000))
+    tree = parse_html(f"<html><body><ul id='results'>{items}</ul></body></html>")
+    xpaths = gen_xpath_by_text(tree, "Item number 2999", text_suffix=True)
+    assert xpaths == ['//ul[@id="results"]/li[@class="r"][3000]/a/text()']
+    assert tree.xpath(xpaths[0]) == ["Item number 2999"]
+
+
+def _naive_matches(tree, target_text):
+    # the scan gen_xpath_by_text did before TextIndex
+    target_text = normalize_text(target_text)
+    return [
+        (ele, idx)
+        for ele, text, idx in itertext(tree.getroot())
+        if normalize_text(text) and (target_text in normalize_text(text) or normalize_text(text) in target_text)
+    ]
+
+
+def test_text_index_matches_a_full_scan():
+    tree = parse_html(
+        "<html><body><h1>Water&nbsp;supply restored</h1><p>Water supply restored in the north"
+        "<b>north</b> tail text</p><p>supply</p><span>&amp; more</span><p></p></body></html>"
+    )
+    texts = XPathIndex(tree).texts
+    targets = ["Water supply restored", "north", "supply restored in the north tail", "& more", "", "missing"]
+    for target in targets:
+        found = [texts.entries[i][:2] for i in texts.find(normalize_text(target))]
+        assert found == _naive_matches(tree, target), target
+
+
+def test_batch_lookup_matches_single_calls():
+    tree = parse_html(_random_page(3))
+    values = ["text 1", "text 42", "nothing here"]
+    kwargs = dict(text_suffix=True, short=False)
+    assert gen_xpaths_by_texts(tree, values, **kwargs) == [gen_xpath_by_text(tree, v, **kwargs) for v in values]
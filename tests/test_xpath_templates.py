@@ -0,0 +1,83 @@
+from langscrape.agent.graph import template_condition
+from langscrape.cache import XPathTemplateStore, domain_key, flush_stores
+from langscrape.nodes import template_matcher as matcher_module
+from langscrape.settings import DEFAULT_CONFIG_PATH, get_settings
+from langscrape.utils import initialize_global_state, validate_extracts
+
+CONFIG = {
+    "fields": {
+        "title": {"strategy": "xpath_extractor"},
+        "article_body": {"strategy": "xpath_extractor"},
+    },
+    "warnings": {"min_article_body": 20},
+}
+
+XPATHS = {"title": "//h1/text()", "article_body": "//article//p/text()"}
+PAGE = "<html><body><h1>Title</h1><article><p>" + "body text " * 10 + "</p></article></body></html>"
+REDESIGNED = "<html><body><h2>Title</h2><main><p>" + "body text " * 10 + "</p></main></body></html>"
+
+
+def test_domain_key():
+    assert domain_key("https://WWW.Example.com/a/b?c=1") == "example.com"
+    assert domain_key("http://news.example.com/x") == "news.example.com"
+
+
+def test_store_persists_templates_and_stats(tmp_path):
+    path = tmp_path / "templates.json"
+    store = XPathTemplateStore(str(path))
+    assert store.lookup("https://example.com/1") is None
+    store.store("https://example.com/1", XPATHS)
+    store.record_hit("https://www.example.com/2")
+    assert not path.exists()  # written in batches
+    store.flush()
+
+    reloaded = XPathTemplateStore(str(path))
+    assert reloaded.lookup("https://example.com/3") == XPATHS
+    assert reloaded.stats == {"hits": 1, "misses": 1, "invalidations": 0, "stores": 1}
+    reloaded.invalidate("https://example.com/3", ["title"])
+    assert reloaded.lookup("https://example.com/3") is None
+    flush_stores()
+    assert XPathTemplateStore(str(path)).stats["invalidations"] == 1
+
+
+def test_store_writes_once_the_interval_passed(tmp_path, monkeypatch):
+    path = tmp_path / "templates.json"
+    store = XPathTemplateStore(str(path))
+    monkeypatch.setattr(store, "flush_interval", 0)
+    assert store.lookup("https://example.com/1") is None
+    assert not path.exists()  # lookups never write
+    store.store("https://example.com/1", XPATHS)
+    assert XPathTemplateStore(str(path)).stats["misses"] == 1
+
+
+def test_validate_extracts():
+    assert validate_extracts({"title": ["T"], "datetime": ["2024-01-01"]}, CONFIG) == []
+    assert validate_extracts({"title": ["(Empty Result)"], "datetime": ["yesterday"]}, CONFIG) == ["title", "datetime"]
+    assert validate_extracts({"article_body": ["short"], "author": ["a b c d e f g"]}, CONFIG) == ["article_body", "author"]
+
+
+def test_seed_validate_and_fallback(tmp_path):
+    config = {**CONFIG, "templates": {"enabled": True, "path": str(tmp_path / "templates.json")}}
+    settings = get_settings(DEFAULT_CONFIG_PATH).with_overrides(config)
+    url = "https://example.com/article"
+
+    # no template yet: nothing seeded, the agent loop runs
+    global_state = initialize_global_state(config, url=url)
+    assert "xpath" not in global_state["title"]
+    assert template_condition(matcher_module.template_matcher({"url": url, "cleaned_content": PAGE, "global_state": global_state, "settings": settings})) == "miss"
+
+    store = matcher_module.get_template_store(config)
+    store.store(url, XPATHS)
+
+    global_state = initialize_global_state(config, url=url)
+    assert global_state["title"] == {"strategy": "xpath_extractor", "xpath": "//h1/text()", "source": "template"}
+    update = matcher_module.template_matcher({"url": url, "cleaned_content": PAGE, "global_state": global_state, "settings": settings})
+    assert template_condition(update) == "hit"
+
+    # the site was redesigned: the template is dropped and the agent loop takes over
+    global_state = initialize_global_state(config, url=url)
+    update = matcher_module.template_matcher({"url": url, "cleaned_content": REDESIGNED, "global_state": global_state, "settings": settings})
+    assert template_condition(update) == "miss"
+    assert "source" not in global_state["title"]
+    assert store.lookup(url) is None
+    assert store.stats == {"hits": 1, "misses": 2, "invalidations": 1, "stores": 1}